@@ -1,6 +1,34 @@
+import functools
+import os
+
+import altair as alt
+import numpy as np
 import streamlit as st
-import random
-import requests
+
+from motor import metricas
+from motor.analitico import probabilidades_analiticas
+from motor.api import (
+    NBA_SEASON_YEAR,
+    NFL_SEASON_LABEL,
+    descargar_nba_desde_api,
+    descargar_nfl_desde_api,
+    descargar_odds_semana_nfl,
+)
+from motor.banca import ESTRATEGIAS, UMBRAL_RUINA, simular_banca
+from motor.combinadas import Apuesta, patas_jornada, patas_partido, precio_combinada, simular_cartera
+from motor.escalera import DistribucionPartido, escalera_lineas, lineas_alrededor
+from motor.goles import distribucion_goles
+from motor.jornada import COLUMNAS_OCULTAS, actualizar_jornada, cotizar_jornada_nfl
+from motor.mercado import linea_contra_modelo, mejor_linea_partido, mejores_lineas, tabla_libros
+from motor.montecarlo import simular_adaptativo, simular_partido
+from motor.movimientos import HistorialLineas
+from motor.odds import implied_from_ml, indexar_odds_semana, resolver_matchup
+from motor.parametros import RUTA_PARAMETROS, cargar_parametros
+from motor.prefetch import precargar_temporada
+from motor.precios import UMBRAL, LineasCasa, alertas_trap, prob_local_modelo, recomendaciones
+from motor.proyecciones import EntradaNBA, EntradaNFL, EntradaNHL, proyectar
+from motor.reduccion import simular_reducido
+from motor.sensibilidad import barrido, ejes_disponibles, rango_por_defecto
 
 # =========================================================
 # CONFIG GENERAL
@@ -15,349 +43,234 @@ st.markdown(
     "Si llenas casa/visita te muestra las dos proyecciones."
 )
 
+etapas = metricas.Etapas()
+
 liga = st.radio("¿Qué quieres simular?", ["NFL", "NBA", "NHL"], horizontal=True)
 
+# Pesos, desviaciones y multiplicadores (calibrados si existe el JSON).
+PARAMETROS, parametros_error = cargar_parametros()
+if parametros_error:
+    st.warning(f"⚠️ {parametros_error} — uso los parámetros por defecto.")
+elif os.path.exists(RUTA_PARAMETROS):
+    st.caption(f"⚙️ Parámetros calibrados: {RUTA_PARAMETROS}")
+
 # =========================================================
-# KEYS, SEASON Y ENDPOINTS
+# KEYS
 # =========================================================
 
 # 👇 KEYS
 API_NBA_SCORES_KEY = "0d1d5d0c77a74544b94b4284cd4b29da"          # <<--- pega aquí tu key v3 NBA scores
 API_NFL_KEY = "cbec1d58513c4c658168cedce52a8a08"  # NFL Odds Season Pass
 
-NFL_SEASON_LABEL = "2025REG"
-NBA_SEASON_YEAR = "2025"
-
-# NFL Team stats (ODDS)
-NFL_TEAMSEASON_URL = "https://api.sportsdata.io/api/nfl/odds/json/TeamSeasonStats/2025REG"
-
-# NFL Odds por semana (ODDS)
-NFL_GAMEODDS_WEEK_BASE = "https://api.sportsdata.io/api/nfl/odds/json/GameOddsByWeek"
-
-# NBA Standings (SCORES v3)
-NBA_STANDINGS_URL = "https://api.sportsdata.io/v3/nba/scores/json/Standings/2025"
-
 # =========================================================
-# HELPERS GENERALES
+# CARGAS CACHEADAS (la lógica vive en motor.api / motor.odds)
 # =========================================================
 
-def normalize_team_code(name: str) -> str:
-    """Normaliza el nombre/código de equipo a algo tipo 'DAL', 'NYG', sin espacios."""
-    if not name:
-        return ""
-    return name.strip().upper().replace(" ", "")
-
-# =========================================================
-# NFL: CÁLCULO DE PUNTOS POR JUEGO DESDE TeamSeasonStats (ODDS)
-# =========================================================
-
-def get_nfl_points_pg_v2(obj: dict):
+def cache_data_medido(**opciones):
     """
-    Usa los campos que aparecen en TeamSeasonStats (ODDS):
-
-      - Score / PointsFor       -> puntos a favor total
-      - OpponentScore / PointsAgainst -> puntos en contra total
-      - Wins / Losses / Ties o Games -> número de partidos
+    st.cache_data que además cuenta llamadas y misses por función
+    (motor.metricas; hits = llamadas − misses). Con las métricas
+    apagadas el costo extra es una llamada y un if.
     """
-    score = obj.get("PointsFor")
-    opp_score = obj.get("PointsAgainst")
+    def decorar(funcion):
+        nombre = funcion.__name__
 
-    if score is None:
-        score = obj.get("Score")
-    if opp_score is None:
-        opp_score = obj.get("OpponentScore")
+        @functools.wraps(funcion)
+        def calcular(*args, **kwargs):
+            metricas.contar("cache_miss_total", cache=nombre)
+            return funcion(*args, **kwargs)
 
-    total_score = obj.get("TotalScore")
-    if score is None and total_score is not None and opp_score is not None:
-        score = total_score - opp_score
-    if opp_score is None and total_score is not None and score is not None:
-        opp_score = total_score - score
+        cacheada = st.cache_data(**opciones)(calcular)
 
-    if score is None:
-        score = 0.0
-    if opp_score is None:
-        opp_score = 0.0
+        @functools.wraps(funcion)
+        def llamar(*args, **kwargs):
+            metricas.contar("cache_llamadas_total", cache=nombre)
+            return cacheada(*args, **kwargs)
 
-    wins = obj.get("Wins") or 0
-    losses = obj.get("Losses") or 0
-    ties = obj.get("Ties") or 0
+        llamar.clear = cacheada.clear
+        return llamar
 
-    games = obj.get("Games")
-    if games is None or games == 0:
-        games = wins + losses + ties
-    if games == 0:
-        games = 1
+    return decorar
 
-    pf_pg = score / games
-    pa_pg = opp_score / games
-    return round(pf_pg, 2), round(pa_pg, 2)
 
-# =========================================================
-# CARGA DESDE API NFL (ODDS: TeamSeasonStats)
-# =========================================================
-
-@st.cache_data(ttl=600)
+@cache_data_medido(ttl=600)
 def cargar_nfl_desde_api(api_key: str):
-    """
-    NFL TeamSeasonStats (ODDS, 2025REG).
-    Indexa muchos campos de texto como posibles llaves de búsqueda.
-    """
-    url = f"{NFL_TEAMSEASON_URL}?key={api_key}"
-
-    try:
-        resp = requests.get(url, timeout=10)
-        if resp.status_code != 200:
-            return {}, f"Error {resp.status_code} al conectar con TeamSeasonStats NFL (ODDS)"
-        data = resp.json()
-    except Exception as e:
-        return {}, f"Error de conexión NFL: {e}"
-
-    nfl_teams = {}
-
-    for t in data:
-        pf_pg, pa_pg = get_nfl_points_pg_v2(t)
-        stats = {
-            "pf_pg": pf_pg,
-            "pa_pg": pa_pg,
-        }
-
-        # cualquier string del objeto será posible llave: 'DAL', 'Dallas', etc.
-        for v in t.values():
-            if isinstance(v, str):
-                s = v.lower()
-                keys = {s, s.replace(" ", "")}
-                for k in keys:
-                    if k:
-                        nfl_teams[k] = stats
+    """NFL TeamSeasonStats (ODDS, 2025REG), cacheado 10 min."""
+    return descargar_nfl_desde_api(api_key)
 
-    return nfl_teams, ""
 
-# =========================================================
-# CARGA DESDE API NBA (SCORES v3: Standings)
-# =========================================================
-
-@st.cache_data(ttl=600)
+@cache_data_medido(ttl=600)
 def cargar_nba_desde_api(api_key: str):
-    """
-    NBA Standings (v3 scores, 2025).
+    """NBA Standings (v3 scores, 2025), cacheado 10 min."""
+    return descargar_nba_desde_api(api_key)
 
-    Aquí usamos exactamente los campos:
-      - PointsPerGameFor      -> puntos que ANOTA el equipo por juego
-      - PointsPerGameAgainst  -> puntos que PERMITE el equipo por juego
-    """
-    url = f"{NBA_STANDINGS_URL}?key={api_key}"
-
-    try:
-        resp = requests.get(url, timeout=10)
-        if resp.status_code != 200:
-            return {}, f"Error {resp.status_code} al conectar con NBA Standings (scores v3)"
-        data = resp.json()
-    except Exception as e:
-        return {}, f"Error de conexión NBA: {e}"
-
-    nba_teams = {}
-
-    for t in data:
-        # Campos del endpoint Standings
-        pf = (
-            t.get("PointsPerGameFor")
-            or t.get("PointsPerGameFOR")
-            or t.get("PointsPerGameFor".lower())
-            or 0.0
-        )
-        pa = (
-            t.get("PointsPerGameAgainst")
-            or t.get("PointsPerGameAGAINST")
-            or t.get("PointsPerGameAgainst".lower())
-            or 0.0
-        )
 
-        stats = {
-            "pf_pg": round(float(pf), 2),
-            "pa_pg": round(float(pa), 2),
-            "pace": 0.0,  # este endpoint no trae pace: lo sigues llenando a mano
-        }
-
-        # Indexamos muchas posibles llaves: City, Name, Key, etc.
-        for v in t.values():
-            if isinstance(v, str):
-                s = v.lower()
-                keys = {s, s.replace(" ", "")}
-                for k in keys:
-                    if k:
-                        nba_teams[k] = stats
+@st.cache_resource
+def historial_lineas():
+    """Log de movimientos de línea (motor.movimientos), uno por proceso."""
+    return HistorialLineas()
 
-    return nba_teams, ""
 
-# =========================================================
-# CARGA DE ODDS POR SEMANA (NFL GameOddsByWeek)
-# =========================================================
-
-@st.cache_data(ttl=300)
+@cache_data_medido(ttl=300)
 def cargar_odds_semana_nfl(api_key: str, season_label: str, week: int):
     """
-    Llama EXACTAMENTE al endpoint:
-    https://api.sportsdata.io/api/nfl/odds/json/GameOddsByWeek/2025REG/13
+    GameOddsByWeek/{season}/{week}, cacheado 5 min. Cada descarga nueva
+    deja en el historial las líneas que se movieron.
     """
-    url = f"{NFL_GAMEODDS_WEEK_BASE}/{season_label}/{week}?key={api_key}"
+    data, err = descargar_odds_semana_nfl(api_key, season_label, week)
+    if not err:
+        historial_lineas().registrar_semana(data, f"{season_label}/{week}")
+    return data, err
 
-    try:
-        resp = requests.get(url, timeout=10)
-        if resp.status_code != 200:
-            return [], f"Error {resp.status_code} del endpoint GameOddsByWeek"
-        return resp.json(), ""
-    except Exception as e:
-        return [], f"Error de conexión al traer odds de NFL: {e}"
 
-def traer_odds_partido_nfl(api_key: str, season_label: str, week: int,
-                           team_local: str, team_visita: str):
+@cache_data_medido(ttl=300)
+def cargar_mercado_semana_nfl(api_key: str, season_label: str, week: int):
     """
-    Busca en GameOddsByWeek/{season}/{week} el partido con esas dos franquicias.
-    Devuelve spread (formato LOCAL de la app), total, ML local y ML visita.
-    Usa HomePointSpread / AwayPointSpread del endpoint de odds.
+    Índice de matchups + mejores líneas de todos los sportsbooks de la
+    semana (motor.odds / motor.mercado), cacheado 5 min.
     """
     data, err = cargar_odds_semana_nfl(api_key, season_label, week)
     if err:
-        return {}, err
-    if not data:
-        return {}, "No se encontraron juegos para esa semana."
+        return {}, None, err
+    return indexar_odds_semana(data), mejores_lineas(tabla_libros(data)), ""
 
-    code_local = normalize_team_code(team_local)
-    code_visita = normalize_team_code(team_visita)
 
-    if not code_local or not code_visita:
-        return {}, "Escribe LOCAL y VISITA antes de traer los odds."
+def traer_odds_partido_nfl(api_key: str, season_label: str, week: int,
+                           team_local: str, team_visita: str, registro=None):
+    """Mejor línea de cada lado del matchup LOCAL/VISITA (ver motor.mercado.mejor_linea_partido)."""
+    indice, mejores, err = cargar_mercado_semana_nfl(api_key, season_label, week)
+    if err:
+        return {}, err
+    partido, local_es_home, err = resolver_matchup(indice, team_local, team_visita, registro)
+    if err:
+        return {}, err
+    linea = mejor_linea_partido(mejores, partido.home, partido.away, local_es_home)
+    if linea is None:
+        return {}, "No encontré bloque PregameOdds para ese juego."
+    return linea, ""
 
-    cand_local = {code_local, code_local.replace(" ", "")}
-    cand_visita = {code_visita, code_visita.replace(" ", "")}
+# =========================================================
+# SIMULACIONES CACHEADAS (compartidas entre reruns y sesiones)
+# =========================================================
+#
+# La llave es el hash de los argumentos (puntos proyectados, desv, líneas,
+# sims, semilla...): mover un moneyline o el estado del otro equipo no
+# vuelve a simular, y dos usuarios mirando el mismo partido comparten el
+# cálculo. Los argumentos con '_' no entran en la llave (el número de
+# procesos no cambia el resultado).
 
-    def norm(s: str) -> str:
-        return normalize_team_code(s or "")
+MAX_SIMULACIONES_CACHE = 256
 
-    for g in data:
-        raw_home = g.get("HomeTeam") or g.get("HomeTeamName") or g.get("HomeTeamKey") or ""
-        raw_away = g.get("AwayTeam") or g.get("AwayTeamName") or g.get("AwayTeamKey") or ""
 
-        home_norm = norm(raw_home)
-        away_norm = norm(raw_away)
+@cache_data_medido(max_entries=MAX_SIMULACIONES_CACHE, show_spinner=False)
+def simular_partido_cacheado(pts_local, pts_visita, desv, spread_casa, total_casa,
+                             num_sims, seed, _workers=1):
+    return simular_partido(pts_local, pts_visita, desv, spread_casa, total_casa,
+                           num_sims, seed=seed, workers=_workers)
 
-        if not home_norm or not away_norm:
-            continue
 
-        juego_tiene_local = any(c and c in {home_norm, away_norm} for c in cand_local)
-        juego_tiene_visita = any(c and c in {home_norm, away_norm} for c in cand_visita)
+@cache_data_medido(max_entries=MAX_SIMULACIONES_CACHE, show_spinner=False)
+def simular_adaptativo_cacheado(pts_local, pts_visita, desv, spread_casa, total_casa,
+                                seed, max_sims, semiancho_objetivo, umbral):
+    return simular_adaptativo(pts_local, pts_visita, desv, spread_casa, total_casa,
+                              seed=seed, max_sims=max_sims,
+                              semiancho_objetivo=semiancho_objetivo, umbral=umbral)
 
-        if not (juego_tiene_local and juego_tiene_visita):
-            continue
-        if home_norm == away_norm:
-            continue
 
-        odds_list = g.get("PregameOdds") or g.get("GameOdds") or []
-        if not odds_list:
-            return {}, "No encontré bloque PregameOdds para ese juego."
+@cache_data_medido(max_entries=MAX_SIMULACIONES_CACHE, show_spinner=False)
+def simular_reducido_cacheado(pts_local, pts_visita, desv, spread_casa, total_casa,
+                              num_sims, estrategia, seed):
+    return simular_reducido(pts_local, pts_visita, desv, spread_casa, total_casa,
+                            num_sims, estrategia=estrategia, seed=seed)
 
-        o = odds_list[0]
 
-        spread_home = o.get("HomePointSpread")
-        if spread_home is None:
-            spread_home = o.get("PointSpread")
+@cache_data_medido(max_entries=MAX_SIMULACIONES_CACHE, show_spinner=False)
+def simular_banca_cacheada(prob: tuple, precio: tuple, estrategia: str, num_caminos: int, seed: int,
+                           banca_inicial: float, unidad: float, fraccion_kelly: float, tope: float):
+    return simular_banca(prob, precio, estrategia, num_caminos, banca_inicial=banca_inicial,
+                         unidad=unidad, fraccion_kelly=fraccion_kelly, tope=tope, seed=seed)
 
-        total = o.get("OverUnder")
 
-        ml_home = o.get("HomeMoneyLine") or o.get("HomeTeamMoneyLine")
-        ml_away = o.get("AwayMoneyLine") or o.get("AwayTeamMoneyLine")
+@cache_data_medido(max_entries=MAX_SIMULACIONES_CACHE, show_spinner=False)
+def simular_cartera_cacheada(pts_local, pts_visita, desv, patas: tuple, apuestas: tuple,
+                             num_sims: int, correlacion: float, seed: int):
+    return simular_cartera(pts_local, pts_visita, desv, patas, apuestas, num_sims,
+                           correlacion=correlacion, seed=seed)
 
-        if home_norm in cand_local:
-            ml_local = ml_home
-            ml_visita = ml_away
-            spread_local = spread_home
-        else:
-            ml_local = ml_away
-            ml_visita = ml_home
-            spread_local = -spread_home if spread_home is not None else 0.0
 
-        return {
-            "spread": float(spread_local or 0.0),
-            "total": float(total or 0.0),
-            "ml_local": int(ml_local or 0),
-            "ml_visita": int(ml_visita or 0),
-        }, ""
+@cache_data_medido(max_entries=MAX_SIMULACIONES_CACHE, show_spinner=False)
+def barrido_cacheado(entrada, lineas, eje_x: str, valores_x: tuple, eje_y: str, valores_y: tuple,
+                     modo: str, num_sims: int, seed: int, params):
+    return barrido(entrada, lineas, eje_x, valores_x, eje_y, valores_y, modo, num_sims, seed, params)
+
 
-    return {}, "No encontré ese matchup en los odds de esa semana."
+@cache_data_medido(max_entries=MAX_SIMULACIONES_CACHE, show_spinner=False)
+def escalera_cacheada(pts_local, pts_visita, desv, num_sims, seed,
+                      spreads, totales, totales_local, totales_visita):
+    dist = DistribucionPartido.desde_modelo(pts_local, pts_visita, desv, num_sims, seed=seed)
+    return escalera_lineas(
+        dist,
+        spreads=spreads,
+        totales=totales,
+        totales_local=totales_local,
+        totales_visita=totales_visita,
+    )
 
 # =========================================================
 # CARGA INICIAL SEGÚN LIGA
 # =========================================================
 
-nfl_data = {}
-nba_data = {}
+nfl_data = None
+nba_data = None
 
 if liga == "NFL":
     nfl_data, nfl_error = cargar_nfl_desde_api(API_NFL_KEY)
     if nfl_error:
         st.warning(f"⚠️ {nfl_error}")
     else:
-        st.success(f"✅ Datos NFL cargados — {len(nfl_data)} registros indexados ({NFL_SEASON_LABEL})")
+        st.success(f"✅ Datos NFL cargados — {len(nfl_data)} equipos ({NFL_SEASON_LABEL})")
 
 elif liga == "NBA":
     nba_data, nba_error = cargar_nba_desde_api(API_NBA_SCORES_KEY)
     if nba_error:
         st.warning(f"⚠️ {nba_error}")
     else:
-        st.success(f"✅ Datos NBA cargados — {len(nba_data)} registros indexados ({NBA_SEASON_YEAR})")
+        st.success(f"✅ Datos NBA cargados — {len(nba_data)} equipos ({NBA_SEASON_YEAR})")
 
 else:  # NHL
     st.info("🏒 NHL: no hay carga automática, llena los campos manualmente.")
 
+etapas.marcar("carga inicial")
+
 # =========================================================
 # 1) DATOS DEL PARTIDO
 # =========================================================
 st.subheader("1) Datos del partido")
+
+
+def rellenar_equipo(registro, nombre: str, prefijo: str, lado: str):
+    """Busca el equipo en el registro (código, ciudad, nombre...) y llena sus promedios."""
+    equipo = registro.buscar(nombre) if registro is not None else None
+    if equipo is None:
+        sugeridos = registro.sugerencias(nombre) if registro is not None else []
+        extra = f" (¿quisiste decir {', '.join(sugeridos)}?)" if sugeridos else ""
+        st.error(f"No encontré ese equipo en {liga}{extra}")
+        return
+    st.session_state[f"{prefijo}_anota_global"] = equipo.pf_pg
+    st.session_state[f"{prefijo}_permite_global"] = equipo.pa_pg
+    st.success(f"{lado} rellenado con datos reales de {equipo.nombre} ({equipo.codigo})")
+    st.caption(f"PF/PG={equipo.pf_pg}  PA/PG={equipo.pa_pg}")
+
+
 col_l, col_v = st.columns(2)
 
 # ---- LOCAL ----
 with col_l:
     local_name = st.text_input("Equipo LOCAL", key="local_name")
 
-    if liga == "NFL":
-        if st.button("Rellenar LOCAL desde NFL"):
-            lookup_raw = local_name.strip().lower()
-            lookup_no_space = lookup_raw.replace(" ", "")
-            candidatos = {lookup_raw, lookup_no_space}
-            encontrado = False
-            for key_try in candidatos:
-                if key_try in nfl_data:
-                    st.session_state["l_anota_global"] = nfl_data[key_try]["pf_pg"]
-                    st.session_state["l_permite_global"] = nfl_data[key_try]["pa_pg"]
-                    st.success(f"LOCAL rellenado con datos reales de {local_name}")
-                    encontrado = True
-                    st.caption(
-                        f"PF/PG={nfl_data[key_try]['pf_pg']}  "
-                        f"PA/PG={nfl_data[key_try]['pa_pg']}"
-                    )
-                    break
-            if not encontrado:
-                st.error("No encontré ese equipo en NFL")
-
-    if liga == "NBA":
-        if st.button("Rellenar LOCAL desde NBA"):
-            lookup_raw = local_name.strip().lower()
-            lookup_no_space = lookup_raw.replace(" ", "")
-            candidatos = {lookup_raw, lookup_no_space}
-            encontrado = False
-            for key_try in candidatos:
-                if key_try in nba_data:
-                    st.session_state["l_anota_global"] = nba_data[key_try]["pf_pg"]
-                    st.session_state["l_permite_global"] = nba_data[key_try]["pa_pg"]
-                    st.success(f"LOCAL rellenado con datos reales de {local_name}")
-                    encontrado = True
-                    st.caption(
-                        f"PF/PG={nba_data[key_try]['pf_pg']}  "
-                        f"PA/PG={nba_data[key_try]['pa_pg']}"
-                    )
-                    break
-            if not encontrado:
-                st.error("No encontré ese equipo en NBA")
+    if liga in ("NFL", "NBA"):
+        if st.button(f"Rellenar LOCAL desde {liga}"):
+            rellenar_equipo(nfl_data if liga == "NFL" else nba_data, local_name, "l", "LOCAL")
 
     st.markdown("**Promedios GLOBAL del LOCAL**")
     l_anota_global = st.number_input(
@@ -377,45 +290,9 @@ with col_l:
 with col_v:
     visita_name = st.text_input("Equipo VISITA", key="visita_name")
 
-    if liga == "NFL":
-        if st.button("Rellenar VISITA desde NFL"):
-            lookup_raw = visita_name.strip().lower()
-            lookup_no_space = lookup_raw.replace(" ", "")
-            candidatos = {lookup_raw, lookup_no_space}
-            encontrado = False
-            for key_try in candidatos:
-                if key_try in nfl_data:
-                    st.session_state["v_anota_global"] = nfl_data[key_try]["pf_pg"]
-                    st.session_state["v_permite_global"] = nfl_data[key_try]["pa_pg"]
-                    st.success(f"VISITA rellenado con datos reales de {visita_name}")
-                    encontrado = True
-                    st.caption(
-                        f"PF/PG={nfl_data[key_try]['pf_pg']}  "
-                        f"PA/PG={nfl_data[key_try]['pa_pg']}"
-                    )
-                    break
-            if not encontrado:
-                st.error("No encontré ese equipo en NFL")
-
-    if liga == "NBA":
-        if st.button("Rellenar VISITA desde NBA"):
-            lookup_raw = visita_name.strip().lower()
-            lookup_no_space = lookup_raw.replace(" ", "")
-            candidatos = {lookup_raw, lookup_no_space}
-            encontrado = False
-            for key_try in candidatos:
-                if key_try in nba_data:
-                    st.session_state["v_anota_global"] = nba_data[key_try]["pf_pg"]
-                    st.session_state["v_permite_global"] = nba_data[key_try]["pa_pg"]
-                    st.success(f"VISITA rellenado con datos reales de {visita_name}")
-                    encontrado = True
-                    st.caption(
-                        f"PF/PG={nba_data[key_try]['pf_pg']}  "
-                        f"PA/PG={nba_data[key_try]['pa_pg']}"
-                    )
-                    break
-            if not encontrado:
-                st.error("No encontré ese equipo en NBA")
+    if liga in ("NFL", "NBA"):
+        if st.button(f"Rellenar VISITA desde {liga}"):
+            rellenar_equipo(nfl_data if liga == "NFL" else nba_data, visita_name, "v", "VISITA")
 
     st.markdown("**Promedios GLOBAL del VISITA**")
     v_anota_global = st.number_input(
@@ -431,6 +308,8 @@ with col_v:
         key="v_permite_global",
     )
 
+etapas.marcar("1) datos del partido")
+
 # =========================================================
 # 2) SEGÚN LIGA
 # =========================================================
@@ -452,8 +331,6 @@ if liga == "NFL":
             "Visita: puntos que PERMITE de visita", value=0.0, step=0.1
         )
 
-    hay_cv = any([l_anota_casa, l_permite_casa, v_anota_visita, v_permite_visita])
-
 elif liga == "NBA":
     st.subheader("2) Factores avanzados NBA (últimos 5 partidos) 🏀")
     st.caption(
@@ -488,7 +365,6 @@ elif liga == "NBA":
         )
 
     pace_liga = st.number_input("Pace promedio liga (NBA)", value=99.0, step=0.1)
-    hay_cv = False
 
 else:  # NHL
     st.subheader("2) Factores avanzados NHL (últimos 5 + xG + goalie) 🎯")
@@ -512,19 +388,15 @@ else:  # NHL
         sv_goalie_visita_5 = st.number_input("Save% GOALIE VISITA (últimos 5)", value=0.910, step=0.001)
 
     goles_liga = st.number_input("Promedio goles totales liga (NHL)", value=6.20, step=0.1)
-    hay_cv = False
+
+etapas.marcar("2) según liga")
 
 # =========================================================
 # 3) AJUSTE POR LESIONES / FORMA
 # =========================================================
 st.subheader("3) Ajuste por lesiones / forma")
 
-opt_estado = {
-    "Healthy / completo": 1.00,
-    "1 baja importante": 0.97,
-    "Varias bajas / tocado": 0.93,
-    "En buen momento": 1.03,
-}
+opt_estado = PARAMETROS.mult_estado
 
 c3, c4 = st.columns(2)
 with c3:
@@ -546,14 +418,7 @@ mult_local = opt_estado[estado_local]
 mult_visita = opt_estado[estado_visita]
 st.caption("Estos multiplicadores afectan a los puntos proyectados. 1.00 = normal.")
 
-# =========================================================
-# FUNCIÓN DE PROYECCIÓN NFL
-# =========================================================
-def proyeccion_nfl(ofensiva, defensa, es_local=False):
-    base = 0.55 * ofensiva + 0.35 * defensa
-    if es_local:
-        base += 1.5
-    return base
+etapas.marcar("3) ajuste")
 
 # =========================================================
 # 4) PROYECCIÓN DEL MODELO
@@ -561,91 +426,68 @@ def proyeccion_nfl(ofensiva, defensa, es_local=False):
 st.subheader("4) Proyección del modelo")
 
 if liga == "NFL":
-    pts_local_global = proyeccion_nfl(l_anota_global, v_permite_global, True) * mult_local
-    pts_visita_global = proyeccion_nfl(v_anota_global, l_permite_global, False) * mult_visita
-    total_global = pts_local_global + pts_visita_global
-    spread_global = pts_local_global - pts_visita_global
-    line_modelo = -spread_global
-
-    st.markdown("🟦 **GLOBAL**")
-    st.write(f"- {local_name or 'LOCAL'}: **{pts_local_global:.1f} pts**")
-    st.write(f"- {visita_name or 'VISITA'}: **{pts_visita_global:.1f} pts**")
-    st.write(f"- Total modelo: **{total_global:.1f}**")
-    st.write(
-        f"- Spread modelo (local – visita): **{spread_global:+.1f} pts** "
-        f"→ línea modelo LOCAL **{line_modelo:+.1f}**"
+    entrada = EntradaNFL(
+        l_anota_global=l_anota_global,
+        l_permite_global=l_permite_global,
+        v_anota_global=v_anota_global,
+        v_permite_global=v_permite_global,
+        l_anota_casa=l_anota_casa,
+        l_permite_casa=l_permite_casa,
+        v_anota_visita=v_anota_visita,
+        v_permite_visita=v_permite_visita,
+        mult_local=mult_local,
+        mult_visita=mult_visita,
     )
-
-    if hay_cv:
-        st.markdown("🟩 **CASA / VISITA**")
-        pts_local_cv = proyeccion_nfl(l_anota_casa, v_permite_visita, True) * mult_local
-        pts_visita_cv = proyeccion_nfl(v_anota_visita, l_permite_casa, False) * mult_visita
-        total_cv = pts_local_cv + pts_visita_cv
-        spread_cv = pts_local_cv - pts_visita_cv
-
-        st.write(f"- {local_name or 'LOCAL'}: **{pts_local_cv:.1f} pts**")
-        st.write(f"- {visita_name or 'VISITA'}: **{pts_visita_cv:.1f} pts**")
-        st.write(f"- Total modelo (c/v): **{total_cv:.1f}**")
-        st.write(f"- Spread modelo (c/v): **{spread_cv:+.1f}**")
-    else:
-        total_cv = None
-        spread_cv = None
-
 elif liga == "NBA":
-    if 'pace_local_5' in locals() and pace_local_5 > 0 and pace_visita_5 > 0:
-        pace_med = (pace_local_5 + pace_visita_5) / 2
-    else:
-        pace_med = pace_liga
-
-    reciente_local = (0.6 * off_local_5 + 0.4 * def_visita_5) * (pace_med / 100.0)
-    reciente_visita = (0.6 * off_visita_5 + 0.4 * def_local_5) * (pace_med / 100.0)
-
-    global_local_part = 0.0
-    global_visita_part = 0.0
-    if l_anota_global or v_permite_global:
-        global_local_part = (l_anota_global + v_permite_global) / 2.0
-    if v_anota_global or l_permite_global:
-        global_visita_part = (v_anota_global + l_permite_global) / 2.0
-
-    pts_local_global = (0.65 * reciente_local + 0.35 * global_local_part) * mult_local
-    pts_visita_global = (0.65 * reciente_visita + 0.35 * global_visita_part) * mult_visita
-
-    total_global = pts_local_global + pts_visita_global
-    spread_global = pts_local_global - pts_visita_global
-    line_modelo = -spread_global
-
-    st.markdown("🏀 usando últimos 5 + pace + global (65% / 35%)")
-    st.write(f"- {local_name or 'LOCAL'}: **{pts_local_global:.1f} pts**")
-    st.write(f"- {visita_name or 'VISITA'}: **{pts_visita_global:.1f} pts**")
-    st.write(f"- Total modelo: **{total_global:.1f}**")
-    st.write(
-        f"- Spread modelo (local – visita): **{spread_global:+.1f} pts** "
-        f"→ línea modelo LOCAL **{line_modelo:+.1f}**"
+    entrada = EntradaNBA(
+        l_anota_global=l_anota_global,
+        l_permite_global=l_permite_global,
+        v_anota_global=v_anota_global,
+        v_permite_global=v_permite_global,
+        pace_local_5=pace_local_5,
+        off_local_5=off_local_5,
+        def_local_5=def_local_5,
+        pace_visita_5=pace_visita_5,
+        off_visita_5=off_visita_5,
+        def_visita_5=def_visita_5,
+        pace_liga=pace_liga,
+        mult_local=mult_local,
+        mult_visita=mult_visita,
     )
-
-    total_cv = None
-    spread_cv = None
-
 else:  # NHL
-    base_team = goles_liga / 2.0
-
-    atk_local = 0.5 * gf_local_5 + 0.3 * xgf_local_5 + 0.2 * (corsi_local_5 - 50) / 5
-    def_visita = 0.5 * ga_visita_5 + 0.3 * xga_visita_5 - 0.2 * (sv_goalie_visita_5 - 0.910) * 10
-
-    atk_visita = 0.5 * gf_visita_5 + 0.3 * xgf_visita_5 + 0.2 * (corsi_visita_5 - 50) / 5
-    def_local = 0.5 * ga_local_5 + 0.3 * xga_local_5 - 0.2 * (sv_goalie_local_5 - 0.910) * 10
-
-    exp_local = base_team + 0.5 * (atk_local - base_team) - 0.5 * (def_visita - base_team)
-    exp_visita = base_team + 0.5 * (atk_visita - base_team) - 0.5 * (def_local - base_team)
-
-    pts_local_global = max(0.5, exp_local) * mult_local
-    pts_visita_global = max(0.5, exp_visita) * mult_visita
+    entrada = EntradaNHL(
+        gf_local_5=gf_local_5,
+        ga_local_5=ga_local_5,
+        xgf_local_5=xgf_local_5,
+        xga_local_5=xga_local_5,
+        corsi_local_5=corsi_local_5,
+        sv_goalie_local_5=sv_goalie_local_5,
+        gf_visita_5=gf_visita_5,
+        ga_visita_5=ga_visita_5,
+        xgf_visita_5=xgf_visita_5,
+        xga_visita_5=xga_visita_5,
+        corsi_visita_5=corsi_visita_5,
+        sv_goalie_visita_5=sv_goalie_visita_5,
+        goles_liga=goles_liga,
+        mult_local=mult_local,
+        mult_visita=mult_visita,
+    )
 
-    total_global = pts_local_global + pts_visita_global
-    spread_global = pts_local_global - pts_visita_global
-    line_modelo = -spread_global
+proyeccion = proyectar(entrada, PARAMETROS)
+pts_local_global = proyeccion.pts_local
+pts_visita_global = proyeccion.pts_visita
+total_global = proyeccion.total
+spread_global = proyeccion.spread
+line_modelo = proyeccion.line_modelo
 
+if liga == "NFL":
+    st.markdown("🟦 **GLOBAL**")
+elif liga == "NBA":
+    st.markdown("🏀 usando últimos 5 + pace + global (65% / 35%)")
+else:
     st.markdown("🏒 usando GF/GA + xG + Corsi% + Save% (NHL)")
+
+if liga == "NHL":
     st.write(f"- {local_name or 'LOCAL'}: **{pts_local_global:.2f} goles**")
     st.write(f"- {visita_name or 'VISITA'}: **{pts_visita_global:.2f} goles**")
     st.write(f"- Total modelo: **{total_global:.2f} goles**")
@@ -653,9 +495,23 @@ else:  # NHL
         f"- Spread modelo (local – visita): **{spread_global:+.2f}** "
         f"→ línea modelo LOCAL **{line_modelo:+.2f}**"
     )
+else:
+    st.write(f"- {local_name or 'LOCAL'}: **{pts_local_global:.1f} pts**")
+    st.write(f"- {visita_name or 'VISITA'}: **{pts_visita_global:.1f} pts**")
+    st.write(f"- Total modelo: **{total_global:.1f}**")
+    st.write(
+        f"- Spread modelo (local – visita): **{spread_global:+.1f} pts** "
+        f"→ línea modelo LOCAL **{line_modelo:+.1f}**"
+    )
+
+if proyeccion.hay_cv:
+    st.markdown("🟩 **CASA / VISITA**")
+    st.write(f"- {local_name or 'LOCAL'}: **{proyeccion.pts_local_cv:.1f} pts**")
+    st.write(f"- {visita_name or 'VISITA'}: **{proyeccion.pts_visita_cv:.1f} pts**")
+    st.write(f"- Total modelo (c/v): **{proyeccion.total_cv:.1f}**")
+    st.write(f"- Spread modelo (c/v): **{proyeccion.spread_cv:+.1f}**")
 
-    total_cv = None
-    spread_cv = None
+etapas.marcar("4) proyección")
 
 # =========================================================
 # 5) LÍNEA DEL CASINO Y DIFERENCIAS
@@ -669,24 +525,159 @@ if liga == "NFL":
         min_value=1, max_value=25, value=13, step=1
     )
     if st.button("Traer odds NFL desde SportsDataIO"):
-        odds, err = traer_odds_partido_nfl(
-            API_NFL_KEY,
-            NFL_SEASON_LABEL,
-            int(semana_nfl),
-            local_name,
-            visita_name,
-        )
+        with metricas.cronometro("boton: traer odds NFL"):
+            odds, err = traer_odds_partido_nfl(
+                API_NFL_KEY,
+                NFL_SEASON_LABEL,
+                int(semana_nfl),
+                local_name,
+                visita_name,
+                nfl_data,
+            )
         if err:
             st.warning(f"⚠️ {err}")
         else:
-            st.session_state["spread_casa"] = odds["spread"]
-            st.session_state["total_casa"] = odds["total"]
-            st.session_state["ml_local"] = odds["ml_local"]
-            st.session_state["ml_visita"] = odds["ml_visita"]
+            spread_mejor, total_mejor = linea_contra_modelo(odds, line_modelo, total_global)
+            st.session_state["spread_casa"] = spread_mejor or 0.0
+            st.session_state["total_casa"] = total_mejor or 0.0
+            st.session_state["ml_local"] = int(odds["ml_local"] or 0)
+            st.session_state["ml_visita"] = int(odds["ml_visita"] or 0)
+            st.session_state["linea_mercado"] = (local_name, visita_name, odds)
             st.success(
-                f"Odds cargados: spread={odds['spread']:+.1f}, total={odds['total']:.1f}, "
-                f"ML local={odds['ml_local']}, ML visita={odds['ml_visita']}"
+                f"Mejor línea de {odds['n_libros']} sportsbooks: "
+                f"spread={st.session_state['spread_casa']:+.1f}, "
+                f"total={st.session_state['total_casa']:.1f}, "
+                f"ML local={st.session_state['ml_local']}, ML visita={st.session_state['ml_visita']}"
+            )
+
+    with st.expander("⚡ Precargar temporada completa (cache en disco)"):
+        st.caption(
+            "Baja TeamSeasonStats, NBA Standings y GameOddsByWeek de todas las semanas "
+            "en paralelo. Lo que no cambió solo cuesta una revalidación (304)."
+        )
+        semanas_precarga = st.slider("Semanas a precargar", 1, 25, (1, 18))
+        if st.button("Precargar ahora"):
+            mediciones = precargar_temporada(
+                API_NFL_KEY,
+                API_NBA_SCORES_KEY,
+                range(semanas_precarga[0], semanas_precarga[1] + 1),
+                season_label=NFL_SEASON_LABEL,
+            )
+            fallidas = [m for m in mediciones if m.status != 200]
+            total_seg = sum(m.segundos for m in mediciones)
+            if fallidas:
+                st.warning(f"⚠️ {len(fallidas)} de {len(mediciones)} peticiones fallaron.")
+            else:
+                st.success(f"✅ {len(mediciones)} peticiones precargadas.")
+            st.dataframe(
+                [
+                    {
+                        "Endpoint": m.nombre,
+                        "Status": m.status,
+                        "ms": round(m.segundos * 1000, 1),
+                        "Error": m.error,
+                    }
+                    for m in mediciones
+                ],
+                hide_index=True,
+            )
+            st.caption(f"Suma de tiempos por petición: {total_seg:.2f} s (corren en paralelo).")
+
+    with st.expander("📋 Jornada completa (todos los partidos de la semana)"):
+        st.caption(
+            "Proyecta y simula todos los juegos de GameOddsByWeek con los promedios "
+            "GLOBAL de TeamSeasonStats (sin casa/visita ni ajuste por lesiones)."
+        )
+        cj1, cj2 = st.columns(2)
+        with cj1:
+            sims_jornada = st.number_input(
+                "Simulaciones por partido (jornada)",
+                min_value=1000, max_value=1_000_000, value=20000, step=1000,
+            )
+        with cj2:
+            workers_jornada = st.number_input(
+                "Procesos en paralelo (jornada)",
+                min_value=1, max_value=os.cpu_count() or 1, value=1, step=1,
+            )
+        recotizar_todo = st.checkbox(
+            "Recotizar todos los partidos",
+            value=False,
+            help="Si no, solo se vuelven a simular los juegos cuya línea se movió desde la última vez.",
+        )
+        if st.button("Simular jornada completa"):
+            odds_semana, err = cargar_odds_semana_nfl(API_NFL_KEY, NFL_SEASON_LABEL, int(semana_nfl))
+            if not err:
+                _, mejores_semana, err = cargar_mercado_semana_nfl(API_NFL_KEY, NFL_SEASON_LABEL, int(semana_nfl))
+            if err:
+                st.warning(f"⚠️ {err}")
+            elif not nfl_data:
+                st.warning("⚠️ No hay stats NFL cargadas para proyectar la jornada.")
+            else:
+                semana_label = f"{NFL_SEASON_LABEL}/{int(semana_nfl)}"
+                llave_jornada = (semana_label, int(sims_jornada))
+                previa = st.session_state.get("jornada_nfl", {}).get(llave_jornada)
+                hasta_id = historial_lineas().ultimo_id(semana_label)
+                with metricas.cronometro("boton: jornada completa"):
+                    if previa is None or recotizar_todo:
+                        tabla_jornada, avisos_jornada = cotizar_jornada_nfl(
+                            odds_semana, nfl_data, int(sims_jornada), seed=42,
+                            workers=int(workers_jornada), params=PARAMETROS, mejores=mejores_semana,
+                        )
+                    else:
+                        movidos = historial_lineas().movidos_desde(semana_label, previa["desde_id"])
+                        tabla_jornada, avisos_jornada = actualizar_jornada(
+                            previa["tabla"], odds_semana, movidos, nfl_data, int(sims_jornada),
+                            seed=42, workers=int(workers_jornada), params=PARAMETROS,
+                            mejores=mejores_semana,
+                        )
+                        st.caption(
+                            f"Recotizados {len(movidos)} de {len(odds_semana)} juegos; "
+                            "los demás no movieron línea."
+                        )
+                st.session_state.setdefault("jornada_nfl", {})[llave_jornada] = {
+                    "tabla": tabla_jornada, "desde_id": hasta_id,
+                }
+                if tabla_jornada.empty:
+                    st.info("No hubo partidos con stats y odds para esa semana.")
+                else:
+                    st.dataframe(tabla_jornada.drop(columns=COLUMNAS_OCULTAS))
+                    patas_semana = patas_jornada(tabla_jornada)
+                    cartera = simular_cartera_cacheada(
+                        tabla_jornada["pts_local"].to_numpy(), tabla_jornada["pts_visita"].to_numpy(),
+                        PARAMETROS.desv("NFL"), tuple(patas_semana),
+                        tuple(Apuesta((i,)) for i in range(len(patas_semana))),
+                        int(sims_jornada), PARAMETROS.correlacion_marcador, 42,
+                    )
+                    pnl = cartera.resumen_pnl()
+                    st.caption(
+                        f"Cartera: 1 unidad a la mejor apuesta de cada juego ({len(patas_semana)} apuestas a -110). "
+                        f"P&L esperado **{pnl['pnl_medio']:+.2f} u** (± {pnl['pnl_desv']:.2f}), "
+                        f"prob. de terminar en pérdida **{pnl['prob_perdida']:.1f}%**, "
+                        f"P5 / P50 / P95: {pnl['p5']:+.1f} / {pnl['p50']:+.1f} / {pnl['p95']:+.1f} u."
+                    )
+                for aviso in avisos_jornada:
+                    st.caption(f"⚠️ {aviso}")
+
+    with st.expander("📈 Movimientos de línea de la semana"):
+        semana_movimientos = f"{NFL_SEASON_LABEL}/{int(semana_nfl)}"
+        recientes = historial_lineas().recientes(semana_movimientos, limite=200)
+        if recientes.empty:
+            st.caption(
+                "Todavía no hay líneas guardadas para esta semana: se guardan al traer odds, "
+                "al simular la jornada o con python -m motor.movimientos."
             )
+        else:
+            st.dataframe(recientes.drop(columns=["id", "semana"]).head(50), hide_index=True)
+            juegos_semana = {
+                f"{r.away} @ {r.home}": r.juego
+                for r in recientes.drop_duplicates("juego").itertuples()
+            }
+            elegido = st.selectbox("Historial del partido", list(juegos_semana))
+            historia = historial_lineas().historial(juegos_semana[elegido])
+            st.line_chart(
+                historia.pivot_table(index="visto", columns="libro", values="spread_home").ffill()
+            )
+            st.dataframe(historia.drop(columns=["id", "semana", "juego"]), hide_index=True)
 
 col_spread, col_total = st.columns(2)
 with col_spread:
@@ -714,11 +705,50 @@ with st.expander("🔍 Comparación de totales (GLOBAL)", expanded=True):
     dif_total = total_global - total_casa
     st.write(f"- **DIF. TOTAL (GLOBAL): {dif_total:+.1f} pts**")
 
-trap_msgs = []
-if abs(dif_spread) >= 5:
-    trap_msgs.append("spread")
-if abs(dif_total) >= 8:
-    trap_msgs.append("total")
+# Mejor línea por lado (solo si los odds traídos son de este matchup).
+linea_mercado = None
+guardada = st.session_state.get("linea_mercado")
+if liga == "NFL" and guardada and guardada[:2] == (local_name, visita_name):
+    linea_mercado = guardada[2]
+
+if linea_mercado:
+    with st.expander(f"🏦 Mejor línea del mercado ({linea_mercado['n_libros']} sportsbooks)", expanded=True):
+        filas_mercado = []
+        if linea_mercado["spread"] is not None:
+            filas_mercado.append({
+                "Apuesta": f"Spread {local_name or 'LOCAL'}",
+                "Línea": f"{linea_mercado['spread']:+.1f}",
+                "Sportsbook": linea_mercado["libro_spread"],
+                "Edge vs modelo (pts)": round(linea_mercado["spread"] - line_modelo, 1),
+            })
+        if linea_mercado["spread_visita"] is not None:
+            filas_mercado.append({
+                "Apuesta": f"Spread {visita_name or 'VISITA'}",
+                "Línea": f"{linea_mercado['spread_visita']:+.1f}",
+                "Sportsbook": linea_mercado["libro_spread_visita"],
+                "Edge vs modelo (pts)": round(line_modelo + linea_mercado["spread_visita"], 1),
+            })
+        if linea_mercado["total_over"] is not None:
+            filas_mercado.append({
+                "Apuesta": "OVER",
+                "Línea": f"{linea_mercado['total_over']:.1f}",
+                "Sportsbook": linea_mercado["libro_over"],
+                "Edge vs modelo (pts)": round(total_global - linea_mercado["total_over"], 1),
+            })
+        if linea_mercado["total_under"] is not None:
+            filas_mercado.append({
+                "Apuesta": "UNDER",
+                "Línea": f"{linea_mercado['total_under']:.1f}",
+                "Sportsbook": linea_mercado["libro_under"],
+                "Edge vs modelo (pts)": round(linea_mercado["total_under"] - total_global, 1),
+            })
+        st.dataframe(filas_mercado, hide_index=True)
+        st.caption(
+            "Spread y total de arriba se llenan con la mejor línea del lado donde "
+            "tu modelo ve más edge."
+        )
+
+trap_msgs = alertas_trap(dif_spread, dif_total)
 
 if trap_msgs:
     st.error(
@@ -726,6 +756,8 @@ if trap_msgs:
         f"Puede ser trap line o info que no estás metiendo."
     )
 
+etapas.marcar("5) línea del casino")
+
 # =========================================================
 # 5b) MONEYLINE
 # =========================================================
@@ -744,14 +776,6 @@ with c_ml2:
         step=5,
     )
 
-def implied_from_ml(ml):
-    if ml == 0:
-        return 0.0
-    if ml > 0:
-        return 100 / (ml + 100)
-    else:
-        return -ml / (-ml + 100)
-
 prob_impl_local = implied_from_ml(ml_local) * 100
 prob_impl_visita = implied_from_ml(ml_visita) * 100
 
@@ -760,80 +784,361 @@ st.write(
     f"Prob. implícita VISITA (casa): **{prob_impl_visita:.1f}%**"
 )
 
+prob_consenso_local = None
+if linea_mercado and linea_mercado["prob_local_consenso"] is not None:
+    prob_consenso_local = linea_mercado["prob_local_consenso"] * 100
+    st.caption(
+        f"Mejor ML: LOCAL en {linea_mercado['libro_ml_local'] or '—'}, "
+        f"VISITA en {linea_mercado['libro_ml_visita'] or '—'}. "
+        f"Consenso sin vig: LOCAL **{prob_consenso_local:.1f}%**, "
+        f"VISITA **{100 - prob_consenso_local:.1f}%**"
+    )
+
+etapas.marcar("5b) moneyline")
+
 # =========================================================
 # 5c) Comparativa de probabilidades (modelo vs casino)
 # =========================================================
 st.subheader("5c) Comparativa de probabilidades (modelo vs casino)")
-p_local_modelo = 50 + (spread_global * 2)
-p_local_modelo = max(1, min(99, p_local_modelo))
+p_local_modelo = prob_local_modelo(spread_global)
 p_visita_modelo = 100 - p_local_modelo
 
 st.write(f"{local_name or 'LOCAL'} (modelo): **{p_local_modelo:.1f}%**")
 st.write(f"{visita_name or 'VISITA'} (modelo): **{p_visita_modelo:.1f}%**")
 st.write(f"Prob. implícita LOCAL (casa): **{prob_impl_local:.1f}%**")
 st.write(f"Prob. implícita VISITA (casa): **{prob_impl_visita:.1f}%**")
+if prob_consenso_local is not None:
+    st.write(f"LOCAL consenso sin vig (mercado): **{prob_consenso_local:.1f}%**")
+    st.write(f"VISITA consenso sin vig (mercado): **{100 - prob_consenso_local:.1f}%**")
+
+etapas.marcar("5c) comparativa")
 
 # =========================================================
 # 6) MONTE CARLO
 # =========================================================
 st.subheader("6) Simulación Monte Carlo 🟦 (GLOBAL)")
-num_sims = st.slider("Número de simulaciones (GLOBAL)", 1000, 50000, 10000, 1000)
+MODO_EXACTO_NHL = "Exacto (goles discretos)"
+modos_calculo = ["Monte Carlo", "Adaptativo", "Analítico"]
+if liga == "NHL":
+    modos_calculo = [MODO_EXACTO_NHL] + modos_calculo
+modo_calculo = st.radio(
+    "Modo de cálculo",
+    modos_calculo,
+    horizontal=True,
+    help=(
+        "Adaptativo: simula por lotes y para cuando el intervalo de confianza es "
+        "suficientemente estrecho o ya decide la recomendación de la sección 7.  \n"
+        "Analítico: mismo modelo normal recortado en 0, resuelto con CDFs (instantáneo).  \n"
+        "Exacto (NHL): goles enteros Poisson / binomial negativa, con OT y shootout; "
+        "sin muestreo."
+    ),
+)
+col_sims, col_seed, col_workers = st.columns([3, 1, 1])
+with col_sims:
+    num_sims = st.slider("Número de simulaciones (GLOBAL)", 1000, 1_000_000, 10000, 1000)
+with col_seed:
+    seed_sims = st.number_input("Semilla (reproducible)", min_value=0, value=42, step=1)
+with col_workers:
+    workers_sims = st.number_input(
+        "Procesos en paralelo",
+        min_value=1, max_value=os.cpu_count() or 1, value=1, step=1,
+        help="Misma semilla = mismo resultado con cualquier número de procesos.",
+    )
 
-covers, overs = 0, 0
-if liga == "NBA":
-    desv = 12.0
-elif liga == "NFL":
-    desv = 13.0
-else:  # NHL
-    desv = 1.2
+desv = PARAMETROS.desv(liga)
 
-for _ in range(num_sims):
-    sim_l = max(0, random.gauss(pts_local_global, desv))
-    sim_v = max(0, random.gauss(pts_visita_global, desv))
-    if (sim_l - sim_v) + spread_casa >= 0:
-        covers += 1
-    if (sim_l + sim_v) > total_casa:
-        overs += 1
+prob_cover_an, prob_over_an = probabilidades_analiticas(
+    pts_local_global, pts_visita_global, desv, spread_casa, total_casa
+)
+
+opt_reduccion = {
+    "Ninguna": "ninguna",
+    "Antitética": "antitetica",
+    "Variable de control (normal sin recorte)": "control",
+    "Sobol aleatorizado (cuasi-MC)": "sobol",
+}
 
-prob_cover = covers / num_sims * 100
-prob_over = overs / num_sims * 100
+comparar_mc = True
+reduccion = "ninguna"
+if modo_calculo == "Monte Carlo":
+    reduccion = opt_reduccion[st.selectbox(
+        "Reducción de varianza",
+        list(opt_reduccion.keys()),
+        index=0,
+        help="Misma precisión con menos simulaciones. El muestreo reducido corre en un solo proceso.",
+    )]
+elif modo_calculo == "Analítico":
+    comparar_mc = st.checkbox("Comparar contra Monte Carlo", value=False)
+elif modo_calculo == MODO_EXACTO_NHL:
+    cx1, cx2 = st.columns(2)
+    with cx1:
+        dispersion_nhl = st.number_input(
+            "Sobredispersión de goles (0 = Poisson)",
+            min_value=0.0, max_value=1.0, value=float(PARAMETROS.nhl_dispersion), step=0.01,
+            help="Varianza = media + dispersión · media² (binomial negativa).",
+        )
+    with cx2:
+        correlacion_nhl = st.number_input(
+            "Correlación de goles (componente común)",
+            min_value=0.0, max_value=0.9, value=float(PARAMETROS.nhl_correlacion), step=0.05,
+            help="Parte de los goles de los dos equipos sale de un mismo Poisson (ritmo del partido).",
+        )
+    comparar_mc = st.checkbox("Comparar contra Monte Carlo", value=False)
+elif modo_calculo == "Adaptativo":
+    semiancho_objetivo = st.number_input(
+        "Precisión objetivo (± pp, IC 95%)",
+        min_value=0.05, max_value=5.0, value=0.5, step=0.05,
+        help="El slider de simulaciones pasa a ser el máximo permitido.",
+    )
+
+sims_usadas = num_sims
+if modo_calculo == "Adaptativo":
+    adaptativo = simular_adaptativo_cacheado(
+        pts_local_global,
+        pts_visita_global,
+        desv,
+        spread_casa,
+        total_casa,
+        seed=int(seed_sims),
+        max_sims=num_sims,
+        semiancho_objetivo=semiancho_objetivo,
+        umbral=UMBRAL,
+    )
+    prob_cover_mc = adaptativo["prob_cover"]
+    prob_over_mc = adaptativo["prob_over"]
+    sims_usadas = adaptativo["num_sims"]
+elif reduccion != "ninguna":
+    reducido = simular_reducido_cacheado(
+        pts_local_global,
+        pts_visita_global,
+        desv,
+        spread_casa,
+        total_casa,
+        num_sims,
+        estrategia=reduccion,
+        seed=int(seed_sims),
+    )
+    prob_cover_mc = reducido["prob_cover"]
+    prob_over_mc = reducido["prob_over"]
+    sims_usadas = reducido["num_sims"]
+elif comparar_mc:
+    prob_cover_mc, prob_over_mc = simular_partido_cacheado(
+        pts_local_global,
+        pts_visita_global,
+        desv,
+        spread_casa,
+        total_casa,
+        num_sims,
+        seed=int(seed_sims),
+        _workers=int(workers_sims),
+    )
+
+prob_cover_ref, prob_over_ref, nombre_ref = prob_cover_an, prob_over_an, "analítico"
+dist_nhl = None
+if modo_calculo == MODO_EXACTO_NHL:
+    dist_nhl = distribucion_goles(pts_local_global, pts_visita_global, dispersion_nhl, correlacion_nhl)
+    prob_cover_ref = float(dist_nhl.prob_cover(spread_casa)) * 100
+    prob_over_ref = float(dist_nhl.prob_over(total_casa)) * 100
+    nombre_ref = "exacto"
+
+if modo_calculo in ("Analítico", MODO_EXACTO_NHL):
+    prob_cover, prob_over = prob_cover_ref, prob_over_ref
+else:
+    prob_cover, prob_over = prob_cover_mc, prob_over_mc
 
 st.write(f"Prob. de que {local_name or 'LOCAL'} cubra (GLOBAL): **{prob_cover:.1f}%**")
 st.write(f"Prob. de OVER (GLOBAL): **{prob_over:.1f}%**")
 
-# =========================================================
-# 7) Apuestas recomendadas (si ≥ 55%)
-# =========================================================
-st.subheader("7) Apuestas recomendadas (si ≥ 55%)")
-
-umbral = 55.0
-recs = []
+if modo_calculo == "Adaptativo":
+    lo_c, hi_c = adaptativo["ic_cover"]
+    lo_o, hi_o = adaptativo["ic_over"]
+    st.caption(
+        f"IC 95% cover: [{lo_c:.1f}%, {hi_c:.1f}%] · IC 95% over: [{lo_o:.1f}%, {hi_o:.1f}%] · "
+        f"{sims_usadas:,} de {num_sims:,} sims usadas ({adaptativo['motivo']})"
+    )
 
-prob_cover_local = prob_cover
-prob_cover_visita = 100.0 - prob_cover
+if modo_calculo == "Monte Carlo" and reduccion != "ninguna":
+    ess_txt = [
+        "∞ (exacto)" if ess == float("inf") else f"{ess:,.0f}"
+        for ess in (reducido["ess_cover"], reducido["ess_over"])
+    ]
+    st.caption(
+        f"Tamaño efectivo de muestra: cover ≈ {ess_txt[0]}, over ≈ {ess_txt[1]} "
+        f"(con {sims_usadas:,} sims generadas)"
+    )
 
-if prob_cover_local >= umbral:
-    recs.append(
-        f"🟢 Spread GLOBAL: {local_name or 'LOCAL'} {spread_casa:+.1f} → {prob_cover_local:.1f}%"
+if dist_nhl is not None:
+    res = dist_nhl.resultado()
+    st.caption(
+        f"Regulación: LOCAL {res['gana_local_regular'] * 100:.1f}% · "
+        f"empate {res['empate_regular'] * 100:.1f}% · VISITA {res['gana_visita_regular'] * 100:.1f}%  \n"
+        f"OT / shootout: LOCAL {res['gana_local_ot'] * 100:.1f}% · VISITA {res['gana_visita_ot'] * 100:.1f}%  \n"
+        f"Moneyline (incluye OT): LOCAL **{res['gana_local'] * 100:.1f}%** · "
+        f"VISITA **{res['gana_visita'] * 100:.1f}%**"
     )
 
-if prob_cover_visita >= umbral:
-    spread_visita_line = -spread_casa
-    recs.append(
-        f"🟢 Spread GLOBAL: {visita_name or 'VISITA'} {spread_visita_line:+.1f} → {prob_cover_visita:.1f}%"
+if comparar_mc:
+    st.caption(
+        f"Brecha {nombre_ref} − Monte Carlo: cover {prob_cover_ref - prob_cover_mc:+.2f} pp, "
+        f"over {prob_over_ref - prob_over_mc:+.2f} pp ({sims_usadas:,} sims)"
     )
 
-prob_over_val = prob_over
-prob_under_val = 100.0 - prob_over_val
+etapas.marcar("6) monte carlo")
+
+# =========================================================
+# 6b) ESCALERA DE LÍNEAS ALTERNATIVAS
+# =========================================================
+with st.expander("🪜 Escalera de líneas alternativas (spreads, totales, team totals)"):
+    if dist_nhl is not None:
+        st.caption("Distribución exacta de goles de arriba: sin muestreo.")
+    else:
+        st.caption(
+            "Una sola simulación con el número de sims y la semilla de arriba; "
+            "todas las líneas salen de las mismas muestras."
+        )
+    if st.checkbox("Calcular escalera", value=False):
+        if liga == "NHL":
+            ancho_spread, ancho_total, ancho_equipo = 3.0, 2.5, 2.0
+        else:
+            ancho_spread, ancho_total, ancho_equipo = 20.0, 10.0, 7.0
+
+        lineas_escalera = dict(
+            spreads=lineas_alrededor(0.0, ancho_spread),
+            totales=lineas_alrededor(total_casa or total_global, ancho_total),
+            totales_local=lineas_alrededor(pts_local_global, ancho_equipo),
+            totales_visita=lineas_alrededor(pts_visita_global, ancho_equipo),
+        )
+        if dist_nhl is not None:
+            escalera = escalera_lineas(dist_nhl, **lineas_escalera)
+        else:
+            escalera = escalera_cacheada(
+                pts_local_global, pts_visita_global, desv, num_sims, int(seed_sims),
+                **lineas_escalera,
+            )
+        for tab, (mercado, tabla) in zip(st.tabs(list(escalera.keys())), escalera.items()):
+            with tab:
+                st.dataframe(tabla, hide_index=True)
+
+etapas.marcar("6b) escalera")
 
-if prob_over_val >= umbral:
-    recs.append(
-        f"🟢 Total GLOBAL: OVER {total_casa:.1f} → {prob_over_val:.1f}%"
+# =========================================================
+# 6c) COMBINADAS DEL PARTIDO (same-game parlay)
+# =========================================================
+with st.expander("🎰 Combinadas del partido (patas correlacionadas)"):
+    st.caption(
+        "Todas las patas salen de las mismas simulaciones del marcador (sims y semilla de arriba), "
+        "así que spread, total y moneyline del mismo partido quedan correlacionados."
     )
-elif prob_under_val >= umbral:
-    recs.append(
-        f"🟢 Total GLOBAL: UNDER {total_casa:.1f} → {prob_under_val:.1f}%"
+    patas_juego = patas_partido(spread_casa, total_casa, ml_local, ml_visita)
+    nombres_patas = [p.texto().removeprefix("J1 ") for p in patas_juego]
+    elegidas = st.multiselect("Patas de la combinada", nombres_patas, default=nombres_patas[:1] + nombres_patas[2:3])
+    correlacion_marcador = st.number_input(
+        "Correlación de puntos LOCAL / VISITA",
+        min_value=-0.9, max_value=0.9, value=float(PARAMETROS.correlacion_marcador), step=0.05,
+        help="> 0: partidos de ritmo alto suben los puntos de los dos a la vez.",
     )
+    if len(elegidas) >= 2:
+        idx_elegidas = tuple(nombres_patas.index(n) for n in elegidas)
+        precio_parlay = st.number_input(
+            "Precio de la combinada (americano)",
+            value=int(round(precio_combinada([patas_juego[i].precio for i in idx_elegidas]))),
+            step=5,
+            help="Por defecto, el producto de las cuotas de las patas.",
+        )
+        combinada = simular_cartera_cacheada(
+            pts_local_global, pts_visita_global, desv, tuple(patas_juego),
+            tuple(Apuesta((i,)) for i in idx_elegidas) + (Apuesta(idx_elegidas, precio=precio_parlay),),
+            num_sims, correlacion_marcador, int(seed_sims),
+        )
+        tabla_combinada = combinada.tabla_apuestas()
+        st.dataframe(tabla_combinada, hide_index=True)
+        prob_parlay = combinada.prob_apuestas[-1]
+        prob_indep = float(tabla_combinada["prob indep. %"].iloc[-1])
+        st.caption(
+            f"Combinada: **{prob_parlay:.2f}%** con correlación vs {prob_indep:.2f}% si las patas "
+            f"fueran independientes ({prob_parlay - prob_indep:+.2f} pp)."
+        )
+    else:
+        st.info("Elige al menos dos patas.")
+
+etapas.marcar("6c) combinadas")
+
+# =========================================================
+# 6d) SENSIBILIDAD (malla de dos entradas)
+# =========================================================
+with st.expander("🌡️ Sensibilidad: cover / over moviendo dos entradas a la vez"):
+    ejes = ejes_disponibles(entrada)
+    valor_actual = {**{e: getattr(entrada, e) for e in ejes[:-2]}, "spread": spread_casa, "total": total_casa}
+
+    cs1, cs2 = st.columns(2)
+    rangos = []
+    for col, nombre_eje, eje_defecto in ((cs1, "X", "mult_local"), (cs2, "Y", "mult_visita")):
+        with col:
+            eje = st.selectbox(f"Eje {nombre_eje}", ejes, index=ejes.index(eje_defecto))
+            desde, hasta = rango_por_defecto(eje, float(valor_actual[eje]), liga)
+            desde = st.number_input(f"{eje}: desde", value=float(desde), format="%.3f")
+            hasta = st.number_input(f"{eje}: hasta", value=float(hasta), format="%.3f")
+            rangos.append((eje, desde, hasta))
+
+    cs3, cs4, cs5 = st.columns(3)
+    with cs3:
+        puntos_malla = st.slider("Puntos por eje", 10, 100, 50, 5)
+    with cs4:
+        modo_sens = st.radio("Cálculo", ["Analítico", "Monte Carlo (CRN)"], horizontal=True)
+    with cs5:
+        sims_sens = st.number_input("Sims por celda (CRN)", min_value=500, max_value=50_000,
+                                    value=5000, step=500)
+
+    (eje_x, x0, x1), (eje_y, y0, y1) = rangos
+    if eje_x == eje_y:
+        st.info("Elige dos entradas distintas.")
+    elif st.checkbox("Calcular sensibilidad", value=False):
+        with metricas.cronometro("sensibilidad"):
+            malla = barrido_cacheado(
+                entrada, LineasCasa(spread_casa, total_casa),
+                eje_x, tuple(np.linspace(x0, x1, puntos_malla)),
+                eje_y, tuple(np.linspace(y0, y1, puntos_malla)),
+                "analitico" if modo_sens == "Analítico" else "montecarlo",
+                int(sims_sens), int(seed_sims), PARAMETROS,
+            )
+        st.caption(
+            f"{len(malla):,} combinaciones. "
+            + ("Todas las celdas usan las mismas sims (números aleatorios comunes)."
+               if modo_sens != "Analítico" else "Fórmula analítica de la sección 6.")
+        )
+        for tab, (columna, titulo) in zip(
+            st.tabs(["Cover LOCAL %", "OVER %"]),
+            (("prob_cover", "Prob. cover LOCAL %"), ("prob_over", "Prob. OVER %")),
+        ):
+            with tab:
+                mapa = alt.Chart(malla).mark_rect().encode(
+                    x=alt.X(f"{eje_x}:O", axis=alt.Axis(format=".3~f", labelOverlap=True)),
+                    y=alt.Y(f"{eje_y}:O", sort="descending", axis=alt.Axis(format=".3~f", labelOverlap=True)),
+                    color=alt.Color(f"{columna}:Q", title=titulo,
+                                    scale=alt.Scale(scheme="redblue", domainMid=50)),
+                    tooltip=[
+                        alt.Tooltip(eje_x, format=".3f"), alt.Tooltip(eje_y, format=".3f"),
+                        alt.Tooltip("pts_local", format=".1f"), alt.Tooltip("pts_visita", format=".1f"),
+                        alt.Tooltip(columna, title=titulo, format=".1f"),
+                    ],
+                )
+                st.altair_chart(mapa)
+
+etapas.marcar("6d) sensibilidad")
+
+# =========================================================
+# 7) Apuestas recomendadas (si ≥ 55%)
+# =========================================================
+st.subheader("7) Apuestas recomendadas (si ≥ 55%)")
+
+recs = []
+recs_modelo = recomendaciones(prob_cover, prob_over, spread_casa, total_casa, UMBRAL)
+for rec in recs_modelo:
+    if rec.mercado == "Spread":
+        nombre = (local_name or "LOCAL") if rec.lado == "LOCAL" else (visita_name or "VISITA")
+        recs.append(f"🟢 Spread GLOBAL: {nombre} {rec.linea:+.1f} → {rec.prob:.1f}%")
+    else:
+        recs.append(f"🟢 Total GLOBAL: {rec.lado} {rec.linea:.1f} → {rec.prob:.1f}%")
 
 if recs:
     for r in recs:
@@ -841,6 +1146,8 @@ if recs:
 else:
     st.info("Por ahora ninguna llega al 55%.")
 
+etapas.marcar("7) recomendaciones")
+
 # =========================================================
 # 8) Edge del modelo vs casa
 # =========================================================
@@ -875,3 +1182,138 @@ else:
     )
 
 st.caption("Pon los moneylines para calcular el edge de forma más fina.")
+
+etapas.marcar("8) edge")
+
+# =========================================================
+# 9) Banca de temporada
+# =========================================================
+with st.expander("💰 Banca de temporada (fija vs Kelly fraccional vs Kelly con tope)"):
+    st.caption(
+        "Cada fila es una apuesta de la carta (prob. del modelo y precio americano). "
+        "La carta se repite una vez por jornada; cada camino juega la temporada completa."
+    )
+    carta_base = [
+        {"mercado": r.mercado, "lado": r.lado, "prob": round(r.prob, 2), "precio": -110}
+        for r in recs_modelo
+    ] or [{"mercado": "Spread", "lado": "LOCAL", "prob": UMBRAL, "precio": -110}]
+    carta = st.data_editor(carta_base, num_rows="dynamic", key="carta_banca", hide_index=True)
+
+    cb1, cb2, cb3 = st.columns(3)
+    with cb1:
+        jornadas = st.number_input("Jornadas de la temporada", min_value=1, value=17, step=1)
+        banca_inicial = st.number_input("Banca inicial", min_value=1.0, value=100.0, step=10.0)
+    with cb2:
+        unidad = st.number_input("Unidad (estrategia fija)", min_value=0.01, value=1.0, step=0.5)
+        fraccion_kelly = st.number_input("Fracción de Kelly", min_value=0.01, max_value=1.0,
+                                         value=0.25, step=0.05)
+    with cb3:
+        tope = st.number_input("Tope por apuesta (fracción de la banca)", min_value=0.001,
+                               max_value=1.0, value=0.02, step=0.005, format="%.3f")
+        num_caminos = st.select_slider("Temporadas simuladas",
+                                       [10_000, 100_000, 1_000_000, 5_000_000], value=100_000)
+
+    filas_carta = [f for f in carta if f.get("prob") and f.get("precio")]
+    if not filas_carta:
+        st.info("Agrega al menos una apuesta con probabilidad y precio.")
+    elif st.button("Simular banca"):
+        prob_carta = tuple(float(f["prob"]) for f in filas_carta) * int(jornadas)
+        precio_carta = tuple(float(f["precio"]) for f in filas_carta) * int(jornadas)
+        with metricas.cronometro("banca"), st.spinner("Simulando temporadas..."):
+            resultados = {
+                e: simular_banca_cacheada(prob_carta, precio_carta, e, num_caminos, int(seed_sims),
+                                          banca_inicial, unidad, fraccion_kelly, tope)
+                for e in ESTRATEGIAS
+            }
+        st.dataframe([r.resumen() for r in resultados.values()], hide_index=True)
+        st.caption(
+            f"{len(prob_carta)} apuestas por temporada. Ruina = tocar el {UMBRAL_RUINA:.0%} de la banca "
+            "inicial; quiebra = llegar a 0 (solo apuesta fija). Crecimiento = log-crecimiento medio "
+            "por apuesta."
+        )
+        for e, r in resultados.items():
+            st.write(f"**{e}** — percentiles de la temporada")
+            st.dataframe(r.percentiles(), hide_index=True)
+
+etapas.marcar("9) banca")
+
+# =========================================================
+# DIAGNÓSTICO (solo con SIMULADOR_METRICAS=1)
+# =========================================================
+if metricas.activo():
+    with st.expander("🩺 Diagnóstico (tiempos, caches, HTTP, sims/s)"):
+        cont = metricas.contadores()
+        hist = metricas.histogramas()
+
+        st.markdown("**Tiempo por etapa (acumulado en el proceso)**")
+        st.dataframe(
+            [
+                {
+                    "Etapa": dict(etiquetas)["etapa"],
+                    "Veces": h[-1],
+                    "ms promedio": round(h[-2] / h[-1] * 1000, 1),
+                    "s total": round(h[-2], 3),
+                }
+                for (nombre, etiquetas), h in sorted(hist.items())
+                if nombre == "etapa_segundos" and h[-1]
+            ],
+            hide_index=True,
+        )
+
+        st.markdown("**Caches de st.cache_data**")
+        filas_cache = []
+        for (nombre, etiquetas), llamadas in sorted(cont.items()):
+            if nombre == "cache_llamadas_total":
+                misses = cont.get(("cache_miss_total", etiquetas), 0.0)
+                filas_cache.append({
+                    "Cache": dict(etiquetas)["cache"],
+                    "Llamadas": int(llamadas),
+                    "Hits": int(llamadas - misses),
+                    "Misses": int(misses),
+                    "Hit %": round((llamadas - misses) / llamadas * 100, 1),
+                })
+        st.dataframe(filas_cache, hide_index=True)
+
+        st.markdown("**HTTP (SportsDataIO)**")
+        filas_http = {}
+        for (nombre, etiquetas), h in sorted(hist.items()):
+            if nombre == "http_segundos" and h[-1]:
+                filas_http[dict(etiquetas)["endpoint"]] = {
+                    "Endpoint": dict(etiquetas)["endpoint"],
+                    "Peticiones": h[-1],
+                    "ms promedio": round(h[-2] / h[-1] * 1000, 1),
+                    "Status": "",
+                }
+        for (nombre, etiquetas), n in sorted(cont.items()):
+            if nombre == "http_respuestas_total" and dict(etiquetas)["endpoint"] in filas_http:
+                fila = filas_http[dict(etiquetas)["endpoint"]]
+                fila["Status"] += f"{dict(etiquetas)['status']}×{int(n)} "
+        st.dataframe(list(filas_http.values()), hide_index=True)
+        disco = {dict(e)["resultado"]: int(n) for (nombre, e), n in cont.items() if nombre == "cache_disco_total"}
+        if disco:
+            st.caption("Cache en disco: " + ", ".join(f"{k}={v}" for k, v in sorted(disco.items())))
+        planificacion = {
+            "coalescidas": sum(n for (nombre, _), n in cont.items() if nombre == "http_coalescidas_total"),
+            "reintentos": sum(n for (nombre, _), n in cont.items() if nombre == "http_reintentos_total"),
+            "esperas por cupo": sum(n for (nombre, _), n in cont.items() if nombre == "http_esperas_cupo_total"),
+            "sin cupo": sum(n for (nombre, _), n in cont.items() if nombre == "http_sin_cupo_total"),
+        }
+        st.caption("Planificador: " + ", ".join(f"{k}={int(v)}" for k, v in planificacion.items()))
+
+        st.markdown("**Simulaciones por segundo**")
+        st.dataframe(
+            [
+                {"Motor": motor, "Sims": int(cont.get(("sims_total", (("motor", motor),)), 0)), "Sims/s": round(v)}
+                for motor, v in sorted(metricas.sims_por_segundo().items())
+            ],
+            hide_index=True,
+        )
+
+        st.download_button(
+            "Descargar métricas (formato Prometheus)",
+            metricas.exportar_prometheus(),
+            file_name="simulador.prom",
+            mime="text/plain",
+        )
+
+metricas.escribir_prometheus()
@@ -0,0 +1,12 @@
+"""
+Benchmarks del motor (sin red ni API keys).
+
+    cd Simulacion
+    python -m benchmarks                 # compara contra benchmarks/baseline.json
+    python -m benchmarks --guardar       # reescribe la baseline
+
+Los tiempos se guardan y comparan como múltiplos de una carga de
+referencia medida en la misma corrida (ver __main__), así la baseline
+sirve en otra máquina.
+    python -m benchmarks --filtro montecarlo --rapido
+"""
@@ -0,0 +1,145 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.casos import CASOS
+
+# =========================================================
+# CORRIDA DE BENCHMARKS Y COMPARACIÓN CONTRA LA BASELINE
+# =========================================================
+#
+# La baseline no guarda segundos sino múltiplos de una carga de
+# REFERENCIA (NumPy + un poco de Python, como los casos) medida junto a
+# cada caso. Así una máquina más lenta o más rápida, o una que
+# se frena a mitad de la corrida, mueve la referencia y el caso por
+# igual, y la marca de regresión compara la razón caso / referencia,
+# no el hardware.
+
+RUTA_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Más lento que la baseline en más de este porcentaje = regresión.
+UMBRAL_REGRESION = 0.25
+
+
+def _tamano_lote(fn, tiempo_minimo):
+    inicio = time.perf_counter()
+    fn()  # calentamiento
+    una = time.perf_counter() - inicio
+    return max(1, int(tiempo_minimo / max(una, 1e-9)))
+
+
+def _por_llamada(fn, lote):
+    inicio = time.perf_counter()
+    for _ in range(lote):
+        fn()
+    return (time.perf_counter() - inicio) / lote
+
+
+def medir(fn, repeticiones=5, tiempo_minimo=0.05):
+    """Mejor tiempo por llamada (s) del caso y de la referencia, en lotes alternados.
+
+    Alternar caso y referencia hace que una frenada de la máquina a mitad
+    de la medición pegue a los dos, y la razón entre ambos se sostiene.
+    """
+    lote = _tamano_lote(fn, tiempo_minimo)
+    lote_ref = _tamano_lote(referencia, tiempo_minimo)
+
+    caso, ref = [], []
+    for _ in range(repeticiones):
+        ref.append(_por_llamada(referencia, lote_ref))
+        caso.append(_por_llamada(fn, lote))
+    return min(caso), min(ref)
+
+
+def referencia():
+    """Carga fija: normales + conteos vectorizados y un loop de Python con dicts."""
+    rng = np.random.default_rng(0)
+    x = np.maximum(0.0, rng.normal(24.0, 13.0, (20, 10_000)))
+    np.count_nonzero(x - x[::-1] >= 3.0, axis=1)
+    np.sort(x, axis=1)
+    d = {}
+    for i in range(20_000):
+        d[f"k{i % 500}"] = d.get(f"k{i % 500}", 0) + i
+
+
+def formato_tiempo(segundos):
+    if segundos < 1e-3:
+        return f"{segundos * 1e6:9.1f} µs"
+    if segundos < 1:
+        return f"{segundos * 1e3:9.2f} ms"
+    return f"{segundos:9.3f} s "
+
+
+def cargar_baseline(ruta):
+    """Tiempos de la baseline en múltiplos de la referencia ({} si no hay)."""
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f).get("relativos", {})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del motor (offline).")
+    parser.add_argument("--filtro", default="", help="solo casos cuyo nombre contenga este texto")
+    parser.add_argument("--rapido", action="store_true", help="salta los casos más pesados")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION,
+                        help="regresión si es más lento que la baseline en esta fracción")
+    parser.add_argument("--baseline", default=RUTA_BASELINE)
+    parser.add_argument("--guardar", action="store_true", help="escribe los tiempos como nueva baseline")
+    args = parser.parse_args(argv)
+
+    baseline = cargar_baseline(args.baseline)
+    resultados = {}
+    regresiones = []
+    referencias = []
+
+    for nombre, preparar, pesado in CASOS:
+        if args.filtro not in nombre or (args.rapido and pesado):
+            continue
+        segundos, ref = medir(preparar(), repeticiones=args.repeticiones)
+        referencias.append(ref)
+        resultados[nombre] = segundos / ref
+
+        previo = baseline.get(nombre)
+        if previo:
+            # previo y la razón van en unidades de referencia: el hardware se cancela.
+            razon = resultados[nombre] / previo
+            marca = "  ⚠️ REGRESIÓN" if razon > 1 + args.umbral else ""
+            if marca:
+                regresiones.append(nombre)
+            comparacion = f"{formato_tiempo(previo * ref)}  x{razon:5.2f}{marca}"
+        else:
+            comparacion = "(sin baseline)"
+        print(f"{nombre:48s} {formato_tiempo(segundos)}   {comparacion}", flush=True)
+
+    if referencias:
+        print(f"{'(referencia, mediana)':48s} {formato_tiempo(statistics.median(referencias))}")
+
+    if args.guardar:
+        todos = {**baseline, **resultados}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "maquina": f"{platform.machine()} · {platform.processor() or platform.system()} · "
+                           f"Python {platform.python_version()} · {os.cpu_count()} CPU",
+                "referencia_s": statistics.median(referencias) if referencias else None,
+                "relativos": dict(sorted(todos.items())),
+            }, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Baseline guardada en {args.baseline}")
+        return 0
+
+    if regresiones:
+        print(f"\n{len(regresiones)} regresiones (> {args.umbral:.0%} sobre la baseline).")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import numpy as np
+
+from motor.analitico import probabilidades_analiticas
+from motor.api import get_nfl_points_pg_v2, indexar_equipos_nba, indexar_equipos_nfl
+from motor.banca import simular_banca
+from motor.combinadas import Apuesta, Pata, simular_cartera
+from motor.goles import DistribucionGoles
+from motor.jornada import cotizar_jornada_nfl
+from motor.mercado import mejor_linea_partido, mejores_lineas, tabla_libros
+from motor.montecarlo import simular_jornada, simular_partido
+from motor.odds import indexar_odds_semana, resolver_matchup
+from motor.precios import LineasCasa
+from motor.proyecciones import EntradaNBA
+from motor.sensibilidad import barrido
+
+from benchmarks.sinteticos import cargar_fixture, game_odds_semana, stats_slate
+
+# =========================================================
+# CASOS DE BENCHMARK
+# =========================================================
+#
+# Cada caso es (nombre, preparar, pesado): preparar() arma los datos
+# FUERA del tiempo medido y devuelve la función sin argumentos que se
+# cronometra. Los 'pesados' se saltan con --rapido.
+
+TAMANOS_SLATE = (1, 10, 100, 1000)
+TAMANOS_SIMS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+SIMS_POR_PARTIDO_JORNADA = 10_000
+
+
+def _stats_temporada():
+    data = cargar_fixture("nfl_team_season_stats.json")
+    return lambda: [get_nfl_points_pg_v2(t) for t in data]
+
+
+def _indice_nfl():
+    data = cargar_fixture("nfl_team_season_stats.json")
+    return lambda: indexar_equipos_nfl(data)
+
+
+def _indice_nba():
+    data = cargar_fixture("nba_standings.json")
+    return lambda: indexar_equipos_nba(data)
+
+
+def _busqueda_equipos(textos):
+    def preparar():
+        registro = indexar_equipos_nfl(cargar_fixture("nfl_team_season_stats.json"))
+        return lambda: [registro.buscar(t) for t in textos]
+    return preparar
+
+
+def _traer_partido():
+    """Mismo camino que traer_odds_partido_nfl (sin la cache de Streamlit)."""
+    data = cargar_fixture("nfl_game_odds_semana.json")
+    registro = indexar_equipos_nfl(cargar_fixture("nfl_team_season_stats.json"))
+    indice = indexar_odds_semana(data)
+    mejores = mejores_lineas(tabla_libros(data))
+    local, visita = data[-1]["HomeTeam"], data[-1]["AwayTeam"]
+
+    def correr():
+        partido, local_es_home, _ = resolver_matchup(indice, local, visita, registro)
+        return mejor_linea_partido(mejores, partido.home, partido.away, local_es_home)
+    return correr
+
+
+def _indexar_odds(n):
+    def preparar():
+        data = game_odds_semana(n, 8, seed=n)
+        return lambda: indexar_odds_semana(data)
+    return preparar
+
+
+def _mercado(n):
+    def preparar():
+        data = game_odds_semana(n, 8, seed=n)
+        return lambda: mejores_lineas(tabla_libros(data))
+    return preparar
+
+
+def _simular_partido(sims):
+    return lambda: (lambda: simular_partido(24.5, 21.0, 13.0, -3.5, 45.5, sims, seed=1))
+
+
+def _slate(n):
+    rng = np.random.default_rng(n)
+    return (
+        rng.uniform(17, 30, n), rng.uniform(17, 30, n),
+        np.round(rng.normal(0, 5, n) * 2) / 2, np.round(rng.uniform(38, 52, n) * 2) / 2,
+    )
+
+
+def _simular_jornada(n):
+    def preparar():
+        pts_l, pts_v, spread, total = _slate(n)
+        return lambda: simular_jornada(pts_l, pts_v, 13.0, spread, total,
+                                       SIMS_POR_PARTIDO_JORNADA, seed=1)
+    return preparar
+
+
+def _analitico(n):
+    def preparar():
+        pts_l, pts_v, spread, total = _slate(n)
+        return lambda: probabilidades_analiticas(pts_l, pts_v, 13.0, spread, total)
+    return preparar
+
+
+def _nhl_exacto():
+    """Tabla conjunta + puck line / total sin la cache de distribuciones."""
+    def correr():
+        dist = DistribucionGoles.desde_modelo(3.3, 2.8, dispersion=0.1, correlacion=0.2)
+        return dist.prob_cover(-1.5), dist.prob_over(6.5)
+    return correr
+
+
+def _banca(estrategia, caminos):
+    def preparar():
+        rng = np.random.default_rng(7)
+        prob, precio = rng.uniform(52, 60, 300), rng.choice([-115, -110, -105, 100], 300)
+        return lambda: simular_banca(prob, precio, estrategia, caminos, seed=1)
+    return preparar
+
+
+def _combinada(patas_por_apuesta):
+    """10 partidos, cover LOCAL de cada uno: una combinada de 10 o 10 sencillas."""
+    def preparar():
+        pts_l, pts_v, spread, _ = _slate(10)
+        patas = [Pata(j, "Spread", "LOCAL", s) for j, s in enumerate(spread)]
+        apuestas = [Apuesta(tuple(range(i, i + patas_por_apuesta))) for i in range(0, 10, patas_por_apuesta)]
+        return lambda: simular_cartera(pts_l, pts_v, 13.0, patas, apuestas, 100_000, seed=1)
+    return preparar
+
+
+def _sensibilidad(modo):
+    """Malla 50 × 50 de multiplicadores de estado, partido NBA fijo."""
+    def preparar():
+        entrada = EntradaNBA(115, 110, 112, 113, 100, 118, 110, 98, 114, 112)
+        valores = np.linspace(0.90, 1.06, 50)
+        return lambda: barrido(entrada, LineasCasa(-3.5, 226.5), "mult_local", valores,
+                               "mult_visita", valores, modo, 10_000, seed=1)
+    return preparar
+
+
+def _cotizar_jornada():
+    data = cargar_fixture("nfl_game_odds_semana.json")
+    registro = indexar_equipos_nfl(cargar_fixture("nfl_team_season_stats.json"))
+    mejores = mejores_lineas(tabla_libros(data))
+    return lambda: cotizar_jornada_nfl(data, registro, SIMS_POR_PARTIDO_JORNADA, seed=1, mejores=mejores)
+
+
+def _cotizar_jornada_sintetica(n):
+    def preparar():
+        data = game_odds_semana(n, 8, seed=n)
+        registro = indexar_equipos_nfl(stats_slate(data, seed=n))
+        mejores = mejores_lineas(tabla_libros(data))
+        return lambda: cotizar_jornada_nfl(data, registro, SIMS_POR_PARTIDO_JORNADA, seed=1, mejores=mejores)
+    return preparar
+
+
+CASOS = [
+    ("api.get_nfl_points_pg_v2[temporada]", _stats_temporada, False),
+    ("api.indexar_equipos_nfl[fixture]", _indice_nfl, False),
+    ("api.indexar_equipos_nba[fixture]", _indice_nba, False),
+    ("equipos.buscar[codigo]", _busqueda_equipos(["DAL", "NYG", "KC", "SF"]), False),
+    ("equipos.buscar[prefijo+difuso]", _busqueda_equipos(["cowb", "Dalas", "kansas", "49er"]), False),
+    ("odds.traer_partido[fixture]", _traer_partido, False),
+    ("jornada.cotizar_jornada_nfl[fixture]", _cotizar_jornada, False),
+    ("goles.DistribucionGoles[NB + correlación]", _nhl_exacto, False),
+    ("banca.simular_banca[fija, 1e5 x 300 apuestas]", _banca("fija", 100_000), False),
+    ("banca.simular_banca[kelly, 1e5 x 300 apuestas]", _banca("kelly", 100_000), False),
+    ("banca.simular_banca[kelly, 1e6 x 300 apuestas]", _banca("kelly", 1_000_000), True),
+    ("combinadas.simular_cartera[10 sencillas x 1e5]", _combinada(1), False),
+    ("combinadas.simular_cartera[combinada de 10 x 1e5]", _combinada(10), False),
+    ("sensibilidad.barrido[50x50 analítico]", _sensibilidad("analitico"), False),
+    ("sensibilidad.barrido[50x50 CRN x 1e4]", _sensibilidad("montecarlo"), False),
+]
+CASOS += [(f"odds.indexar_odds_semana[{n} juegos]", _indexar_odds(n), n >= 1000) for n in TAMANOS_SLATE]
+CASOS += [(f"mercado.mejores_lineas[{n} juegos]", _mercado(n), n >= 1000) for n in TAMANOS_SLATE]
+CASOS += [(f"analitico.probabilidades[{n} juegos]", _analitico(n), False) for n in TAMANOS_SLATE]
+CASOS += [(f"montecarlo.simular_partido[{s:.0e} sims]", _simular_partido(s), s >= 10_000_000)
+          for s in TAMANOS_SIMS]
+CASOS += [(f"montecarlo.simular_jornada[{n} juegos x 1e4]", _simular_jornada(n), n >= 1000)
+          for n in TAMANOS_SLATE]
+CASOS += [(f"jornada.cotizar_jornada_nfl[{n} juegos x 1e4]", _cotizar_jornada_sintetica(n), n >= 1000)
+          for n in TAMANOS_SLATE[1:]]
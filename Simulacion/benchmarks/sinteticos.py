@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+from motor.escalera import precio_americano_justo
+
+# =========================================================
+# PAYLOADS CON FORMA DE SPORTSDATAIO (fixtures y slates sintéticos)
+# =========================================================
+#
+# Las fixtures de benchmarks/fixtures/ salen de aquí con semilla fija
+# (python -m benchmarks.sinteticos); los slates de N juegos se generan
+# al vuelo con el mismo esquema que GameOddsByWeek.
+
+DIR_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+EQUIPOS_NFL = [
+    ("ARI", "Arizona", "Cardinals"), ("ATL", "Atlanta", "Falcons"), ("BAL", "Baltimore", "Ravens"),
+    ("BUF", "Buffalo", "Bills"), ("CAR", "Carolina", "Panthers"), ("CHI", "Chicago", "Bears"),
+    ("CIN", "Cincinnati", "Bengals"), ("CLE", "Cleveland", "Browns"), ("DAL", "Dallas", "Cowboys"),
+    ("DEN", "Denver", "Broncos"), ("DET", "Detroit", "Lions"), ("GB", "Green Bay", "Packers"),
+    ("HOU", "Houston", "Texans"), ("IND", "Indianapolis", "Colts"), ("JAX", "Jacksonville", "Jaguars"),
+    ("KC", "Kansas City", "Chiefs"), ("LAC", "Los Angeles", "Chargers"), ("LAR", "Los Angeles", "Rams"),
+    ("LV", "Las Vegas", "Raiders"), ("MIA", "Miami", "Dolphins"), ("MIN", "Minnesota", "Vikings"),
+    ("NE", "New England", "Patriots"), ("NO", "New Orleans", "Saints"), ("NYG", "New York", "Giants"),
+    ("NYJ", "New York", "Jets"), ("PHI", "Philadelphia", "Eagles"), ("PIT", "Pittsburgh", "Steelers"),
+    ("SEA", "Seattle", "Seahawks"), ("SF", "San Francisco", "49ers"), ("TB", "Tampa Bay", "Buccaneers"),
+    ("TEN", "Tennessee", "Titans"), ("WAS", "Washington", "Commanders"),
+]
+
+EQUIPOS_NBA = [
+    ("ATL", "Atlanta", "Hawks"), ("BOS", "Boston", "Celtics"), ("BKN", "Brooklyn", "Nets"),
+    ("CHA", "Charlotte", "Hornets"), ("CHI", "Chicago", "Bulls"), ("CLE", "Cleveland", "Cavaliers"),
+    ("DAL", "Dallas", "Mavericks"), ("DEN", "Denver", "Nuggets"), ("DET", "Detroit", "Pistons"),
+    ("GS", "Golden State", "Warriors"), ("HOU", "Houston", "Rockets"), ("IND", "Indiana", "Pacers"),
+    ("LAC", "Los Angeles", "Clippers"), ("LAL", "Los Angeles", "Lakers"), ("MEM", "Memphis", "Grizzlies"),
+    ("MIA", "Miami", "Heat"), ("MIL", "Milwaukee", "Bucks"), ("MIN", "Minnesota", "Timberwolves"),
+    ("NO", "New Orleans", "Pelicans"), ("NY", "New York", "Knicks"), ("OKC", "Oklahoma City", "Thunder"),
+    ("ORL", "Orlando", "Magic"), ("PHI", "Philadelphia", "76ers"), ("PHO", "Phoenix", "Suns"),
+    ("POR", "Portland", "Trail Blazers"), ("SAC", "Sacramento", "Kings"), ("SA", "San Antonio", "Spurs"),
+    ("TOR", "Toronto", "Raptors"), ("UTA", "Utah", "Jazz"), ("WAS", "Washington", "Wizards"),
+]
+
+SPORTSBOOKS = ["Consensus", "DraftKings", "FanDuel", "BetMGM", "Caesars", "PointsBet", "BetRivers", "Fanatics"]
+
+# Campos numéricos que trae TeamSeasonStats además de los de puntos.
+CAMPOS_STATS_NFL = [
+    "FirstDowns", "RushingAttempts", "RushingYards", "PassingAttempts", "PassingCompletions",
+    "PassingYards", "PassingTouchdowns", "PassingInterceptions", "Penalties", "PenaltyYards",
+    "Fumbles", "FumblesLost", "TimesSacked", "ThirdDownAttempts", "ThirdDownConversions",
+    "FourthDownAttempts", "FourthDownConversions", "RedZoneAttempts", "RedZoneConversions",
+    "GoalToGoAttempts", "GoalToGoConversions", "ReturnYards", "PuntReturns", "KickReturns",
+    "Punts", "PuntYards", "FieldGoalsAttempted", "FieldGoalsMade", "ExtraPointKickingAttempts",
+    "Touchdowns", "OffensivePlays", "OffensiveYards", "TimeOfPossessionMinutes", "Takeaways",
+    "Giveaways", "OpponentFirstDowns", "OpponentRushingYards", "OpponentPassingYards",
+    "OpponentTouchdowns", "OpponentTimesSacked", "OpponentFumblesLost", "OpponentOffensiveYards",
+]
+
+
+def team_season_stats_nfl(seed=0, season="2025REG"):
+    rng = np.random.default_rng(seed)
+    out = []
+    for i, (codigo, ciudad, nombre) in enumerate(EQUIPOS_NFL):
+        juegos = 10
+        victorias = int(rng.integers(0, juegos + 1))
+        fila = {
+            "SeasonType": 1, "Season": 2025, "Team": codigo, "TeamName": nombre, "TeamID": i + 1,
+            "TeamSeasonID": 1000 + i, "Games": juegos, "Wins": victorias, "Losses": juegos - victorias,
+            "Ties": 0, "Score": int(rng.integers(160, 320)), "OpponentScore": int(rng.integers(160, 320)),
+            "TotalScore": None, "Conference": "AFC" if i % 2 else "NFC",
+            "Division": ["East", "North", "South", "West"][i % 4], "SeasonLabel": season,
+        }
+        fila["TotalScore"] = fila["Score"] + fila["OpponentScore"]
+        for campo in CAMPOS_STATS_NFL:
+            fila[campo] = float(np.round(rng.uniform(0, 5000), 1))
+        out.append(fila)
+    return out
+
+
+def standings_nba(seed=0):
+    rng = np.random.default_rng(seed)
+    out = []
+    for i, (codigo, ciudad, nombre) in enumerate(EQUIPOS_NBA):
+        victorias = int(rng.integers(5, 35))
+        out.append({
+            "Season": 2025, "SeasonType": 1, "TeamID": i + 1, "Key": codigo, "City": ciudad,
+            "Name": nombre, "Conference": "Eastern" if i % 2 else "Western",
+            "Division": ["Atlantic", "Central", "Southeast", "Northwest", "Pacific", "Southwest"][i % 6],
+            "Wins": victorias, "Losses": 40 - victorias, "Percentage": round(victorias / 40, 3),
+            "ConferenceWins": victorias // 2, "ConferenceLosses": (40 - victorias) // 2,
+            "HomeWins": victorias // 2, "HomeLosses": (40 - victorias) // 2,
+            "AwayWins": victorias - victorias // 2, "AwayLosses": 40 - victorias - (40 - victorias) // 2,
+            "LastTenWins": int(rng.integers(0, 11)), "Streak": int(rng.integers(-5, 6)),
+            "GamesBack": float(rng.integers(0, 20)),
+            "PointsPerGameFor": float(np.round(rng.uniform(104, 122), 1)),
+            "PointsPerGameAgainst": float(np.round(rng.uniform(104, 122), 1)),
+        })
+    return out
+
+
+def game_odds_semana(n_juegos=16, n_libros=8, semana=13, seed=0):
+    """GameOddsByWeek con n_juegos partidos (códigos T0000, T0001... si no alcanzan los 32 reales)."""
+    rng = np.random.default_rng(seed)
+    if 2 * n_juegos <= len(EQUIPOS_NFL):
+        codigos = [c for c, _, _ in EQUIPOS_NFL]
+        codigos = [codigos[i] for i in rng.permutation(len(codigos))]
+    else:
+        codigos = [f"T{i:04d}" for i in range(2 * n_juegos)]
+
+    juegos = []
+    for j in range(n_juegos):
+        home, away = codigos[2 * j], codigos[2 * j + 1]
+        spread = float(np.round(rng.normal(0, 5) * 2) / 2)
+        total = float(np.round(rng.uniform(38, 52) * 2) / 2)
+        libros = []
+        for b in range(n_libros):
+            sp = spread + float(rng.choice([-0.5, 0.0, 0.0, 0.5]))
+            # Moneylines coherentes con el spread, con ~2.5% de vig por lado.
+            p_home = float(np.clip(1.0 / (1.0 + np.exp(sp / 6.5)), 0.03, 0.97))
+            ml_home = int(round(precio_americano_justo(min(0.99, p_home * 1.025))))
+            ml_away = int(round(precio_americano_justo(min(0.99, (1 - p_home) * 1.025))))
+            libros.append({
+                "GameOddId": 10_000 * j + b, "Sportsbook": SPORTSBOOKS[b % len(SPORTSBOOKS)],
+                "SportsbookId": b + 1, "GameId": 1000 + j, "Created": "2025-11-30T12:00:00",
+                "Updated": "2025-11-30T12:05:00", "HomeMoneyLine": ml_home, "AwayMoneyLine": ml_away,
+                "HomePointSpread": sp, "AwayPointSpread": -sp, "HomePointSpreadPayout": -110,
+                "AwayPointSpreadPayout": -110, "OverUnder": total + float(rng.choice([-0.5, 0.0, 0.5])),
+                "OverPayout": -110, "UnderPayout": -110, "OddType": "live" if b == 0 else "pregame",
+            })
+        juegos.append({
+            "GameId": 1000 + j, "Season": 2025, "SeasonType": 1, "Week": semana,
+            "Day": "2025-11-30T00:00:00", "DateTime": "2025-11-30T13:00:00", "Status": "Scheduled",
+            "HomeTeamId": 2 * j, "AwayTeamId": 2 * j + 1, "HomeTeamName": home, "AwayTeamName": away,
+            "HomeTeam": home, "AwayTeam": away, "GlobalGameId": 1000 + j,
+            "PregameOdds": libros, "LiveOdds": [], "AlternateMarketPregameOdds": [],
+        })
+    return juegos
+
+
+def stats_slate(juegos, seed=0):
+    """TeamSeasonStats mínimo para todos los equipos de un slate sintético."""
+    rng = np.random.default_rng(seed)
+    codigos = sorted({g["HomeTeam"] for g in juegos} | {g["AwayTeam"] for g in juegos})
+    return [
+        {"Team": c, "TeamName": c, "Games": 10, "Wins": 5, "Losses": 5, "Ties": 0,
+         "Score": int(rng.integers(160, 320)), "OpponentScore": int(rng.integers(160, 320))}
+        for c in codigos
+    ]
+
+
+def cargar_fixture(nombre: str):
+    with open(os.path.join(DIR_FIXTURES, nombre), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def guardar_fixtures():
+    """Escribe las fixtures con semilla fija (solo hace falta si cambia el esquema)."""
+    os.makedirs(DIR_FIXTURES, exist_ok=True)
+    fixtures = {
+        "nfl_team_season_stats.json": team_season_stats_nfl(seed=1),
+        "nba_standings.json": standings_nba(seed=2),
+        "nfl_game_odds_semana.json": game_odds_semana(16, 8, seed=3),
+    }
+    for nombre, data in fixtures.items():
+        with open(os.path.join(DIR_FIXTURES, nombre), "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+            f.write("\n")
+        print(f"{nombre}: {len(data)} registros")
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description="Regenera las fixtures de los benchmarks.").parse_args()
+    guardar_fixtures()
@@ -0,0 +1,6 @@
+"""
+Motor de cálculo del simulador de apuestas.
+
+Módulos sin dependencia de Streamlit, importables desde la app,
+trabajos batch o benchmarks.
+"""
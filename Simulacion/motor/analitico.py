@@ -0,0 +1,94 @@
+import numpy as np
+from scipy.special import ndtr
+
+# =========================================================
+# PRICING ANALÍTICO (sin simulación)
+# =========================================================
+#
+# Mismo modelo que el Monte Carlo de la sección 6: cada equipo anota
+# X ~ Normal(pts, desv) recortado en 0 (L = max(0, X)), independientes.
+# Condicionando en el marcador de la visita, la prob. del local es una
+# CDF normal; lo que queda es una integral 1D que se resuelve con
+# cuadratura de Gauss-Legendre (error << 0.01 pp).
+
+_NODOS_GL, _PESOS_GL = np.polynomial.legendre.leggauss(64)
+
+# Fuera de ±8.5 desviaciones la densidad normal es despreciable.
+_Z_MAX = 8.5
+
+_DENSIDAD = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+def _integral_phi_por(a, b, f):
+    """∫_a^b φ(z) · f(z) dz con Gauss-Legendre, vectorizado por partido."""
+    a = np.clip(a, -_Z_MAX, _Z_MAX)[..., None]
+    b = np.clip(b, -_Z_MAX, _Z_MAX)[..., None]
+    media = (b + a) / 2.0
+    radio = (b - a) / 2.0
+    z = media + radio * _NODOS_GL
+    phi = _DENSIDAD * np.exp(-0.5 * z * z)
+    return np.sum(_PESOS_GL * phi * f(z), axis=-1) * radio[..., 0]
+
+
+def prob_cover_analitica(pts_local, pts_visita, desv, spread_casa):
+    """P[(L - V) + spread_casa >= 0] como fracción (0..1)."""
+    mu_l, mu_v, s, sp = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (pts_local, pts_visita, desv, spread_casa))
+    )
+    c = -sp  # margen mínimo que necesita el local
+
+    # Visita en 0 (masa del recorte): basta con L >= c.
+    p_v0 = ndtr(-mu_v / s)
+    p_l_cubre = np.where(c <= 0, 1.0, ndtr((mu_l - c) / s))
+
+    # Visita en (0, k]: con k = max(0, -c) el local cubre seguro.
+    k = np.maximum(0.0, -c)
+    p_seguro = ndtr((k - mu_v) / s) - p_v0
+
+    # Visita en (k, ∞): necesita X >= y + c.
+    d = (mu_v + c - mu_l) / s
+    cola = _integral_phi_por(
+        (k - mu_v) / s,
+        np.full_like(k, _Z_MAX),
+        lambda z: ndtr(-(z[...] + d[..., None])),
+    )
+
+    return p_v0 * p_l_cubre + p_seguro + cola
+
+
+def prob_over_analitica(pts_local, pts_visita, desv, total_casa):
+    """P[(L + V) > total_casa] como fracción (0..1)."""
+    mu_l, mu_v, s, t = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (pts_local, pts_visita, desv, total_casa))
+    )
+
+    # Visita en 0: hace falta L > t.
+    p_v0 = ndtr(-mu_v / s)
+    p_l_pasa = np.where(t < 0, 1.0, ndtr((mu_l - t) / s))
+
+    # Visita por encima de max(0, t): over seguro.
+    k = np.maximum(0.0, t)
+    p_seguro = ndtr((mu_v - k) / s)
+
+    # Visita en (0, k]: hace falta X > t - y.
+    d = (t - mu_v - mu_l) / s
+    tramo = _integral_phi_por(
+        -mu_v / s,
+        (k - mu_v) / s,
+        lambda z: ndtr(z - d[..., None]),
+    )
+
+    return p_v0 * p_l_pasa + p_seguro + tramo
+
+
+def probabilidades_analiticas(pts_local, pts_visita, desv, spread_casa, total_casa):
+    """
+    Versión analítica de la sección 6.
+    Devuelve (prob_cover, prob_over) en porcentaje; acepta escalares o
+    arrays (un valor por partido).
+    """
+    prob_cover = prob_cover_analitica(pts_local, pts_visita, desv, spread_casa) * 100
+    prob_over = prob_over_analitica(pts_local, pts_visita, desv, total_casa) * 100
+    if np.ndim(prob_cover) == 0:
+        return float(prob_cover), float(prob_over)
+    return prob_cover, prob_over
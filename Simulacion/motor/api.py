@@ -0,0 +1,164 @@
+import os
+
+from motor.cache_disco import get_json_cacheado
+from motor.equipos import RegistroEquipos, registro_desde_payload
+
+# =========================================================
+# SPORTSDATAIO: ENDPOINTS Y DESCARGAS (sin Streamlit)
+# =========================================================
+
+NFL_SEASON_LABEL = "2025REG"
+NBA_SEASON_YEAR = "2025"
+
+# Se puede apuntar a un servidor local de prueba con SPORTSDATA_BASE_URL.
+SPORTSDATA_BASE_URL = os.environ.get("SPORTSDATA_BASE_URL", "https://api.sportsdata.io").rstrip("/")
+
+# NFL Team stats (ODDS)
+NFL_TEAMSEASON_URL = f"{SPORTSDATA_BASE_URL}/api/nfl/odds/json/TeamSeasonStats/2025REG"
+
+# NFL Odds por semana (ODDS)
+NFL_GAMEODDS_WEEK_BASE = f"{SPORTSDATA_BASE_URL}/api/nfl/odds/json/GameOddsByWeek"
+
+# NBA Standings (SCORES v3)
+NBA_STANDINGS_URL = f"{SPORTSDATA_BASE_URL}/v3/nba/scores/json/Standings/2025"
+
+# Vigencia en disco de cada endpoint (mismos TTL que el cache de la app).
+TTL_TEAM_STATS = 600
+TTL_ODDS_SEMANA = 300
+
+
+# =========================================================
+# NFL: CÁLCULO DE PUNTOS POR JUEGO DESDE TeamSeasonStats (ODDS)
+# =========================================================
+
+def get_nfl_points_pg_v2(obj: dict):
+    """
+    Usa los campos que aparecen en TeamSeasonStats (ODDS):
+
+      - Score / PointsFor       -> puntos a favor total
+      - OpponentScore / PointsAgainst -> puntos en contra total
+      - Wins / Losses / Ties o Games -> número de partidos
+    """
+    score = obj.get("PointsFor")
+    opp_score = obj.get("PointsAgainst")
+
+    if score is None:
+        score = obj.get("Score")
+    if opp_score is None:
+        opp_score = obj.get("OpponentScore")
+
+    total_score = obj.get("TotalScore")
+    if score is None and total_score is not None and opp_score is not None:
+        score = total_score - opp_score
+    if opp_score is None and total_score is not None and score is not None:
+        opp_score = total_score - score
+
+    if score is None:
+        score = 0.0
+    if opp_score is None:
+        opp_score = 0.0
+
+    wins = obj.get("Wins") or 0
+    losses = obj.get("Losses") or 0
+    ties = obj.get("Ties") or 0
+
+    games = obj.get("Games")
+    if games is None or games == 0:
+        games = wins + losses + ties
+    if games == 0:
+        games = 1
+
+    pf_pg = score / games
+    pa_pg = opp_score / games
+    return round(pf_pg, 2), round(pa_pg, 2)
+
+# =========================================================
+# ÍNDICES DE EQUIPOS
+# =========================================================
+
+def indexar_equipos_nfl(data: list) -> RegistroEquipos:
+    """TeamSeasonStats → registro de equipos (pf_pg / pa_pg)."""
+
+    def stats_de(t):
+        pf_pg, pa_pg = get_nfl_points_pg_v2(t)
+        return pf_pg, pa_pg, 0.0
+
+    return registro_desde_payload(data, stats_de, "NFL")
+
+
+def indexar_equipos_nba(data: list) -> RegistroEquipos:
+    """
+    Standings → registro de equipos (pf_pg / pa_pg).
+
+    Aquí usamos exactamente los campos:
+      - PointsPerGameFor      -> puntos que ANOTA el equipo por juego
+      - PointsPerGameAgainst  -> puntos que PERMITE el equipo por juego
+    """
+
+    def stats_de(t):
+        pf = (
+            t.get("PointsPerGameFor")
+            or t.get("PointsPerGameFOR")
+            or t.get("PointsPerGameFor".lower())
+            or 0.0
+        )
+        pa = (
+            t.get("PointsPerGameAgainst")
+            or t.get("PointsPerGameAGAINST")
+            or t.get("PointsPerGameAgainst".lower())
+            or 0.0
+        )
+        # este endpoint no trae pace: lo sigues llenando a mano
+        return round(float(pf), 2), round(float(pa), 2), 0.0
+
+    return registro_desde_payload(data, stats_de, "NBA")
+
+
+# =========================================================
+# DESCARGAS
+# =========================================================
+
+def descargar_nfl_desde_api(api_key: str):
+    """
+    NFL TeamSeasonStats (ODDS, 2025REG), pasando por la cache en disco.
+    Devuelve (RegistroEquipos o None, mensaje de error).
+    """
+    try:
+        status, data = get_json_cacheado(NFL_TEAMSEASON_URL, {"key": api_key}, TTL_TEAM_STATS)
+        if status != 200:
+            return None, f"Error {status} al conectar con TeamSeasonStats NFL (ODDS)"
+    except Exception as e:
+        return None, f"Error de conexión NFL: {e}"
+
+    return indexar_equipos_nfl(data), ""
+
+
+def descargar_nba_desde_api(api_key: str):
+    """
+    NBA Standings (v3 scores, 2025), pasando por la cache en disco.
+    Devuelve (RegistroEquipos o None, mensaje de error).
+    """
+    try:
+        status, data = get_json_cacheado(NBA_STANDINGS_URL, {"key": api_key}, TTL_TEAM_STATS)
+        if status != 200:
+            return None, f"Error {status} al conectar con NBA Standings (scores v3)"
+    except Exception as e:
+        return None, f"Error de conexión NBA: {e}"
+
+    return indexar_equipos_nba(data), ""
+
+
+def descargar_odds_semana_nfl(api_key: str, season_label: str, week: int):
+    """
+    Llama EXACTAMENTE al endpoint:
+    https://api.sportsdata.io/api/nfl/odds/json/GameOddsByWeek/2025REG/13
+    """
+    url = f"{NFL_GAMEODDS_WEEK_BASE}/{season_label}/{week}"
+
+    try:
+        status, data = get_json_cacheado(url, {"key": api_key}, TTL_ODDS_SEMANA)
+        if status != 200:
+            return [], f"Error {status} del endpoint GameOddsByWeek"
+        return data, ""
+    except Exception as e:
+        return [], f"Error de conexión al traer odds de NFL: {e}"
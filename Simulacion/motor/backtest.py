@@ -0,0 +1,278 @@
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from motor.analitico import probabilidades_analiticas
+from motor.precios import UMBRAL
+from motor.parametros import PARAMETROS_POR_DEFECTO, cargar_parametros
+from motor.proyecciones import proyeccion_nba, proyeccion_nfl, proyeccion_nhl
+
+# =========================================================
+# BACKTEST HISTÓRICO (archivos locales, sin red)
+# =========================================================
+#
+# Dos archivos (CSV, Parquet o JSON):
+#
+#   partidos: fecha, local, visita, pts_local, pts_visita,
+#             spread_cierre, total_cierre
+#             [+ spread, total, temporada, estado_local, estado_visita]
+#   stats:    fecha, equipo + las columnas de STATS_LIGA[liga]
+#
+# 'spread' / 'total' son las líneas a las que se habría apostado (p.ej.
+# apertura); si no vienen se usa la de cierre y el CLV queda en 0.
+# estado_* son las etiquetas de la sección 3 ('1 baja importante', ...).
+# A cada partido se le pegan las stats del equipo con fecha ANTERIOR al
+# juego (merge_asof), así no se cuela información del propio partido.
+# Todo lo demás va vectorizado sobre la tabla completa.
+
+STATS_LIGA = {
+    "NFL": ("pf_pg", "pa_pg"),
+    "NBA": ("pf_pg", "pa_pg", "pace_5", "off_5", "def_5"),
+    "NHL": ("gf_5", "ga_5", "xgf_5", "xga_5", "corsi_5", "sv_5"),
+}
+
+COLUMNAS_PARTIDOS = ("fecha", "local", "visita", "pts_local", "pts_visita",
+                     "spread_cierre", "total_cierre")
+
+# Precio americano por defecto de spreads y totales.
+PRECIO_ESTANDAR = -110
+
+
+def leer_tabla(ruta) -> pd.DataFrame:
+    """CSV / Parquet / JSON (lista de objetos o JSONL) según la extensión."""
+    ruta = Path(ruta)
+    sufijo = ruta.suffix.lower()
+    if sufijo == ".parquet":
+        return pd.read_parquet(ruta)
+    if sufijo == ".jsonl":
+        return pd.read_json(ruta, lines=True)
+    if sufijo == ".json":
+        return pd.read_json(ruta)
+    return pd.read_csv(ruta)
+
+
+def unir_stats(partidos: pd.DataFrame, stats: pd.DataFrame, liga: str) -> pd.DataFrame:
+    """Pega a cada partido las stats de LOCAL y VISITA vigentes antes de la fecha."""
+    columnas = list(STATS_LIGA[liga])
+    stats = stats[["fecha", "equipo", *columnas]].copy()
+    stats["fecha"] = pd.to_datetime(stats["fecha"])
+    stats = stats.sort_values("fecha")
+
+    df = partidos.copy()
+    df["fecha"] = pd.to_datetime(df["fecha"])
+    df["_orden"] = np.arange(len(df))
+    df = df.sort_values("fecha")
+
+    for lado, prefijo in (("local", "l_"), ("visita", "v_")):
+        renombre = {c: prefijo + c for c in columnas}
+        df = pd.merge_asof(
+            df,
+            stats.rename(columns={"equipo": lado, **renombre}),
+            on="fecha",
+            by=lado,
+            allow_exact_matches=False,
+        )
+
+    return df.sort_values("_orden").drop(columns="_orden").reset_index(drop=True)
+
+
+def cargar_historico(ruta_partidos, ruta_stats, liga: str) -> pd.DataFrame:
+    """Lee los dos archivos y devuelve una fila por partido con stats l_* / v_*."""
+    partidos = leer_tabla(ruta_partidos)
+    faltan = [c for c in COLUMNAS_PARTIDOS if c not in partidos.columns]
+    if faltan:
+        raise ValueError(f"Faltan columnas en partidos: {', '.join(faltan)}")
+    return unir_stats(partidos, leer_tabla(ruta_stats), liga)
+
+
+def proyectar_historico(df: pd.DataFrame, liga: str, params=None, pace_liga=99.0, goles_liga=6.20):
+    """Sección 4 sobre todos los partidos a la vez → (pts_local, pts_visita)."""
+    params = params or PARAMETROS_POR_DEFECTO
+    c = {k: df[k].to_numpy(dtype=float) for k in df.columns if k[:2] in ("l_", "v_")}
+
+    if liga == "NFL":
+        pts_local = proyeccion_nfl(c["l_pf_pg"], c["v_pa_pg"], True, params)
+        pts_visita = proyeccion_nfl(c["v_pf_pg"], c["l_pa_pg"], False, params)
+    elif liga == "NBA":
+        pts_local, pts_visita = proyeccion_nba(
+            c["l_pf_pg"], c["l_pa_pg"], c["v_pf_pg"], c["v_pa_pg"],
+            c["l_pace_5"], c["l_off_5"], c["l_def_5"],
+            c["v_pace_5"], c["v_off_5"], c["v_def_5"],
+            pace_liga, params,
+        )
+    elif liga == "NHL":
+        pts_local, pts_visita = proyeccion_nhl(
+            c["l_gf_5"], c["l_ga_5"], c["l_xgf_5"], c["l_xga_5"], c["l_corsi_5"], c["l_sv_5"],
+            c["v_gf_5"], c["v_ga_5"], c["v_xgf_5"], c["v_xga_5"], c["v_corsi_5"], c["v_sv_5"],
+            goles_liga, params,
+        )
+    else:
+        raise ValueError(f"Liga desconocida: {liga!r}")
+
+    pts_local = np.asarray(pts_local, dtype=float)
+    pts_visita = np.asarray(pts_visita, dtype=float)
+    if "estado_local" in df:
+        pts_local = pts_local * df["estado_local"].map(params.mult_estado).fillna(1.0).to_numpy()
+    if "estado_visita" in df:
+        pts_visita = pts_visita * df["estado_visita"].map(params.mult_estado).fillna(1.0).to_numpy()
+    return pts_local, pts_visita
+
+
+def partidos_completos(df: pd.DataFrame) -> pd.DataFrame:
+    """Solo partidos con stats de los dos equipos, marcador y líneas de cierre."""
+    completos = df.dropna(subset=[c for c in df.columns if c[:2] in ("l_", "v_")])
+    return completos.dropna(subset=["pts_local", "pts_visita", "spread_cierre", "total_cierre"])
+
+
+def lineas_apostadas(df: pd.DataFrame):
+    """(spread, total) a los que se apuesta: los de la fila o, si faltan, los de cierre."""
+    spread_cierre = df["spread_cierre"].to_numpy(dtype=float)
+    total_cierre = df["total_cierre"].to_numpy(dtype=float)
+    spread = df["spread"].to_numpy(dtype=float) if "spread" in df else spread_cierre
+    total = df["total"].to_numpy(dtype=float) if "total" in df else total_cierre
+    return np.where(np.isnan(spread), spread_cierre, spread), np.where(np.isnan(total), total_cierre, total)
+
+
+def ganancia_por_unidad(precio_americano) -> float:
+    """Lo que paga 1 unidad apostada si gana (-110 → 0.909, +150 → 1.5)."""
+    p = float(precio_americano)
+    return 100.0 / -p if p < 0 else p / 100.0
+
+
+def apuestas_historicas(df: pd.DataFrame, liga: str, umbral: float = UMBRAL,
+                        precio: float = PRECIO_ESTANDAR, params=None) -> pd.DataFrame:
+    """
+    Proyecta, calcula prob. de cover/over (analítico) y aplica la regla de
+    la sección 7 a cada partido. Devuelve una fila por apuesta con su
+    resultado (+1 gana / 0 push / -1 pierde), ganancia en unidades y CLV
+    en puntos.
+    """
+    params = params or PARAMETROS_POR_DEFECTO
+    completos = partidos_completos(df)
+
+    pts_local, pts_visita = proyectar_historico(completos, liga, params)
+    spread_cierre = completos["spread_cierre"].to_numpy(dtype=float)
+    total_cierre = completos["total_cierre"].to_numpy(dtype=float)
+    spread, total = lineas_apostadas(completos)
+
+    prob_cover, prob_over = probabilidades_analiticas(
+        pts_local, pts_visita, params.desv(liga), spread, total
+    )
+    prob_cover = np.atleast_1d(prob_cover)
+    prob_over = np.atleast_1d(prob_over)
+
+    margen = completos["pts_local"].to_numpy(dtype=float) - completos["pts_visita"].to_numpy(dtype=float)
+    total_real = completos["pts_local"].to_numpy(dtype=float) + completos["pts_visita"].to_numpy(dtype=float)
+
+    # Las cuatro apuestas posibles por partido, igual que recomendaciones().
+    prob_under = 100.0 - prob_over
+    candidatas = {
+        ("Spread", "LOCAL"): (prob_cover, prob_cover >= umbral, margen + spread, spread - spread_cierre, spread),
+        ("Spread", "VISITA"): (100.0 - prob_cover, 100.0 - prob_cover >= umbral,
+                               -(margen + spread), spread_cierre - spread, -spread),
+        ("Total", "OVER"): (prob_over, prob_over >= umbral, total_real - total, total_cierre - total, total),
+        ("Total", "UNDER"): (prob_under, (prob_over < umbral) & (prob_under >= umbral),
+                             total - total_real, total - total_cierre, total),
+    }
+
+    pago = ganancia_por_unidad(precio)
+    partes = []
+    base = completos.reset_index(drop=True)
+    for (mercado, lado), (prob, apuesta, diferencia, clv, linea) in candidatas.items():
+        idx = np.flatnonzero(apuesta)
+        if not len(idx):
+            continue
+        resultado = np.sign(diferencia[idx]).astype(int)
+        partes.append(pd.DataFrame({
+            "fecha": base["fecha"].to_numpy()[idx],
+            "temporada": base["temporada"].to_numpy()[idx] if "temporada" in base else "",
+            "local": base["local"].to_numpy()[idx],
+            "visita": base["visita"].to_numpy()[idx],
+            "mercado": mercado,
+            "lado": lado,
+            "linea": linea[idx],
+            "prob": prob[idx],
+            "pts_local_modelo": pts_local[idx],
+            "pts_visita_modelo": pts_visita[idx],
+            "resultado": resultado,
+            "ganancia": np.where(resultado > 0, pago, np.where(resultado < 0, -1.0, 0.0)),
+            "clv": clv[idx],
+        }))
+
+    if not partes:
+        return pd.DataFrame()
+    return pd.concat(partes, ignore_index=True).sort_values("fecha", kind="stable").reset_index(drop=True)
+
+
+def resumen_backtest(apuestas: pd.DataFrame, por=("mercado", "lado")) -> pd.DataFrame:
+    """Hit rate (sin pushes), ROI por unidad apostada y CLV por grupo + fila TOTAL."""
+    if apuestas.empty:
+        return pd.DataFrame()
+
+    def metricas(g):
+        ganadas = int((g["resultado"] > 0).sum())
+        perdidas = int((g["resultado"] < 0).sum())
+        decididas = ganadas + perdidas
+        return pd.Series({
+            "Apuestas": len(g),
+            "Ganadas": ganadas,
+            "Perdidas": perdidas,
+            "Push": len(g) - decididas,
+            "Hit rate %": round(100.0 * ganadas / decididas, 2) if decididas else np.nan,
+            "Unidades": round(g["ganancia"].sum(), 2),
+            "ROI %": round(100.0 * g["ganancia"].mean(), 2),
+            "CLV medio (pts)": round(g["clv"].mean(), 2),
+            "CLV + %": round(100.0 * (g["clv"] > 0).mean(), 1),
+        })
+
+    por = list(por)
+    filas = [metricas(g).rename(k if isinstance(k, tuple) else (k,)) for k, g in apuestas.groupby(por)]
+    total = metricas(apuestas).rename(("TOTAL",) + ("",) * (len(por) - 1))
+    tabla = pd.DataFrame(filas + [total])
+    tabla.index = pd.MultiIndex.from_tuples(tabla.index, names=por)
+    return tabla.astype({"Apuestas": int, "Ganadas": int, "Perdidas": int, "Push": int})
+
+
+def backtest(ruta_partidos, ruta_stats, liga: str, umbral: float = UMBRAL,
+             precio: float = PRECIO_ESTANDAR, params=None):
+    """Carga, proyecta y evalúa. Devuelve (apuestas, resumen)."""
+    df = cargar_historico(ruta_partidos, ruta_stats, liga)
+    apuestas = apuestas_historicas(df, liga, umbral=umbral, precio=precio, params=params)
+    por = ("temporada", "mercado", "lado") if "temporada" in df else ("mercado", "lado")
+    return apuestas, resumen_backtest(apuestas, por=por)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest de las proyecciones contra temporadas pasadas.")
+    parser.add_argument("liga", choices=sorted(STATS_LIGA))
+    parser.add_argument("partidos", help="CSV/Parquet/JSON con resultados y líneas de cierre")
+    parser.add_argument("stats", help="CSV/Parquet/JSON con stats por equipo y fecha")
+    parser.add_argument("--umbral", type=float, default=UMBRAL)
+    parser.add_argument("--precio", type=float, default=PRECIO_ESTANDAR)
+    parser.add_argument("--salida", help="guarda el detalle de apuestas en este CSV")
+    parser.add_argument("--parametros", help="JSON de parámetros (por defecto el de la app)")
+    args = parser.parse_args(argv)
+
+    params, err = cargar_parametros(args.parametros)
+    if err:
+        parser.error(err)
+
+    inicio = time.perf_counter()
+    apuestas, resumen = backtest(args.partidos, args.stats, args.liga, args.umbral, args.precio, params)
+    segundos = time.perf_counter() - inicio
+
+    if apuestas.empty:
+        print("Ningún partido pasó el umbral.")
+        return
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print(resumen.to_string())
+    if args.salida:
+        apuestas.to_csv(args.salida, index=False)
+    print(f"{len(apuestas)} apuestas en {segundos:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
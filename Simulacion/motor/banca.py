@@ -0,0 +1,293 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from motor import metricas
+from motor.montecarlo import _fragmentos
+
+# =========================================================
+# BANCA DE TEMPORADA (caminos Monte Carlo de una carta de apuestas)
+# =========================================================
+#
+# Una carta = las apuestas de la temporada en orden, cada una con su
+# probabilidad del modelo (%) y su precio americano. Cada camino juega la
+# carta completa; cada apuesta se gana o se pierde (sin push) de forma
+# independiente.
+#
+#   fija    apuesta 'unidad' (en dinero) en cada jugada de la carta
+#   kelly   apuesta fraccion_kelly · f* de la banca ACTUAL
+#           (f* = p - (1 - p) / b; si f* <= 0 no apuesta)
+#   tope    kelly fraccional, pero nunca más de 'tope' de la banca
+#
+# Se simula por bloques de CAMINOS_POR_BLOQUE caminos que avanzan juntos
+# apuesta por apuesta, y cada bloque se resume en histogramas de tamaño
+# fijo: la memoria no crece ni con los caminos ni con la carta. Los fragmentos de caminos
+# son los de montecarlo: la misma seed da el mismo resultado con 1 o con
+# N workers.
+
+ESTRATEGIAS = ("fija", "kelly", "tope")
+
+# Caminos que avanzan juntos: el estado (unos pocos vectores float32)
+# cabe en cache.
+CAMINOS_POR_BLOQUE = 16_384
+
+# La banca que cae a esta fracción de la inicial (o menos) cuenta como ruina.
+UMBRAL_RUINA = 0.20
+
+# Histogramas: log(banca final / inicial) y drawdown máximo (0..1).
+LIMITE_LOG = 10.0
+CUBETAS_LOG = 800
+CUBETAS_DRAWDOWN = 200
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def ganancia_vectorizada(precio) -> np.ndarray:
+    """Lo que paga 1 unidad si gana, por precio americano (-110 → 0.909, +150 → 1.5)."""
+    precio = np.asarray(precio, dtype=float)
+    return np.where(precio < 0, 100.0 / -np.minimum(precio, -1e-9), precio / 100.0)
+
+
+def fraccion_apostada(prob, precio, estrategia: str, fraccion_kelly=0.25, tope=0.02):
+    """Fracción de la banca actual por apuesta (kelly / tope), 0 si no hay edge."""
+    p = np.asarray(prob, dtype=float) / 100.0
+    b = ganancia_vectorizada(precio)
+    f = np.clip(p - (1.0 - p) / b, 0.0, 1.0) * fraccion_kelly
+    if estrategia == "tope":
+        f = np.minimum(f, tope)
+    return f
+
+
+class _Histograma:
+    """Conteos por cubeta fija (+ una cubeta de cada lado para lo que queda fuera)."""
+
+    __slots__ = ("bordes", "conteos")
+
+    def __init__(self, lo, hi, cubetas):
+        self.bordes = np.linspace(lo, hi, cubetas + 1)
+        self.conteos = np.zeros(cubetas + 2, dtype=np.int64)
+
+    def agregar(self, valores):
+        self.conteos += np.bincount(np.digitize(valores, self.bordes), minlength=len(self.conteos))
+
+    def sumar(self, otro):
+        self.conteos += otro.conteos
+
+    def cuantil(self, q: float) -> float:
+        """Cuantil por interpolación lineal dentro de la cubeta (±inf si cae fuera)."""
+        n = self.conteos.sum()
+        if n == 0:
+            return float("nan")
+        objetivo = q * n
+        acumulado = np.cumsum(self.conteos)
+        i = int(np.searchsorted(acumulado, objetivo, side="left"))
+        if i == 0:
+            return float("-inf")
+        if i == len(self.conteos) - 1:
+            return float("inf")
+        previo = acumulado[i - 1]
+        dentro = (objetivo - previo) / self.conteos[i] if self.conteos[i] else 0.0
+        return float(self.bordes[i - 1] + dentro * (self.bordes[i] - self.bordes[i - 1]))
+
+
+class _Acumulador:
+    """Resumen de un grupo de caminos; se suma entre fragmentos."""
+
+    def __init__(self):
+        self.n = 0
+        self.suma_banca = 0.0
+        self.suma_drawdown = 0.0
+        self.suma_log = 0.0     # solo caminos sin quiebra (log finito)
+        self.n_log = 0
+        self.ganancia = 0
+        self.ruina = 0
+        self.quiebra = 0
+        self.log_final = _Histograma(-LIMITE_LOG, LIMITE_LOG, CUBETAS_LOG)
+        self.drawdown = _Histograma(0.0, 1.0 + 1e-9, CUBETAS_DRAWDOWN)
+
+    def agregar(self, log_final, drawdown, ruina, quiebra):
+        finitos = np.isfinite(log_final)
+        self.n += len(log_final)
+        self.suma_banca += float(np.exp(log_final).sum())
+        self.suma_drawdown += float(drawdown.sum())
+        self.suma_log += float(log_final[finitos].sum())
+        self.n_log += int(finitos.sum())
+        self.ganancia += int(np.count_nonzero(log_final > 0))
+        self.ruina += int(np.count_nonzero(ruina))
+        self.quiebra += int(np.count_nonzero(quiebra))
+        self.log_final.agregar(log_final)
+        self.drawdown.agregar(drawdown)
+
+    def sumar(self, otro):
+        for campo in ("n", "suma_banca", "suma_drawdown", "suma_log", "n_log", "ganancia", "ruina", "quiebra"):
+            setattr(self, campo, getattr(self, campo) + getattr(otro, campo))
+        self.log_final.sumar(otro.log_final)
+        self.drawdown.sumar(otro.drawdown)
+
+
+def _simular_bloque(rng, p, pago_gana, pago_pierde, proporcional, m):
+    """
+    m caminos recorriendo la carta apuesta por apuesta: el estado es un
+    vector por camino (banca, pico, drawdown, mínimo), nunca la matriz
+    caminos × apuestas. float32 a propósito: la mitad de memoria y de
+    ancho de banda, y el error acumulado es despreciable para estas métricas.
+
+    proporcional=True: x = log(banca / inicial), cada paso suma log(1 + f·b)
+    o log(1 - f). False (fija): x = banca / inicial, suma unidad·b o -unidad,
+    y el camino que llega a 0 queda quebrado (ya no apuesta).
+    """
+    x = np.zeros(m, np.float32) if proporcional else np.ones(m, np.float32)
+    pico = x.copy()
+    minimo = x.copy()
+    drawdown = np.zeros(m, np.float32)
+    vivo = np.ones(m, dtype=bool)
+    u = np.empty(m, np.float32)
+    paso = np.empty(m, np.float32)
+    gana = np.empty(m, dtype=bool)
+
+    for i in range(len(p)):
+        rng.random(out=u, dtype=np.float32)
+        np.less(u, p[i], out=gana)
+        np.multiply(gana, pago_gana[i] - pago_pierde[i], out=paso)
+        paso += pago_pierde[i]
+        if proporcional:
+            x += paso
+            np.maximum(pico, x, out=pico)
+            np.subtract(pico, x, out=paso)
+        else:
+            paso *= vivo
+            x += paso
+            np.maximum(x, 0.0, out=x)
+            np.greater(x, 0.0, out=vivo)
+            np.maximum(pico, x, out=pico)
+            np.divide(x, pico, out=paso)
+            np.subtract(1.0, paso, out=paso)
+        np.maximum(drawdown, paso, out=drawdown)
+        np.minimum(minimo, x, out=minimo)
+
+    if proporcional:
+        return x.astype(float), -np.expm1(-drawdown.astype(float)), np.exp(minimo), np.zeros(m, dtype=bool)
+    with np.errstate(divide="ignore"):
+        return np.log(x.astype(float)), drawdown.astype(float), minimo, ~vivo
+
+
+def _simular_fragmento(p, pago_gana, pago_pierde, proporcional, ruina, n, semilla):
+    """Caminos de un fragmento, por bloques; devuelve su _Acumulador."""
+    rng = np.random.default_rng(semilla)
+    acumulado = _Acumulador()
+    restantes = n
+    while restantes > 0:
+        m = min(CAMINOS_POR_BLOQUE, restantes)
+        log_final, drawdown, minimo, quiebra = _simular_bloque(rng, p, pago_gana, pago_pierde, proporcional, m)
+        acumulado.agregar(log_final, drawdown, minimo <= ruina, quiebra)
+        restantes -= m
+    return acumulado
+
+
+@dataclass
+class ResultadoBanca:
+    estrategia: str
+    num_caminos: int
+    num_apuestas: int
+    banca_inicial: float
+    banca_final_media: float
+    prob_ganancia: float       # % de caminos que terminan arriba
+    prob_ruina: float          # % que tocan UMBRAL_RUINA de la banca inicial
+    prob_quiebra: float        # % que llegan a 0 (solo estrategia fija)
+    drawdown_medio: float      # 0..1
+    crecimiento_medio: float   # log-crecimiento medio por apuesta (caminos sin quiebra)
+    acumulado: _Acumulador
+
+    def resumen(self) -> dict:
+        mediana = self.percentiles((50,)).iloc[0]
+        return {
+            "estrategia": self.estrategia,
+            "banca_final_media": self.banca_final_media,
+            "banca_final_mediana": mediana["banca_final"],
+            "prob_ganancia": self.prob_ganancia,
+            "prob_ruina": self.prob_ruina,
+            "prob_quiebra": self.prob_quiebra,
+            "drawdown_medio": self.drawdown_medio,
+            "drawdown_mediano": mediana["drawdown_max"],
+            "crecimiento_medio": self.crecimiento_medio,
+        }
+
+    def percentiles(self, qs=PERCENTILES) -> pd.DataFrame:
+        """Banca final, crecimiento por apuesta y drawdown máximo en cada percentil."""
+        filas = []
+        for q in qs:
+            log_final = self.acumulado.log_final.cuantil(q / 100)
+            filas.append({
+                "percentil": q,
+                "banca_final": self.banca_inicial * float(np.exp(log_final)),
+                "crecimiento": log_final / self.num_apuestas,
+                "drawdown_max": min(1.0, self.acumulado.drawdown.cuantil(q / 100)),
+            })
+        return pd.DataFrame(filas)
+
+
+def simular_banca(prob, precio, estrategia: str = "kelly", num_caminos: int = 100_000,
+                  banca_inicial: float = 100.0, unidad: float = 1.0, fraccion_kelly: float = 0.25,
+                  tope: float = 0.02, ruina: float = UMBRAL_RUINA, seed=None,
+                  workers: int = 1) -> ResultadoBanca:
+    """
+    Simula num_caminos temporadas de la carta (prob en %, precio americano,
+    un valor por apuesta, en orden) con la estrategia dada. 'unidad' es en
+    dinero (estrategia fija); fraccion_kelly y tope son fracciones de la
+    banca. 'ruina' = fracción de la banca inicial que cuenta como ruina.
+    """
+    if estrategia not in ESTRATEGIAS:
+        raise ValueError(f"Estrategia desconocida: {estrategia!r}")
+    prob, precio = np.broadcast_arrays(np.atleast_1d(np.asarray(prob, dtype=float)),
+                                       np.atleast_1d(np.asarray(precio, dtype=float)))
+    if prob.size == 0:
+        raise ValueError("La carta no tiene apuestas")
+
+    p = np.clip(prob / 100.0, 0.0, 1.0).astype(np.float32)
+    ganancia = ganancia_vectorizada(precio)
+    if estrategia == "fija":
+        u = unidad / banca_inicial
+        pago_gana, pago_pierde = u * ganancia, np.full(len(p), -u)
+    else:
+        f = fraccion_apostada(prob, precio, estrategia, fraccion_kelly, tope)
+        pago_gana, pago_pierde = np.log1p(f * ganancia), np.log1p(-f)
+    args = (p, pago_gana.astype(np.float32), pago_pierde.astype(np.float32), estrategia != "fija", ruina)
+
+    inicio = time.perf_counter()
+    fragmentos = _fragmentos(int(num_caminos), seed)
+    if workers > 1 and len(fragmentos) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(fragmentos))) as pool:
+            futuros = [pool.submit(_simular_fragmento, *args, n, semilla) for n, semilla in fragmentos]
+            resultados = [f.result() for f in futuros]
+    else:
+        resultados = [_simular_fragmento(*args, n, semilla) for n, semilla in fragmentos]
+
+    total = _Acumulador()
+    for r in resultados:
+        total.sumar(r)
+    metricas.registrar_sims("banca", total.n * len(p), time.perf_counter() - inicio)
+
+    return ResultadoBanca(
+        estrategia=estrategia,
+        num_caminos=total.n,
+        num_apuestas=len(p),
+        banca_inicial=banca_inicial,
+        banca_final_media=banca_inicial * total.suma_banca / total.n,
+        prob_ganancia=total.ganancia / total.n * 100,
+        prob_ruina=total.ruina / total.n * 100,
+        prob_quiebra=total.quiebra / total.n * 100,
+        drawdown_medio=total.suma_drawdown / total.n,
+        crecimiento_medio=total.suma_log / total.n_log / len(p) if total.n_log else float("-inf"),
+        acumulado=total,
+    )
+
+
+def comparar_estrategias(prob, precio, num_caminos: int = 100_000, seed=None, **opciones) -> pd.DataFrame:
+    """Una fila por estrategia, con la misma seed para las tres."""
+    return pd.DataFrame([
+        simular_banca(prob, precio, estrategia, num_caminos, seed=seed, **opciones).resumen()
+        for estrategia in ESTRATEGIAS
+    ])
@@ -0,0 +1,259 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import requests
+
+from motor import metricas
+from motor.planificador import STATUS_REINTENTABLES, PlanificadorHTTP
+
+# =========================================================
+# CACHE EN DISCO PARA RESPUESTAS DE SPORTSDATAIO
+# =========================================================
+#
+# SQLite en modo WAL: sobrevive a reinicios/redeploys y varios procesos
+# (workers de Streamlit, jobs batch) pueden compartirlo a la vez.
+#
+#   - llave = hash de endpoint + parámetros (la API key incluida, pero
+#     nunca se guarda en claro)
+#   - TTL por llamada; pasado el TTL se revalida con If-None-Match /
+#     If-Modified-Since si la API mandó ETag / Last-Modified (304 = no
+#     se vuelve a bajar el cuerpo)
+#   - tamaño máximo en bytes; se desalojan las entradas usadas hace más
+#     tiempo (LRU)
+#   - stale-while-revalidate: vencida hace menos de VENTANA_STALE se
+#     devuelve al momento y se revalida en un hilo aparte; si la API
+#     falla (429, 5xx, red) se sirve lo último guardado
+#   - todo lo que sale a la red pasa por el planificador (single-flight,
+#     presupuesto por key y reintentos; ver motor.planificador)
+
+CACHE_DIR = os.environ.get(
+    "SIMULADOR_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "simulador-apuestas"),
+)
+
+# 64 MB por defecto; una temporada completa de odds NFL ocupa bastante menos.
+MAX_BYTES = int(os.environ.get("SIMULADOR_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Segundos después del TTL en los que una entrada se sirve mientras se revalida.
+VENTANA_STALE = float(os.environ.get("SIMULADOR_STALE_SEGUNDOS", 120))
+
+
+def clave_cache(endpoint: str, params: dict) -> str:
+    """Llave estable para (endpoint, parámetros), sin importar el orden."""
+    base = json.dumps([endpoint, sorted((params or {}).items())], default=str)
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+
+class CacheDisco:
+    """Cache de respuestas HTTP en un archivo SQLite compartible entre procesos."""
+
+    def __init__(self, ruta: str = None, max_bytes: int = MAX_BYTES):
+        if ruta is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            ruta = os.path.join(CACHE_DIR, "respuestas.sqlite3")
+        self.ruta = ruta
+        self.max_bytes = max_bytes
+        with closing(self._conectar()) as con, con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS respuestas (
+                    clave TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    cuerpo BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    guardado REAL NOT NULL,
+                    accedido REAL NOT NULL,
+                    tamano INTEGER NOT NULL
+                )
+                """
+            )
+            con.execute("CREATE INDEX IF NOT EXISTS idx_respuestas_accedido ON respuestas(accedido)")
+
+    def _conectar(self):
+        # Una conexión por operación: segura entre hilos y entre procesos.
+        return sqlite3.connect(self.ruta, timeout=30)
+
+    def obtener(self, clave: str):
+        """Entrada guardada como dict (o None). Marca el acceso para el LRU."""
+        with closing(self._conectar()) as con, con:
+            fila = con.execute(
+                "SELECT cuerpo, etag, last_modified, guardado FROM respuestas WHERE clave = ?",
+                (clave,),
+            ).fetchone()
+            if fila is None:
+                return None
+            con.execute("UPDATE respuestas SET accedido = ? WHERE clave = ?", (time.time(), clave))
+        cuerpo, etag, last_modified, guardado = fila
+        return {"cuerpo": cuerpo, "etag": etag, "last_modified": last_modified, "guardado": guardado}
+
+    def guardar(self, clave: str, endpoint: str, cuerpo: bytes, etag=None, last_modified=None):
+        ahora = time.time()
+        with closing(self._conectar()) as con, con:
+            con.execute(
+                """
+                INSERT OR REPLACE INTO respuestas
+                    (clave, endpoint, cuerpo, etag, last_modified, guardado, accedido, tamano)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (clave, endpoint, cuerpo, etag, last_modified, ahora, ahora, len(cuerpo)),
+            )
+            self._desalojar(con)
+
+    def refrescar(self, clave: str):
+        """Revalidación con 304: el cuerpo sigue vigente, se reinicia su TTL."""
+        ahora = time.time()
+        with closing(self._conectar()) as con, con:
+            con.execute(
+                "UPDATE respuestas SET guardado = ?, accedido = ? WHERE clave = ?",
+                (ahora, ahora, clave),
+            )
+
+    def _desalojar(self, con):
+        """Borra las entradas menos usadas hasta quedar por debajo de max_bytes."""
+        (total,) = con.execute("SELECT COALESCE(SUM(tamano), 0) FROM respuestas").fetchone()
+        if total <= self.max_bytes:
+            return
+        filas = con.execute("SELECT clave, tamano FROM respuestas ORDER BY accedido").fetchall()
+        borrar = []
+        for clave, tamano in filas:
+            if total <= self.max_bytes:
+                break
+            borrar.append((clave,))
+            total -= tamano
+        con.executemany("DELETE FROM respuestas WHERE clave = ?", borrar)
+
+    def limpiar(self):
+        with closing(self._conectar()) as con, con:
+            con.execute("DELETE FROM respuestas")
+
+
+# Tamaño del pool de conexiones keep-alive por host.
+POOL_CONEXIONES = 16
+
+_cache_por_defecto = None
+_sesion_compartida = None
+_planificador = None
+_candado_planificador = threading.Lock()
+
+
+def cache_por_defecto() -> CacheDisco:
+    """Cache compartido del proceso (se crea la primera vez que se usa)."""
+    global _cache_por_defecto
+    if _cache_por_defecto is None:
+        _cache_por_defecto = CacheDisco()
+    return _cache_por_defecto
+
+
+def sesion_compartida() -> requests.Session:
+    """
+    Sesión HTTP del proceso: reutiliza conexiones TCP/TLS (keep-alive) en
+    vez de abrir una nueva por cada requests.get.
+    """
+    global _sesion_compartida
+    if _sesion_compartida is None:
+        sesion = requests.Session()
+        adaptador = requests.adapters.HTTPAdapter(
+            pool_connections=POOL_CONEXIONES, pool_maxsize=POOL_CONEXIONES
+        )
+        sesion.mount("https://", adaptador)
+        sesion.mount("http://", adaptador)
+        _sesion_compartida = sesion
+    return _sesion_compartida
+
+
+def planificador() -> PlanificadorHTTP:
+    """Planificador del proceso, sobre la sesión compartida."""
+    global _planificador
+    with _candado_planificador:
+        if _planificador is None:
+            _planificador = PlanificadorHTTP(sesion_compartida())
+    return _planificador
+
+
+def _revalidar(url: str, params: dict, cache: CacheDisco, clave: str, timeout: float):
+    """GET (condicional si hay entrada) que deja la cache al día. Devuelve (status, data)."""
+    entrada = cache.obtener(clave)
+    headers = {}
+    if entrada is not None:
+        if entrada["etag"]:
+            headers["If-None-Match"] = entrada["etag"]
+        if entrada["last_modified"]:
+            headers["If-Modified-Since"] = entrada["last_modified"]
+
+    resp = planificador().get(url, params=params, headers=headers, timeout=timeout)
+
+    if resp.status_code == 304 and entrada is not None:
+        cache.refrescar(clave)
+        metricas.contar("cache_disco_total", resultado="revalidado")
+        return 200, json.loads(entrada["cuerpo"])
+    if resp.status_code != 200:
+        return resp.status_code, None
+
+    metricas.contar("cache_disco_total", resultado="descargado")
+    data = resp.json()
+    cache.guardar(
+        clave,
+        url,
+        resp.content,
+        etag=resp.headers.get("ETag"),
+        last_modified=resp.headers.get("Last-Modified"),
+    )
+    return 200, data
+
+
+def _revalidar_en_fondo(url, params, cache, clave, timeout):
+    try:
+        planificador().unico(clave, lambda: _revalidar(url, params, cache, clave, timeout))
+    except Exception:
+        # La siguiente llamada lo vuelve a intentar; mientras, sigue lo guardado.
+        metricas.contar("cache_disco_total", resultado="revalidacion_fallida")
+
+
+def get_json_cacheado(url: str, params: dict, ttl: float, cache: CacheDisco = None,
+                      timeout: float = 10, stale: float = VENTANA_STALE):
+    """
+    GET con cache en disco. Devuelve (status, data):
+      - entrada fresca (< ttl)           → (200, data) sin tocar la red
+      - vencida hace menos de 'stale'    → (200, data en cache) y se revalida en un hilo
+      - vencida con ETag/LM              → GET condicional; 304 → (200, data en cache)
+      - sin entrada o 200 nuevo          → se guarda y se devuelve
+      - 429 / 5xx / error de red         → (200, data en cache) si hay algo guardado
+      - cualquier otro status            → (status, None), la cache no se toca
+    Sin nada guardado, los errores de conexión se propagan
+    (requests.RequestException). stale=0 obliga a revalidar.
+    """
+    cache = cache or cache_por_defecto()
+    clave = clave_cache(url, params)
+    entrada = cache.obtener(clave)
+
+    if entrada is not None:
+        edad = time.time() - entrada["guardado"]
+        if edad < ttl:
+            metricas.contar("cache_disco_total", resultado="fresco")
+            return 200, json.loads(entrada["cuerpo"])
+        if edad < ttl + stale:
+            if not planificador().en_vuelo(clave):
+                threading.Thread(
+                    target=_revalidar_en_fondo, args=(url, params, cache, clave, timeout), daemon=True
+                ).start()
+            metricas.contar("cache_disco_total", resultado="obsoleto")
+            return 200, json.loads(entrada["cuerpo"])
+
+    try:
+        status, data = planificador().unico(clave, lambda: _revalidar(url, params, cache, clave, timeout))
+    except requests.RequestException:
+        if entrada is None:
+            raise
+        status, data = None, None
+
+    if status != 200 and entrada is not None and (status is None or status in STATUS_REINTENTABLES):
+        metricas.contar("cache_disco_total", resultado="obsoleto_por_error")
+        return 200, json.loads(entrada["cuerpo"])
+    return status, data
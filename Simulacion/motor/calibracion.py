@@ -0,0 +1,229 @@
+import argparse
+import dataclasses
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from motor.analitico import probabilidades_analiticas
+from motor.backtest import STATS_LIGA, cargar_historico, partidos_completos, proyectar_historico
+from motor.parametros import RUTA_PARAMETROS, cargar_parametros, guardar_parametros
+
+# =========================================================
+# CALIBRACIÓN DE PARÁMETROS CONTRA RESULTADOS HISTÓRICOS
+# =========================================================
+#
+# Para cada juego de parámetros se proyectan TODOS los partidos de una
+# vez y se mide qué tan bien predicen las prob. de cover / over a las
+# líneas de cierre (Brier o log-loss; menor = mejor). La búsqueda es
+# aleatoria por rondas: cada ronda prueba candidatos dentro de una caja
+# alrededor del mejor y la caja se va achicando. Los candidatos de cada
+# ronda se evalúan en paralelo en un pool de procesos.
+
+# Rango de búsqueda de cada parámetro, por liga.
+ESPACIO = {
+    "NFL": {
+        "nfl_peso_ofensiva": (0.2, 1.0),
+        "nfl_peso_defensa": (0.0, 0.8),
+        "nfl_ventaja_local": (-1.0, 4.0),
+        "desv_nfl": (8.0, 18.0),
+    },
+    "NBA": {
+        "nba_peso_off_5": (0.2, 1.0),
+        "nba_peso_def_5": (0.0, 0.8),
+        "nba_peso_reciente": (0.0, 1.0),
+        "nba_peso_global": (0.0, 1.0),
+        "desv_nba": (6.0, 18.0),
+    },
+    "NHL": {
+        "nhl_peso_goles": (0.0, 1.0),
+        "nhl_peso_xg": (0.0, 1.0),
+        "nhl_peso_posesion": (0.0, 0.6),
+        "desv_nhl": (0.6, 2.5),
+    },
+}
+
+# Multiplicadores de estado (si los partidos traen estado_local / estado_visita).
+RANGO_ESTADO = (0.85, 1.15)
+ESTADO_BASE = "Healthy / completo"  # fijo en 1.00, los demás se miden contra él
+
+OBJETIVOS = ("brier", "logloss")
+
+_EPS = 1e-6
+
+
+def con_valores(base, nombres, valores):
+    """Copia de 'base' con esos parámetros cambiados ('estado:<etiqueta>' = multiplicador)."""
+    campos = {}
+    estados = dict(base.mult_estado)
+    for nombre, valor in zip(nombres, valores):
+        if nombre.startswith("estado:"):
+            estados[nombre[len("estado:"):]] = round(float(valor), 4)
+        else:
+            campos[nombre] = round(float(valor), 4)
+    return dataclasses.replace(base, mult_estado=estados, **campos)
+
+
+def espacio_busqueda(df, liga: str) -> dict:
+    """Parámetros de la liga + multiplicadores de los estados que aparecen en los datos."""
+    espacio = dict(ESPACIO[liga])
+    etiquetas = set()
+    for c in ("estado_local", "estado_visita"):
+        if c in df:
+            etiquetas.update(df[c].dropna().unique())
+    for etiqueta in sorted(etiquetas - {ESTADO_BASE}):
+        espacio[f"estado:{etiqueta}"] = RANGO_ESTADO
+    return espacio
+
+
+def evaluar(df, liga: str, params, objetivo: str = "brier") -> float:
+    """Brier o log-loss de cover LOCAL y OVER a las líneas de cierre (sin pushes)."""
+    pts_local, pts_visita = proyectar_historico(df, liga, params)
+    spread = df["spread_cierre"].to_numpy(dtype=float)
+    total = df["total_cierre"].to_numpy(dtype=float)
+    prob_cover, prob_over = probabilidades_analiticas(
+        pts_local, pts_visita, params.desv(liga), spread, total
+    )
+
+    l = df["pts_local"].to_numpy(dtype=float)
+    v = df["pts_visita"].to_numpy(dtype=float)
+    dif_cover = l - v + spread
+    dif_over = l + v - total
+
+    p = np.concatenate([np.atleast_1d(prob_cover), np.atleast_1d(prob_over)]) / 100.0
+    dif = np.concatenate([dif_cover, dif_over])
+    decididas = dif != 0
+    p, y = p[decididas], (dif[decididas] > 0).astype(float)
+
+    if objetivo == "brier":
+        return float(np.mean((p - y) ** 2))
+    if objetivo == "logloss":
+        p = np.clip(p, _EPS, 1 - _EPS)
+        return float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)))
+    raise ValueError(f"Objetivo desconocido: {objetivo!r}")
+
+
+# ---- pool de procesos: los datos viajan una sola vez por worker ----
+
+_DATOS = {}
+
+
+def _iniciar_worker(df, liga, base, nombres, objetivo):
+    _DATOS.update(df=df, liga=liga, base=base, nombres=nombres, objetivo=objetivo)
+
+
+def _evaluar_lote(lote):
+    d = _DATOS
+    return [
+        evaluar(d["df"], d["liga"], con_valores(d["base"], d["nombres"], valores), d["objetivo"])
+        for valores in lote
+    ]
+
+
+def calibrar(df, liga: str, base=None, objetivo: str = "brier", candidatos: int = 256,
+             rondas: int = 4, encoger: float = 0.5, seed=None, workers: int = 1):
+    """
+    Busca los parámetros de 'liga' que minimizan el objetivo sobre 'df'
+    (salida de backtest.cargar_historico). Devuelve un dict con
+    params, score, score_inicial, evaluaciones y segundos.
+    """
+    inicio = time.perf_counter()
+    base = base or cargar_parametros()[0]
+    df = partidos_completos(df)
+    if df.empty:
+        raise ValueError("No hay partidos completos para calibrar.")
+
+    espacio = espacio_busqueda(df, liga)
+    nombres = list(espacio)
+    bajo = np.array([espacio[n][0] for n in nombres])
+    alto = np.array([espacio[n][1] for n in nombres])
+    actual = np.array([
+        base.mult_estado.get(n[len("estado:"):], 1.0) if n.startswith("estado:") else getattr(base, n)
+        for n in nombres
+    ])
+
+    score_inicial = evaluar(df, liga, base, objetivo)
+    mejor, mejor_score = np.clip(actual, bajo, alto), score_inicial
+    rng = np.random.default_rng(seed)
+    radio = (alto - bajo) / 2.0
+    evaluaciones = 1
+
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_iniciar_worker,
+            initargs=(df, liga, base, nombres, objetivo),
+        )
+    else:
+        _iniciar_worker(df, liga, base, nombres, objetivo)
+
+    try:
+        for _ in range(rondas):
+            lo = np.maximum(bajo, mejor - radio)
+            hi = np.minimum(alto, mejor + radio)
+            muestras = lo + rng.random((candidatos, len(nombres))) * (hi - lo)
+
+            if pool is None:
+                scores = _evaluar_lote(muestras)
+            else:
+                lotes = np.array_split(muestras, workers * 4)
+                scores = [s for parte in pool.map(_evaluar_lote, lotes) for s in parte]
+            evaluaciones += len(scores)
+
+            i = int(np.argmin(scores))
+            if scores[i] < mejor_score:
+                mejor, mejor_score = muestras[i], scores[i]
+            radio = radio * encoger
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return {
+        "params": con_valores(base, nombres, mejor),
+        "score": mejor_score,
+        "score_inicial": score_inicial,
+        "evaluaciones": evaluaciones,
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibra pesos y desviaciones contra resultados históricos.")
+    parser.add_argument("liga", choices=sorted(STATS_LIGA))
+    parser.add_argument("partidos", help="mismo formato que motor.backtest")
+    parser.add_argument("stats", help="mismo formato que motor.backtest")
+    parser.add_argument("--objetivo", choices=OBJETIVOS, default="brier")
+    parser.add_argument("--candidatos", type=int, default=256, help="candidatos por ronda")
+    parser.add_argument("--rondas", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--salida", default=RUTA_PARAMETROS,
+                        help="JSON que lee la app (se conservan las otras ligas)")
+    args = parser.parse_args(argv)
+
+    base, err = cargar_parametros(args.salida)
+    if err:
+        parser.error(err)
+
+    df = cargar_historico(args.partidos, args.stats, args.liga)
+    r = calibrar(df, args.liga, base, args.objetivo, args.candidatos, args.rondas,
+                 seed=args.seed, workers=args.workers)
+
+    ajustados = r["params"].a_dict()
+    for nombre in espacio_busqueda(partidos_completos(df), args.liga):
+        if nombre.startswith("estado:"):
+            etiqueta = nombre[len("estado:"):]
+            print(f"{nombre:32s} {base.mult_estado.get(etiqueta, 1.0):8.4f} → {ajustados['mult_estado'][etiqueta]:8.4f}")
+        else:
+            print(f"{nombre:32s} {getattr(base, nombre):8.4f} → {ajustados[nombre]:8.4f}")
+    print(f"{args.objetivo}: {r['score_inicial']:.5f} → {r['score']:.5f} "
+          f"({r['evaluaciones']} evaluaciones en {r['segundos']:.1f} s)")
+
+    guardar_parametros(r["params"], args.salida)
+    print(f"Parámetros guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from motor import metricas
+from motor.banca import ganancia_vectorizada
+from motor.escalera import precio_americano_justo
+from motor.montecarlo import TAMANO_BLOQUE
+
+# =========================================================
+# COMBINADAS (PARLAYS) Y CARTERA DE APUESTAS CORRELACIONADAS
+# =========================================================
+#
+# Se simula UNA matriz de marcadores por partido (partidos × sims), con
+# correlación opcional entre los puntos de local y visita:
+#
+#   z_v = ρ · z_l + √(1 - ρ²) · e      (mismo modelo normal recortado en 0)
+#
+# Cada pata (spread, total o moneyline de un partido) es una máscara
+# booleana sobre esas mismas muestras, calculada UNA vez por bloque.
+# Una combinada es el AND de las máscaras de sus patas, y el P&L de una
+# cartera sale de sumar lo que paga cada apuesta en cada simulación. Así
+# las patas del mismo partido (p.ej. LOCAL cubre + OVER) quedan
+# correlacionadas como en el marcador, y una combinada de 10 patas cuesta
+# lo mismo que cotizar sus patas por separado.
+#
+# Convenciones de la sección 6/7: cover LOCAL = (l - v) + linea >= 0,
+# OVER = l + v > total; VISITA y UNDER son el complemento.
+
+LADOS = {
+    "Spread": ("LOCAL", "VISITA"),
+    "Total": ("OVER", "UNDER"),
+    "Moneyline": ("LOCAL", "VISITA"),
+}
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@dataclass(frozen=True)
+class Pata:
+    """Una selección. linea = spread del lado elegido o total; no se usa en moneyline."""
+    juego: int
+    mercado: str
+    lado: str
+    linea: float = 0.0
+    precio: float = -110
+
+    def __post_init__(self):
+        if self.lado not in LADOS.get(self.mercado, ()):
+            raise ValueError(f"Pata inválida: {self.mercado} {self.lado}")
+
+    def texto(self) -> str:
+        if self.mercado == "Spread":
+            return f"J{self.juego + 1} Spread {self.lado} {self.linea:+.1f}"
+        if self.mercado == "Total":
+            return f"J{self.juego + 1} {self.lado} {self.linea:.1f}"
+        return f"J{self.juego + 1} ML {self.lado}"
+
+
+@dataclass(frozen=True)
+class Apuesta:
+    """Una o varias patas (índices en la lista de patas). precio None = producto de las patas."""
+    patas: Tuple[int, ...]
+    importe: float = 1.0
+    precio: float = None
+
+
+def precio_combinada(precios) -> float:
+    """Precio americano de una combinada: producto de las cuotas decimales de las patas."""
+    decimal = float(np.prod(1.0 + ganancia_vectorizada(precios)))
+    return (decimal - 1.0) * 100.0 if decimal >= 2.0 else -100.0 / (decimal - 1.0)
+
+
+def _ganan(pata: Pata, sim_l, sim_v):
+    if pata.mercado == "Spread":
+        cubre_local = (sim_l - sim_v) + (pata.linea if pata.lado == "LOCAL" else -pata.linea) >= 0
+        return cubre_local if pata.lado == "LOCAL" else ~cubre_local
+    if pata.mercado == "Total":
+        over = (sim_l + sim_v) > pata.linea
+        return over if pata.lado == "OVER" else ~over
+    gana_local = sim_l > sim_v
+    return gana_local if pata.lado == "LOCAL" else ~gana_local
+
+
+def _muestrear_correlacionados(rng, pts_local, pts_visita, desv, correlacion, forma):
+    z_l = rng.standard_normal(forma)
+    z_v = rng.standard_normal(forma)
+    if correlacion:
+        z_v *= np.sqrt(1.0 - correlacion ** 2)
+        z_v += correlacion * z_l
+    sim_l = np.maximum(0.0, pts_local + desv * z_l)
+    sim_v = np.maximum(0.0, pts_visita + desv * z_v)
+    return sim_l, sim_v
+
+
+class ResultadoCartera:
+    """Probabilidades de patas y apuestas + distribución exacta del P&L de la cartera."""
+
+    def __init__(self, patas, apuestas, num_sims, ganan_patas, conjunta, ganan_apuestas, pnl):
+        self.patas = patas
+        self.apuestas = apuestas
+        self.num_sims = num_sims
+        self.prob_patas = ganan_patas / num_sims * 100
+        self.conjunta = conjunta / num_sims * 100
+        self.prob_apuestas = ganan_apuestas / num_sims * 100
+        valores = np.array(sorted(pnl))
+        self.pnl_valores = valores
+        self.pnl_prob = np.array([pnl[v] for v in valores]) / num_sims
+
+    def tabla_patas(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "pata": [p.texto() for p in self.patas],
+            "prob %": self.prob_patas.round(2),
+            "precio": [p.precio for p in self.patas],
+            "precio justo": np.round(precio_americano_justo(self.prob_patas / 100), 0),
+        })
+
+    def correlacion_patas(self) -> pd.DataFrame:
+        """Correlación (phi) entre el resultado de cada par de patas."""
+        p = self.prob_patas / 100
+        cov = self.conjunta / 100 - np.outer(p, p)
+        sd = np.sqrt(p * (1 - p))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            phi = cov / np.outer(sd, sd)
+        nombres = [pata.texto() for pata in self.patas]
+        return pd.DataFrame(phi.round(3), index=nombres, columns=nombres)
+
+    def tabla_apuestas(self) -> pd.DataFrame:
+        """Prob. del modelo vs la que saldría con patas independientes, y EV por unidad."""
+        filas = []
+        for a, prob in zip(self.apuestas, self.prob_apuestas):
+            precio = precio_de(a, self.patas)
+            independiente = float(np.prod(self.prob_patas[list(a.patas)] / 100)) * 100
+            ganancia = float(ganancia_vectorizada(precio))
+            filas.append({
+                "apuesta": " + ".join(self.patas[i].texto() for i in a.patas),
+                "importe": a.importe,
+                "precio": round(precio, 0),
+                "prob %": round(prob, 2),
+                "prob indep. %": round(independiente, 2),
+                "precio justo": round(float(precio_americano_justo(prob / 100)), 0),
+                "EV por unidad": round(prob / 100 * ganancia - (1 - prob / 100), 4),
+            })
+        return pd.DataFrame(filas)
+
+    def resumen_pnl(self) -> dict:
+        """Exposición de la cartera: P&L esperado, desviación, prob. de perder y percentiles."""
+        media = float(np.dot(self.pnl_valores, self.pnl_prob))
+        desv = float(np.sqrt(np.dot((self.pnl_valores - media) ** 2, self.pnl_prob)))
+        acumulada = np.cumsum(self.pnl_prob)
+        resumen = {
+            "pnl_medio": media,
+            "pnl_desv": desv,
+            "prob_perdida": float(self.pnl_prob[self.pnl_valores < 0].sum()) * 100,
+            "peor": float(self.pnl_valores[0]),
+            "mejor": float(self.pnl_valores[-1]),
+        }
+        for q in PERCENTILES:
+            i = min(int(np.searchsorted(acumulada, q / 100, side="left")), len(acumulada) - 1)
+            resumen[f"p{q}"] = float(self.pnl_valores[i])
+        return resumen
+
+
+def precio_de(apuesta: Apuesta, patas) -> float:
+    if apuesta.precio is not None:
+        return float(apuesta.precio)
+    if len(apuesta.patas) == 1:
+        return float(patas[apuesta.patas[0]].precio)
+    return precio_combinada([patas[i].precio for i in apuesta.patas])
+
+
+def simular_cartera(pts_local, pts_visita, desv, patas, apuestas=None, num_sims: int = 100_000,
+                    correlacion: float = 0.0, seed=None) -> ResultadoCartera:
+    """
+    Simula juntos los partidos (pts_local / pts_visita / desv: un valor
+    por partido o escalar) y evalúa todas las patas sobre las mismas
+    muestras. 'apuestas' = lista de Apuesta (sencillas o combinadas);
+    por defecto una sencilla de 1 unidad por pata.
+    """
+    patas = list(patas)
+    if not patas:
+        raise ValueError("No hay patas")
+    apuestas = list(apuestas) if apuestas is not None else [Apuesta((i,)) for i in range(len(patas))]
+    correlacion = float(np.clip(correlacion, -0.99, 0.99))
+
+    pts_local, pts_visita, desv = (np.atleast_1d(np.asarray(x, dtype=float)) for x in (pts_local, pts_visita, desv))
+    num_partidos = np.broadcast_shapes(pts_local.shape, pts_visita.shape, desv.shape)[0]
+    if max(p.juego for p in patas) >= num_partidos:
+        raise ValueError("Una pata apunta a un partido que no existe")
+
+    # Solo se simulan los partidos que tienen alguna pata.
+    juegos = sorted({p.juego for p in patas})
+    fila = {j: i for i, j in enumerate(juegos)}
+    pts_local, pts_visita, desv = (
+        np.broadcast_to(x, (num_partidos,))[juegos][:, None] for x in (pts_local, pts_visita, desv)
+    )
+
+    # P&L de cada apuesta: lo que paga si gana y lo que pierde si no.
+    paga = np.array([a.importe * float(ganancia_vectorizada(precio_de(a, patas))) for a in apuestas])
+    pierde = np.array([a.importe for a in apuestas])
+
+    rng = np.random.default_rng(seed)
+    ganan_patas = np.zeros(len(patas), dtype=np.int64)
+    conjunta = np.zeros((len(patas), len(patas)))
+    ganan_apuestas = np.zeros(len(apuestas), dtype=np.int64)
+    pnl = Counter()
+
+    inicio = time.perf_counter()
+    por_bloque = max(1, TAMANO_BLOQUE // len(juegos))
+    restantes = int(num_sims)
+    while restantes > 0:
+        m = min(por_bloque, restantes)
+        sim_l, sim_v = _muestrear_correlacionados(rng, pts_local, pts_visita, desv, correlacion,
+                                                  (len(juegos), m))
+        ganan = np.empty((len(patas), m), dtype=bool)
+        for i, p in enumerate(patas):
+            ganan[i] = _ganan(p, sim_l[fila[p.juego]], sim_v[fila[p.juego]])
+        ganan_patas += np.count_nonzero(ganan, axis=1)
+        ganan_f = ganan.astype(np.float32)
+        conjunta += ganan_f @ ganan_f.T
+
+        resultado = np.zeros(m)
+        for k, a in enumerate(apuestas):
+            gana = ganan[a.patas[0]] if len(a.patas) == 1 else np.logical_and.reduce(ganan[list(a.patas)])
+            ganan_apuestas[k] += np.count_nonzero(gana)
+            resultado += np.where(gana, paga[k], -pierde[k])
+        # El P&L de la cartera toma pocos valores distintos: se cuentan exactos.
+        valores, conteos = np.unique(resultado.round(6), return_counts=True)
+        pnl.update(dict(zip(valores.tolist(), conteos.tolist())))
+        restantes -= m
+
+    metricas.registrar_sims("combinadas", int(num_sims) * len(juegos), time.perf_counter() - inicio)
+    return ResultadoCartera(patas, apuestas, int(num_sims), ganan_patas, conjunta, ganan_apuestas, pnl)
+
+
+def patas_partido(spread_casa: float, total_casa: float, ml_local: float = 0, ml_visita: float = 0,
+                  juego: int = 0, precio: float = -110):
+    """Las seis patas de un partido (spread y total a 'precio'; ML solo si hay precio)."""
+    patas = [
+        Pata(juego, "Spread", "LOCAL", spread_casa, precio),
+        Pata(juego, "Spread", "VISITA", -spread_casa, precio),
+        Pata(juego, "Total", "OVER", total_casa, precio),
+        Pata(juego, "Total", "UNDER", total_casa, precio),
+    ]
+    if ml_local:
+        patas.append(Pata(juego, "Moneyline", "LOCAL", precio=ml_local))
+    if ml_visita:
+        patas.append(Pata(juego, "Moneyline", "VISITA", precio=ml_visita))
+    return patas
+
+
+def patas_jornada(tabla: pd.DataFrame, precio: float = -110):
+    """La 'Mejor apuesta' de cada fila de cotizar_jornada_nfl como pata (juego = índice de fila)."""
+    patas = []
+    filas = zip(tabla["Spread casa"], tabla["Total casa"], tabla["Mejor apuesta"])
+    for j, (spread, total, mejor) in enumerate(filas):
+        if mejor == "Spread LOCAL":
+            patas.append(Pata(j, "Spread", "LOCAL", spread, precio))
+        elif mejor == "Spread VISITA":
+            patas.append(Pata(j, "Spread", "VISITA", -spread, precio))
+        else:
+            patas.append(Pata(j, "Total", mejor, total, precio))
+    return patas
@@ -0,0 +1,192 @@
+import bisect
+import difflib
+import re
+
+import numpy as np
+
+# =========================================================
+# REGISTRO CANÓNICO DE EQUIPOS
+# =========================================================
+#
+# Un equipo = un código ('DAL', 'BOS', ...). Las stats van en arrays
+# (una posición por equipo) y la búsqueda usa un mapa explícito de
+# alias → código. Conference / Division NO son alias: 'afc' o 'east'
+# ya no apuntan al último equipo cargado.
+
+# Campos del payload que sí identifican a un equipo.
+CAMPOS_CODIGO = ("Key", "Team")
+CAMPOS_ALIAS = ("Key", "Team", "City", "Name", "TeamName", "FullName")
+
+# Apodos y códigos alternativos que el payload no trae (mantenidos a mano).
+# Se suman a los alias del equipo y siguen la misma regla: si uno cae en
+# dos equipos se descarta.
+APODOS_LIGA = {
+    "NFL": {
+        "ARI": ("cards",), "ATL": ("dirty birds",), "CAR": ("cats",), "CIN": ("cincy",),
+        "DAL": ("boys", "americas team"), "GB": ("pack", "gnb"), "IND": ("indy",),
+        "JAX": ("jags", "jac"), "LAC": ("bolts",), "LV": ("vegas", "lvr", "oakland"),
+        "MIA": ("fins", "phins"), "MIN": ("vikes",), "NE": ("pats", "nwe"),
+        "NO": ("nola", "nor"), "NYG": ("g men", "big blue"), "NYJ": ("gang green",),
+        "PHI": ("birds",), "SF": ("niners", "sfo"), "TB": ("bucs", "tampa", "tam"),
+        "WAS": ("wsh",),
+    },
+    "NBA": {
+        "BKN": ("brk",), "BOS": ("celts",), "CLE": ("cavs",), "DAL": ("mavs",),
+        "DEN": ("nugs",), "GS": ("gsw", "dubs", "golden state"), "LAC": ("clips",),
+        "LAL": ("lake show",), "MEM": ("grizz",), "MIN": ("wolves", "twolves"),
+        "NO": ("nop", "pels"), "NY": ("nyk",), "PHI": ("sixers",), "PHO": ("phx",),
+        "POR": ("blazers", "rip city"), "SA": ("sas",), "TOR": ("raps",), "UTA": ("utah",),
+        "WAS": ("wiz",),
+    },
+}
+
+
+def normalizar_alias(texto: str) -> str:
+    """'Los Angeles Lakers' → 'losangeleslakers'."""
+    return re.sub(r"[^0-9a-z]", "", (texto or "").lower())
+
+
+class Equipo:
+    """Stats de un equipo (vista ligera sobre los arrays del registro)."""
+
+    __slots__ = ("codigo", "nombre", "pf_pg", "pa_pg", "pace")
+
+    def __init__(self, codigo, nombre, pf_pg, pa_pg, pace):
+        self.codigo = codigo
+        self.nombre = nombre
+        self.pf_pg = pf_pg
+        self.pa_pg = pa_pg
+        self.pace = pace
+
+    def __repr__(self):
+        return f"Equipo({self.codigo!r}, pf_pg={self.pf_pg}, pa_pg={self.pa_pg})"
+
+
+class RegistroEquipos:
+    """
+    Equipos de una liga indexados por código, con alias explícitos.
+
+    Búsqueda (buscar): alias exacto O(1) → prefijo único → parecido
+    (difflib). Si el texto es ambiguo (p.ej. 'New York' en NFL) devuelve
+    None en vez de elegir uno al azar.
+    """
+
+    def __init__(self, codigos, nombres, pf_pg, pa_pg, pace, alias):
+        self.codigos = list(codigos)
+        self.nombres = list(nombres)
+        self.pf_pg = np.asarray(pf_pg, dtype=float)
+        self.pa_pg = np.asarray(pa_pg, dtype=float)
+        self.pace = np.asarray(pace, dtype=float)
+        self._posicion = {c: i for i, c in enumerate(self.codigos)}
+
+        # alias normalizado → posición; los alias que caen en 2+ equipos se descartan.
+        destino = {}
+        self.ambiguos = set()
+        for i, nombres_alias in enumerate(alias):
+            for a in {normalizar_alias(x) for x in nombres_alias}:
+                if not a:
+                    continue
+                if a in destino and destino[a] != i:
+                    self.ambiguos.add(a)
+                destino.setdefault(a, i)
+        for a in self.ambiguos:
+            del destino[a]
+        # El código siempre gana sobre cualquier otro alias.
+        for i, c in enumerate(self.codigos):
+            destino[normalizar_alias(c)] = i
+            self.ambiguos.discard(normalizar_alias(c))
+
+        self._alias = destino
+        self._alias_ordenados = sorted(destino)
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def __contains__(self, texto):
+        return self.buscar(texto) is not None
+
+    def equipo(self, codigo: str):
+        i = self._posicion.get((codigo or "").upper())
+        return None if i is None else self._vista(i)
+
+    def _vista(self, i: int) -> Equipo:
+        return Equipo(
+            self.codigos[i],
+            self.nombres[i],
+            float(self.pf_pg[i]),
+            float(self.pa_pg[i]),
+            float(self.pace[i]),
+        )
+
+    def codigo_de(self, texto: str):
+        """Código canónico para lo que escribió el usuario (o None)."""
+        a = normalizar_alias(texto)
+        if not a:
+            return None
+
+        i = self._alias.get(a)
+        if i is not None:
+            return self.codigos[i]
+
+        # Prefijo: todos los alias que empiezan igual deben ser del mismo equipo.
+        inicio = bisect.bisect_left(self._alias_ordenados, a)
+        fin = bisect.bisect_left(self._alias_ordenados, a + "\x7f")
+        candidatos = {self._alias[x] for x in self._alias_ordenados[inicio:fin]}
+        if len(candidatos) == 1:
+            return self.codigos[candidatos.pop()]
+        if candidatos:
+            return None
+
+        parecidos = difflib.get_close_matches(a, self._alias_ordenados, n=3, cutoff=0.8)
+        candidatos = {self._alias[x] for x in parecidos}
+        if len(candidatos) == 1:
+            return self.codigos[candidatos.pop()]
+        return None
+
+    def buscar(self, texto: str):
+        codigo = self.codigo_de(texto)
+        return None if codigo is None else self.equipo(codigo)
+
+    def sugerencias(self, texto: str, n: int = 3):
+        """Códigos parecidos, para mensajes de 'no encontré ese equipo'."""
+        parecidos = difflib.get_close_matches(
+            normalizar_alias(texto), self._alias_ordenados, n=n * 3, cutoff=0.5
+        )
+        codigos = []
+        for x in parecidos:
+            c = self.codigos[self._alias[x]]
+            if c not in codigos:
+                codigos.append(c)
+        return codigos[:n]
+
+
+def registro_desde_payload(data: list, stats_de, liga: str = None):
+    """
+    Arma el registro desde la lista de equipos de SportsDataIO.
+    stats_de(t) → (pf_pg, pa_pg, pace) de cada registro. Con 'liga' se
+    suman los apodos de APODOS_LIGA.
+    """
+    apodos = APODOS_LIGA.get(liga, {})
+    codigos, nombres, pf, pa, pace, alias = [], [], [], [], [], []
+    vistos = set()
+    for t in data:
+        codigo = next((t[c] for c in CAMPOS_CODIGO if isinstance(t.get(c), str) and t[c]), None)
+        if codigo is None or codigo.upper() in vistos:
+            continue
+        codigo = codigo.upper()
+        vistos.add(codigo)
+
+        textos = [t[c] for c in CAMPOS_ALIAS if isinstance(t.get(c), str)]
+        if isinstance(t.get("City"), str) and isinstance(t.get("Name"), str):
+            textos.append(f"{t['City']} {t['Name']}")
+        textos.extend(apodos.get(codigo, ()))
+
+        p_f, p_a, p_ace = stats_de(t)
+        codigos.append(codigo)
+        nombres.append(t.get("FullName") or t.get("Name") or t.get("TeamName") or codigo)
+        pf.append(p_f)
+        pa.append(p_a)
+        pace.append(p_ace)
+        alias.append(textos)
+
+    return RegistroEquipos(codigos, nombres, pf, pa, pace, alias)
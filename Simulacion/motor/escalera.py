@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from motor.montecarlo import muestrear_marcadores
+
+# =========================================================
+# ESCALERA DE LÍNEAS ALTERNATIVAS (una sola simulación)
+# =========================================================
+#
+# Se simula UNA vez, se guardan ordenadas las distribuciones de margen,
+# total y puntos de cada equipo, y cualquier línea alternativa sale de
+# un searchsorted sobre esas muestras, sin volver a simular.
+
+
+def precio_americano_justo(prob):
+    """
+    Precio americano sin vig para una probabilidad (0..1).
+    Favorito (p >= 0.5) → negativo, underdog → positivo. p en {0, 1} → NaN.
+    """
+    p = np.asarray(prob, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precio = np.where(p >= 0.5, -100 * p / (1 - p), 100 * (1 - p) / p)
+    precio = np.where((p <= 0) | (p >= 1), np.nan, precio)
+    return precio if precio.ndim else float(precio)
+
+
+def lineas_alrededor(centro, ancho, paso=0.5):
+    """Líneas de centro-ancho a centro+ancho en pasos de 'paso' (redondeado al paso)."""
+    centro = round(centro / paso) * paso
+    return np.round(np.arange(centro - ancho, centro + ancho + paso / 2, paso), 2)
+
+
+class DistribucionPartido:
+    """Muestras ordenadas de un partido simulado, listas para cualquier línea."""
+
+    def __init__(self, sim_l, sim_v):
+        self.num_sims = len(sim_l)
+        self.margen = np.sort(sim_l - sim_v)
+        self.total = np.sort(sim_l + sim_v)
+        self.local = np.sort(sim_l)
+        self.visita = np.sort(sim_v)
+
+    @classmethod
+    def desde_modelo(cls, pts_local, pts_visita, desv, num_sims, seed=None):
+        rng = np.random.default_rng(seed)
+        return cls(*muestrear_marcadores(rng, pts_local, pts_visita, desv, int(num_sims)))
+
+    def _prob_mayor_igual(self, muestras, umbrales):
+        return (self.num_sims - np.searchsorted(muestras, umbrales, side="left")) / self.num_sims
+
+    def _prob_mayor(self, muestras, umbrales):
+        return (self.num_sims - np.searchsorted(muestras, umbrales, side="right")) / self.num_sims
+
+    def prob_cover(self, spreads):
+        """P[(local - visita) + spread >= 0] para cada spread del LOCAL."""
+        return self._prob_mayor_igual(self.margen, -np.asarray(spreads, dtype=float))
+
+    def prob_over(self, totales):
+        """P[local + visita > total] para cada total."""
+        return self._prob_mayor(self.total, np.asarray(totales, dtype=float))
+
+    def prob_over_local(self, lineas):
+        return self._prob_mayor(self.local, np.asarray(lineas, dtype=float))
+
+    def prob_over_visita(self, lineas):
+        return self._prob_mayor(self.visita, np.asarray(lineas, dtype=float))
+
+
+def _precio_entero(prob):
+    return pd.array(np.round(precio_americano_justo(prob)), dtype="Int64")
+
+
+def _tabla(lineas, prob, lado_a, lado_b):
+    prob = np.asarray(prob, dtype=float)
+    return pd.DataFrame({
+        "Línea": lineas,
+        f"Prob. {lado_a} %": (prob * 100).round(1),
+        f"Precio justo {lado_a}": _precio_entero(prob),
+        f"Prob. {lado_b} %": ((1 - prob) * 100).round(1),
+        f"Precio justo {lado_b}": _precio_entero(1 - prob),
+    })
+
+
+def escalera_lineas(dist: DistribucionPartido, spreads, totales,
+                    totales_local=None, totales_visita=None):
+    """
+    Tablas de probabilidades y precios justos para toda la escalera.
+    Devuelve un dict {mercado: DataFrame}.
+    """
+    spreads = np.asarray(spreads, dtype=float)
+    totales = np.asarray(totales, dtype=float)
+
+    tablas = {
+        "Spread": _tabla(spreads, dist.prob_cover(spreads), "LOCAL cubre", "VISITA cubre"),
+        "Total": _tabla(totales, dist.prob_over(totales), "OVER", "UNDER"),
+    }
+    if totales_local is not None:
+        tablas["Team total LOCAL"] = _tabla(
+            totales_local, dist.prob_over_local(totales_local), "OVER", "UNDER"
+        )
+    if totales_visita is not None:
+        tablas["Team total VISITA"] = _tabla(
+            totales_visita, dist.prob_over_visita(totales_visita), "OVER", "UNDER"
+        )
+    return tablas
@@ -0,0 +1,197 @@
+from functools import lru_cache
+
+import numpy as np
+
+# =========================================================
+# MARCADOR EXACTO NHL (goles discretos, sin simulación)
+# =========================================================
+#
+# Cada equipo anota un número ENTERO de goles en tiempo regular:
+#   - Poisson(media) o, con dispersion > 0, binomial negativa con
+#     varianza = media + dispersion · media²
+#   - correlacion > 0 agrega un componente común Poisson(λ3) a los dos
+#     equipos (Poisson bivariada): λ3 = correlacion · √(media_l · media_v)
+# La tabla conjunta P(L = i, V = j) sale de convolucionar las PMF
+# (una multiplicación de matrices de 21×21). Si el partido termina
+# empatado se va a OT / shootout: el ganador suma UN gol al marcador
+# final, que es con el que se liquidan puck line y totales.
+#
+# La interfaz (prob_cover, prob_over, prob_over_local, prob_over_visita)
+# es la misma que escalera.DistribucionPartido.
+
+# Goles por equipo que cubre la tabla; lo que queda más allá se suma a la
+# última casilla (con medias de NHL es < 1e-12).
+MAX_GOLES = 20
+
+_K = np.arange(MAX_GOLES + 1)
+# _DESPLAZAR[c, i] = i - c: índice de la PMF individual cuando el
+# componente común vale c y el total del equipo vale i.
+_DESPLAZAR = _K[None, :] - _K[:, None]
+
+# Índices fijos de la tabla conjunta (local i, visita j) para los bincount.
+_I, _J = np.indices((MAX_GOLES + 1, MAX_GOLES + 1))
+_GANA_LOCAL, _GANA_VISITA = _I > _J, _I < _J
+_IDX_MARGEN = (_I - _J + MAX_GOLES).ravel()
+_IDX_TOTAL = (_I + _J).ravel()
+
+
+@lru_cache(maxsize=1024)
+def _pmf_tabla(media: float, dispersion: float):
+    k = np.arange(1, MAX_GOLES + 1)
+    if media <= 0:
+        pmf = np.zeros(MAX_GOLES + 1)
+        pmf[0] = 1.0
+    elif dispersion <= 0:
+        pmf = np.exp(-media) * np.cumprod(np.concatenate(([1.0], media / k)))
+    else:
+        r = 1.0 / dispersion
+        q = media / (r + media)
+        pmf = (1.0 - q) ** r * np.cumprod(np.concatenate(([1.0], (k - 1 + r) / k * q)))
+    pmf[-1] += max(0.0, 1.0 - pmf.sum())
+    pmf.flags.writeable = False
+    return pmf
+
+
+def pmf_goles(media: float, dispersion: float = 0.0) -> np.ndarray:
+    """P(goles = 0..MAX_GOLES) de un equipo (tabla cacheada, solo lectura)."""
+    return _pmf_tabla(float(media), float(dispersion))
+
+
+def _desplazada(pmf):
+    """Matriz [c, i] = pmf[i - c] (0 si i < c)."""
+    return np.where(_DESPLAZAR >= 0, pmf[np.clip(_DESPLAZAR, 0, None)], 0.0)
+
+
+def marcador_regular(media_local, media_visita, dispersion=0.0, correlacion=0.0):
+    """Tabla conjunta P(L = i, V = j) del tiempo regular, (MAX_GOLES+1)²."""
+    media_local, media_visita = max(0.0, float(media_local)), max(0.0, float(media_visita))
+    comun = float(np.clip(correlacion, 0.0, 1.0)) * np.sqrt(media_local * media_visita)
+    comun = min(comun, media_local, media_visita)
+
+    p_l = pmf_goles(media_local - comun, dispersion)
+    p_v = pmf_goles(media_visita - comun, dispersion)
+    if comun <= 0:
+        conjunta = np.outer(p_l, p_v)
+    else:
+        p_c = pmf_goles(comun)
+        conjunta = _desplazada(p_l).T @ (p_c[:, None] * _desplazada(p_v))
+    return conjunta / conjunta.sum()
+
+
+def _cola(pmf):
+    """cola[k] = P(X >= valores[k]), con un 0 al final para índices fuera de rango."""
+    return np.concatenate((np.cumsum(pmf[::-1])[::-1], [0.0]))
+
+
+class DistribucionGoles:
+    """Distribución exacta del marcador final de un partido NHL."""
+
+    def __init__(self, conjunta, prob_ot_local=None, media_local=None, media_visita=None):
+        n = MAX_GOLES + 1
+        empate = np.diag(conjunta).copy()
+        sin_empate = conjunta - np.diag(empate)
+
+        if prob_ot_local is None:
+            # Sin dato, el OT / shootout se reparte según el ritmo de gol de cada uno.
+            suma = (media_local or 0.0) + (media_visita or 0.0)
+            prob_ot_local = media_local / suma if suma > 0 else 0.5
+        q = float(prob_ot_local)
+
+        self.regular = conjunta
+        self.gana_local_regular = float(sin_empate[_GANA_LOCAL].sum())
+        self.gana_visita_regular = float(sin_empate[_GANA_VISITA].sum())
+        self.empate_regular = float(empate.sum())
+        self.gana_local_ot = self.empate_regular * q
+        self.gana_visita_ot = self.empate_regular * (1 - q)
+
+        # Margen final: -(n-1)..(n-1); el empate pasa a +1 / -1.
+        self.valores_margen = np.arange(-(n - 1), n)
+        margen = np.bincount(_IDX_MARGEN, weights=sin_empate.ravel(), minlength=2 * n - 1)
+        margen[n] += self.gana_local_ot
+        margen[n - 2] += self.gana_visita_ot
+
+        # Total final: 0..2n-1; un empate t-t termina con 2t+1 goles.
+        self.valores_total = np.arange(2 * n)
+        total = np.bincount(_IDX_TOTAL, weights=sin_empate.ravel(), minlength=2 * n)
+        total[1::2] += empate
+
+        # Goles de cada equipo: con empate en t, el ganador del OT termina con t+1.
+        self.valores_equipo = np.arange(n + 1)
+        local = np.append(sin_empate.sum(axis=1), 0.0)
+        visita = np.append(sin_empate.sum(axis=0), 0.0)
+        local[:-1] += empate * (1 - q)
+        local[1:] += empate * q
+        visita[:-1] += empate * q
+        visita[1:] += empate * (1 - q)
+
+        self.pmf_margen, self.pmf_total = margen, total
+        self.pmf_local, self.pmf_visita = local, visita
+        self._cola_margen, self._cola_total = _cola(margen), _cola(total)
+        self._cola_local, self._cola_visita = _cola(local), _cola(visita)
+
+    @classmethod
+    def desde_modelo(cls, media_local, media_visita, dispersion=0.0, correlacion=0.0,
+                     prob_ot_local=None):
+        conjunta = marcador_regular(media_local, media_visita, dispersion, correlacion)
+        return cls(conjunta, prob_ot_local, media_local=max(0.0, media_local),
+                   media_visita=max(0.0, media_visita))
+
+    @staticmethod
+    def _prob_mayor_igual(valores, cola, umbrales):
+        return cola[np.searchsorted(valores, umbrales, side="left")]
+
+    @staticmethod
+    def _prob_mayor(valores, cola, umbrales):
+        return cola[np.searchsorted(valores, umbrales, side="right")]
+
+    def prob_cover(self, spreads):
+        """P[(local - visita) + spread >= 0] para cada spread (puck line) del LOCAL."""
+        return self._prob_mayor_igual(
+            self.valores_margen, self._cola_margen, -np.asarray(spreads, dtype=float)
+        )
+
+    def prob_over(self, totales):
+        """P[local + visita > total] para cada total."""
+        return self._prob_mayor(self.valores_total, self._cola_total, np.asarray(totales, dtype=float))
+
+    def prob_over_local(self, lineas):
+        return self._prob_mayor(self.valores_equipo, self._cola_local, np.asarray(lineas, dtype=float))
+
+    def prob_over_visita(self, lineas):
+        return self._prob_mayor(self.valores_equipo, self._cola_visita, np.asarray(lineas, dtype=float))
+
+    def resultado(self) -> dict:
+        """Probabilidades (0..1) de regulación, OT / shootout y moneyline."""
+        return {
+            "gana_local_regular": self.gana_local_regular,
+            "empate_regular": self.empate_regular,
+            "gana_visita_regular": self.gana_visita_regular,
+            "gana_local_ot": self.gana_local_ot,
+            "gana_visita_ot": self.gana_visita_ot,
+            "gana_local": self.gana_local_regular + self.gana_local_ot,
+            "gana_visita": self.gana_visita_regular + self.gana_visita_ot,
+        }
+
+
+@lru_cache(maxsize=1024)
+def _distribucion(media_local, media_visita, dispersion, correlacion, prob_ot_local):
+    return DistribucionGoles.desde_modelo(media_local, media_visita, dispersion, correlacion,
+                                          prob_ot_local)
+
+
+def distribucion_goles(media_local, media_visita, dispersion=0.0, correlacion=0.0,
+                       prob_ot_local=None) -> DistribucionGoles:
+    """DistribucionGoles cacheada por parámetros (no modificar el objeto devuelto)."""
+    return _distribucion(float(media_local), float(media_visita), float(dispersion),
+                         float(correlacion), prob_ot_local)
+
+
+def probabilidades_goles(pts_local, pts_visita, spread_casa, total_casa,
+                         dispersion=0.0, correlacion=0.0):
+    """
+    Versión exacta de la sección 6 para NHL.
+    Devuelve (prob_cover, prob_over) en porcentaje, igual que
+    analitico.probabilidades_analiticas.
+    """
+    dist = distribucion_goles(pts_local, pts_visita, dispersion, correlacion)
+    return float(dist.prob_cover(spread_casa)) * 100, float(dist.prob_over(total_casa)) * 100
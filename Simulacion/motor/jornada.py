@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+
+from motor.equipos import RegistroEquipos
+from motor.mercado import mejores_lineas, tabla_libros
+from motor.montecarlo import simular_jornada
+from motor.odds import equipos_del_juego, id_juego, normalize_team_code, odds_del_juego
+from motor.parametros import PARAMETROS_POR_DEFECTO
+from motor.proyecciones import proyeccion_nfl
+
+# =========================================================
+# JORNADA COMPLETA NFL (GameOddsByWeek × TeamSeasonStats)
+# =========================================================
+
+# Proyecciones sin redondear (para simular_cartera); la app no las muestra.
+COLUMNAS_OCULTAS = ["pts_local", "pts_visita"]
+
+# Columnas de mejores_lineas que usa la jornada.
+COLUMNAS_LINEAS = [
+    "spread_home", "libro_spread_home", "spread_away", "libro_spread_away",
+    "over", "libro_over", "under", "libro_under",
+]
+
+
+def _lado_con_mas_edge(edge_a, linea_a, libro_a, edge_b, linea_b, libro_b):
+    """
+    linea_contra_modelo vectorizado para un mercado: línea y sportsbook
+    del lado con más edge (empate → la línea más alta; NaN = sin línea).
+    """
+    usar_b = np.isnan(edge_a) | (edge_b > edge_a) | ((edge_b == edge_a) & (linea_b > linea_a))
+    return np.where(usar_b, linea_b, linea_a), np.where(usar_b, libro_b, libro_a)
+
+
+def _lineas_por_juego(mejores: pd.DataFrame) -> dict:
+    """(home, away) → dict con COLUMNAS_LINEAS (más rápido que to_dict("index"))."""
+    if mejores.empty:
+        return {}
+    columnas = zip(*(mejores[c].to_numpy() for c in COLUMNAS_LINEAS))
+    return {clave: dict(zip(COLUMNAS_LINEAS, fila)) for clave, fila in zip(mejores.index, columnas)}
+
+
+def cotizar_jornada_nfl(odds_semana: list, nfl_teams: RegistroEquipos, num_sims: int,
+                        seed=None, workers=1, params=None, mejores=None):
+    """
+    Proyecta y simula TODOS los partidos de una semana de una sola vez.
+
+    - odds_semana: lo que devuelve cargar_odds_semana_nfl (lista de juegos)
+    - nfl_teams:   lo que devuelve cargar_nfl_desde_api (RegistroEquipos)
+    - mejores:     mejores_lineas(tabla_libros(odds_semana)); si no se pasa
+                   se calcula aquí
+
+    El LOCAL de cada fila es el HomeTeam del juego. Cada juego se cotiza
+    contra la mejor línea de todos los sportsbooks: de cada mercado, la
+    del lado donde el modelo ve más edge (como la sección 7), con el
+    sportsbook en 'Libro spread' / 'Libro total'. Las columnas
+    COLUMNAS_OCULTAS traen los puntos proyectados sin redondear. Cada
+    juego simula con su propio stream (seed, id_juego), así que recotizar
+    unos pocos da lo mismo que la semana completa. Con workers > 1 la
+    simulación se reparte en un pool de procesos. Devuelve
+    (DataFrame ordenado por prob. de la mejor apuesta, lista de avisos).
+    """
+    params = params or PARAMETROS_POR_DEFECTO
+    if mejores is None:
+        mejores = mejores_lineas(tabla_libros(odds_semana))
+    lineas = _lineas_por_juego(mejores)
+    filas = []
+    avisos = []
+
+    for g in odds_semana:
+        raw_home, raw_away = equipos_del_juego(g)
+        if not raw_home or not raw_away:
+            continue
+
+        stats_home = nfl_teams.buscar(raw_home)
+        stats_away = nfl_teams.buscar(raw_away)
+        if stats_home is None or stats_away is None:
+            avisos.append(f"{raw_away} @ {raw_home}: sin stats de equipo")
+            continue
+
+        odds_list = odds_del_juego(g)
+        if not odds_list:
+            avisos.append(f"{raw_away} @ {raw_home}: sin bloque PregameOdds")
+            continue
+        linea = lineas.get((normalize_team_code(raw_home), normalize_team_code(raw_away)))
+        if linea is None or (pd.isna(linea["spread_home"]) and pd.isna(linea["spread_away"])) or (
+            pd.isna(linea["over"]) and pd.isna(linea["under"])
+        ):
+            avisos.append(f"{raw_away} @ {raw_home}: sin spread o total")
+            continue
+
+        filas.append({
+            "juego": id_juego(g),
+            "Local": raw_home,
+            "Visita": raw_away,
+            "l_pf": stats_home.pf_pg,
+            "l_pa": stats_home.pa_pg,
+            "v_pf": stats_away.pf_pg,
+            "v_pa": stats_away.pa_pg,
+            **linea,
+        })
+
+    if not filas:
+        return pd.DataFrame(), avisos
+
+    df = pd.DataFrame(filas)
+
+    # Proyección vectorizada: una columna = todos los partidos.
+    pts_local = proyeccion_nfl(df["l_pf"].to_numpy(), df["v_pa"].to_numpy(), True, params)
+    pts_visita = proyeccion_nfl(df["v_pf"].to_numpy(), df["l_pa"].to_numpy(), False, params)
+    line_modelo = -(pts_local - pts_visita)
+    total_modelo = pts_local + pts_visita
+
+    spread_home = df["spread_home"].to_numpy(dtype=float)
+    spread_away = df["spread_away"].to_numpy(dtype=float)
+    spread_casa, libro_spread = _lado_con_mas_edge(
+        spread_home - line_modelo, spread_home, df["libro_spread_home"].to_numpy(),
+        line_modelo + spread_away, -spread_away, df["libro_spread_away"].to_numpy(),
+    )
+    over = df["over"].to_numpy(dtype=float)
+    under = df["under"].to_numpy(dtype=float)
+    total_casa, libro_total = _lado_con_mas_edge(
+        total_modelo - over, over, df["libro_over"].to_numpy(),
+        under - total_modelo, under, df["libro_under"].to_numpy(),
+    )
+
+    prob_cover, prob_over = simular_jornada(
+        pts_local, pts_visita, params.desv("NFL"), spread_casa, total_casa, num_sims,
+        seed=seed, workers=workers, claves=df["juego"].tolist(),
+    )
+
+    tabla = pd.DataFrame({
+        "Local": df["Local"],
+        "Visita": df["Visita"],
+        "Pts local": pts_local.round(1),
+        "Pts visita": pts_visita.round(1),
+        "Línea modelo": line_modelo.round(1),
+        "Spread casa": spread_casa,
+        "Libro spread": libro_spread,
+        "Edge spread (pts)": (spread_casa - line_modelo).round(1),
+        "Total modelo": total_modelo.round(1),
+        "Total casa": total_casa,
+        "Libro total": libro_total,
+        "Edge total (pts)": (total_modelo - total_casa).round(1),
+        "Prob. cover LOCAL %": prob_cover.round(1),
+        "Prob. OVER %": prob_over.round(1),
+    })
+
+    # Mejor lado de cada mercado (misma lectura que la sección 7).
+    mejor_spread = np.maximum(prob_cover, 100.0 - prob_cover)
+    mejor_total = np.maximum(prob_over, 100.0 - prob_over)
+    tabla["Mejor apuesta"] = np.where(
+        mejor_spread >= mejor_total,
+        np.where(prob_cover >= 50.0, "Spread LOCAL", "Spread VISITA"),
+        np.where(prob_over >= 50.0, "OVER", "UNDER"),
+    )
+    tabla["Prob. mejor %"] = np.maximum(mejor_spread, mejor_total).round(1)
+    tabla["pts_local"] = pts_local
+    tabla["pts_visita"] = pts_visita
+
+    tabla = tabla.sort_values("Prob. mejor %", ascending=False).reset_index(drop=True)
+    return tabla, avisos
+
+
+def actualizar_jornada(tabla, odds_semana: list, movidos, nfl_teams: RegistroEquipos,
+                       num_sims: int, seed=None, workers=1, params=None, mejores=None):
+    """
+    Recotiza solo los juegos cuyo id_juego está en 'movidos' (p.ej. los
+    que devuelve HistorialLineas.movidos_desde) y los mezcla con 'tabla',
+    la salida anterior de cotizar_jornada_nfl. Sin tabla previa se cotiza
+    la semana completa. 'mejores' como en cotizar_jornada_nfl (de la
+    semana completa). Devuelve (tabla, avisos) igual que cotizar_jornada_nfl.
+    """
+    if mejores is None:
+        mejores = mejores_lineas(tabla_libros(odds_semana))
+    if tabla is None or tabla.empty:
+        return cotizar_jornada_nfl(odds_semana, nfl_teams, num_sims, seed, workers, params, mejores)
+
+    juegos = [g for g in odds_semana if id_juego(g) in movidos]
+    if not juegos:
+        return tabla, []
+    nuevas, avisos = cotizar_jornada_nfl(juegos, nfl_teams, num_sims, seed, workers, params, mejores)
+
+    reemplazar = {equipos_del_juego(g) for g in juegos}
+    quedan = tabla[[
+        (local, visita) not in reemplazar for local, visita in zip(tabla["Local"], tabla["Visita"])
+    ]]
+    tabla = pd.concat([quedan, nuevas], ignore_index=True)
+    tabla = tabla.sort_values("Prob. mejor %", ascending=False).reset_index(drop=True)
+    return tabla, avisos
@@ -0,0 +1,256 @@
+import argparse
+import csv
+import dataclasses
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from motor.parametros import PARAMETROS_POR_DEFECTO, cargar_parametros
+from motor.precios import MODOS, UMBRAL, LineasCasa, cotizar
+from motor.proyecciones import EntradaNBA, EntradaNFL, EntradaNHL
+
+# =========================================================
+# PRICING POR LOTES (CSV / JSONL → CSV / JSONL, sin Streamlit)
+# =========================================================
+#
+#   python -m motor.lote partidos.csv --salida precios.csv --workers 4
+#   cat partidos.jsonl | python -m motor.lote - --formato jsonl > precios.jsonl
+#
+# Una fila = un partido, con las mismas entradas que las secciones 1–5:
+#
+#   liga                          NFL / NBA / NHL (o --liga para todo el archivo)
+#   campos de EntradaNFL / EntradaNBA / EntradaNHL (l_anota_global, gf_local_5, ...)
+#   estado_local, estado_visita   etiquetas de la sección 3 (o mult_local / mult_visita)
+#   spread, total, ml_local, ml_visita
+#
+# Lo que falta toma el valor por defecto del formulario. Cualquier otra
+# columna (id, fecha, local, visita...) pasa tal cual a la salida.
+# Se lee y se escribe por lotes, en el orden de entrada, con a lo sumo
+# 2 lotes por worker en vuelo: la memoria no crece con el archivo.
+
+ENTRADAS = {"NFL": EntradaNFL, "NBA": EntradaNBA, "NHL": EntradaNHL}
+
+# Columnas que agrega el pricing a cada fila.
+COLUMNAS_SALIDA = (
+    "pts_local", "pts_visita", "total_modelo", "linea_modelo",
+    "prob_cover", "prob_over", "prob_impl_local", "prob_impl_visita",
+    "edge_spread", "edge_total", "recomendaciones", "modo", "error",
+)
+
+TAMANO_LOTE = 256
+
+
+def _valor(texto, tipo):
+    """'' / None → None; CSV trae todo como texto."""
+    if texto is None or texto == "":
+        return None
+    return tipo(float(texto))
+
+
+def _construir(cls, fila: dict):
+    valores = {}
+    for f in dataclasses.fields(cls):
+        v = _valor(fila.get(f.name), int if f.type in (int, "int") else float)
+        if v is not None:
+            valores[f.name] = v
+    return cls(**valores)
+
+
+def partido_desde_fila(fila: dict, liga: str = None, params=None):
+    """(EntradaXXX, LineasCasa) a partir de una fila del archivo."""
+    params = params or PARAMETROS_POR_DEFECTO
+    liga = (fila.get("liga") or liga or "").upper()
+    if liga not in ENTRADAS:
+        raise ValueError(f"Liga desconocida: {liga!r}")
+
+    fila = dict(fila)
+    for lado in ("local", "visita"):
+        estado = fila.get(f"estado_{lado}")
+        if estado and not fila.get(f"mult_{lado}"):
+            if estado not in params.mult_estado:
+                raise ValueError(f"Estado desconocido: {estado!r}")
+            fila[f"mult_{lado}"] = params.mult_estado[estado]
+
+    return _construir(ENTRADAS[liga], fila), _construir(LineasCasa, fila)
+
+
+def _texto_recomendaciones(recs) -> str:
+    return "; ".join(
+        f"{r.mercado} {r.lado} {r.linea:+.1f} ({r.prob:.1f}%)" if r.mercado == "Spread"
+        else f"{r.lado} {r.linea:.1f} ({r.prob:.1f}%)"
+        for r in recs
+    )
+
+
+def cotizar_fila(fila: dict, numero: int, liga=None, modo="auto", num_sims=10000,
+                 seed=None, umbral=UMBRAL, params=None) -> dict:
+    """
+    Fila de entrada + COLUMNAS_SALIDA. Un error en la fila no corta el
+    lote: queda en la columna 'error'. modo='auto' usa el exacto en NHL
+    y el analítico en el resto. Con seed, cada fila usa (seed, numero):
+    el resultado no depende de workers ni del tamaño de lote.
+    """
+    salida = dict(fila)
+    try:
+        entrada, lineas = partido_desde_fila(fila, liga, params)
+        modo_fila = modo
+        if modo == "auto":
+            modo_fila = "exacto" if entrada.liga == "NHL" else "analitico"
+        r = cotizar(entrada, lineas, modo_fila, num_sims,
+                    seed=None if seed is None else (seed, numero), umbral=umbral, params=params)
+    except (ValueError, TypeError, KeyError) as e:
+        salida.update(dict.fromkeys(COLUMNAS_SALIDA, ""), error=str(e))
+        return salida
+
+    salida.update({
+        "pts_local": round(r.proyeccion.pts_local, 2),
+        "pts_visita": round(r.proyeccion.pts_visita, 2),
+        "total_modelo": round(r.proyeccion.total, 2),
+        "linea_modelo": round(r.proyeccion.line_modelo, 2),
+        "prob_cover": round(r.prob_cover, 2),
+        "prob_over": round(r.prob_over, 2),
+        "prob_impl_local": round(r.prob_impl_local, 2),
+        "prob_impl_visita": round(r.prob_impl_visita, 2),
+        "edge_spread": round(r.dif_spread, 2),
+        "edge_total": round(r.dif_total, 2),
+        "recomendaciones": _texto_recomendaciones(r.recomendaciones),
+        "modo": modo_fila,
+        "error": "",
+    })
+    return salida
+
+
+# ---- pool de procesos: la configuración viaja una sola vez por worker ----
+
+_CONFIG = {}
+
+
+def _iniciar_worker(config):
+    _CONFIG.clear()
+    _CONFIG.update(config)
+
+
+def _cotizar_lote(lote):
+    return [cotizar_fila(fila, numero, **_CONFIG) for numero, fila in lote]
+
+
+def _lotes(filas, tamano):
+    numeradas = enumerate(filas)
+    while True:
+        lote = list(islice(numeradas, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+def cotizar_stream(filas, workers: int = 1, tamano_lote: int = TAMANO_LOTE, **config):
+    """
+    Generador: recibe un iterable de filas (dicts) y va devolviendo las
+    filas cotizadas en el mismo orden. 'config' = argumentos de
+    cotizar_fila (liga, modo, num_sims, seed, umbral, params).
+    """
+    if workers <= 1:
+        _iniciar_worker(config)
+        for lote in _lotes(filas, tamano_lote):
+            yield from _cotizar_lote(lote)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker,
+                             initargs=(config,)) as pool:
+        en_vuelo = deque()
+        for lote in _lotes(filas, tamano_lote):
+            en_vuelo.append(pool.submit(_cotizar_lote, lote))
+            if len(en_vuelo) >= 2 * workers:
+                yield from en_vuelo.popleft().result()
+        while en_vuelo:
+            yield from en_vuelo.popleft().result()
+
+
+# ---- lectura / escritura ----
+
+def _formato(ruta: str, formato: str = None) -> str:
+    if formato:
+        return formato
+    return "jsonl" if ruta.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+def leer_filas(archivo, formato: str):
+    """Filas de un CSV (con encabezado) o JSONL, una a la vez."""
+    if formato == "csv":
+        yield from csv.DictReader(archivo)
+        return
+    for linea in archivo:
+        if linea.strip():
+            yield json.loads(linea)
+
+
+def escribir_filas(filas, archivo, formato: str):
+    """Escribe y hace flush por fila: quien lee el pipe ve cada resultado al momento."""
+    escritor = None
+    n = errores = 0
+    for fila in filas:
+        if formato == "csv":
+            if escritor is None:
+                columnas = [c for c in fila if c not in COLUMNAS_SALIDA] + list(COLUMNAS_SALIDA)
+                escritor = csv.DictWriter(archivo, fieldnames=columnas, extrasaction="ignore")
+                escritor.writeheader()
+            escritor.writerow(fila)
+        else:
+            archivo.write(json.dumps(fila, ensure_ascii=False) + "\n")
+        archivo.flush()
+        n += 1
+        errores += bool(fila["error"])
+    return n, errores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cotiza un CSV / JSONL de partidos sin abrir la app.")
+    parser.add_argument("entrada", help="archivo CSV / JSONL ('-' = stdin)")
+    parser.add_argument("--salida", default="-", help="archivo CSV / JSONL ('-' = stdout)")
+    parser.add_argument("--formato", choices=("csv", "jsonl"),
+                        help="formato de entrada y salida si no se deduce de la extensión")
+    parser.add_argument("--liga", choices=sorted(ENTRADAS), help="liga de las filas sin columna 'liga'")
+    parser.add_argument("--modo", choices=("auto",) + MODOS, default="auto",
+                        help="auto = exacto en NHL, analítico en NFL / NBA")
+    parser.add_argument("--sims", type=int, default=10000, help="simulaciones por partido (montecarlo)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--umbral", type=float, default=UMBRAL)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="filas por tarea del pool")
+    parser.add_argument("--parametros", help="JSON de parámetros (por defecto el de la app)")
+    args = parser.parse_args(argv)
+
+    params, err = cargar_parametros(args.parametros)
+    if err:
+        parser.error(err)
+
+    formato_entrada = _formato(args.entrada, args.formato)
+    formato_salida = _formato(args.salida, args.formato) if args.salida != "-" else formato_entrada
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, newline="", encoding="utf-8")
+    salida = sys.stdout if args.salida == "-" else open(args.salida, "w", newline="", encoding="utf-8")
+    inicio = time.perf_counter()
+    try:
+        filas = cotizar_stream(
+            leer_filas(entrada, formato_entrada), workers=args.workers, tamano_lote=args.lote,
+            liga=args.liga, modo=args.modo, num_sims=args.sims, seed=args.seed,
+            umbral=args.umbral, params=params,
+        )
+        n, errores = escribir_filas(filas, salida, formato_salida)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+
+    segundos = time.perf_counter() - inicio
+    print(f"{n} partidos en {segundos:.2f} s ({n / segundos if segundos else 0:,.0f}/s), "
+          f"{errores} con error", file=sys.stderr)
+    return 1 if n and errores == n else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+from motor.odds import (
+    equipos_del_juego,
+    leer_odds_sportsbook,
+    normalize_team_code,
+    odds_del_juego,
+)
+
+# =========================================================
+# AGREGACIÓN MULTI-SPORTSBOOK (mejor línea y consenso sin vig)
+# =========================================================
+#
+# Una fila por (juego, sportsbook) en columnas NumPy; mejores líneas y
+# consenso salen de un groupby sobre toda la jornada a la vez.
+
+COLUMNAS_LIBROS = ["home", "away", "libro", "spread_home", "total", "ml_home", "ml_away"]
+
+
+def implied_vectorizado(ml):
+    """implied_from_ml sobre arrays. 0 / NaN = sin línea → NaN."""
+    ml = np.asarray(ml, dtype=float)
+    ml = np.where(ml == 0, np.nan, ml)
+    return np.where(ml > 0, 100.0 / (ml + 100.0), -ml / (-ml + 100.0))
+
+
+def tabla_libros(data: list) -> pd.DataFrame:
+    """GameOddsByWeek → DataFrame largo, una fila por juego y sportsbook."""
+    filas = []
+    for g in data or []:
+        raw_home, raw_away = equipos_del_juego(g)
+        home = normalize_team_code(raw_home)
+        away = normalize_team_code(raw_away)
+        if not home or not away or home == away:
+            continue
+        for i, o in enumerate(odds_del_juego(g)):
+            lo = leer_odds_sportsbook(o)
+            filas.append((
+                home, away, o.get("Sportsbook") or f"Book {i + 1}",
+                lo["spread_home"], lo["total"], lo["ml_home"], lo["ml_away"],
+            ))
+
+    tabla = pd.DataFrame(filas, columns=COLUMNAS_LIBROS)
+    for c in ("spread_home", "total", "ml_home", "ml_away"):
+        tabla[c] = pd.to_numeric(tabla[c], errors="coerce")
+    # Moneyline 0 es "sin línea", igual que en la app.
+    tabla[["ml_home", "ml_away"]] = tabla[["ml_home", "ml_away"]].replace(0, np.nan)
+    return tabla
+
+
+def _mejor(tabla: pd.DataFrame, valor: pd.Series, columna: str, maximo=True):
+    """Mejor valor por juego y el sportsbook que lo ofrece (empate → primer libro)."""
+    validos = tabla[["home", "away", "libro"]].assign(valor=valor).dropna(subset=["valor"])
+    validos = validos.sort_values("valor", ascending=not maximo, kind="stable")
+    mejor = validos.drop_duplicates(["home", "away"]).set_index(["home", "away"])
+    return mejor[["valor", "libro"]].set_axis([columna, f"libro_{columna}"], axis=1)
+
+
+def mejores_lineas(tabla: pd.DataFrame) -> pd.DataFrame:
+    """
+    Por juego (índice home, away), en formato de cada lado:
+
+      - spread_home / spread_away: el spread con más puntos para ese lado
+      - over / under:              total más bajo (OVER) y más alto (UNDER)
+      - ml_home / ml_away:         moneyline que más paga a ese lado
+      - prob_home_consenso:        P(home) sin vig, promedio de los libros
+      - n_libros
+
+    Cada línea trae en 'libro_*' el sportsbook que la ofrece.
+    """
+    if tabla.empty:
+        return pd.DataFrame()
+
+    # Sin vig por libro: se normalizan las dos implícitas para que sumen 1.
+    p_home = implied_vectorizado(tabla["ml_home"].to_numpy())
+    p_away = implied_vectorizado(tabla["ml_away"].to_numpy())
+    sin_vig = pd.Series(p_home / (p_home + p_away), index=tabla.index)
+    claves = [tabla["home"], tabla["away"]]
+    n_libros = tabla.groupby(["home", "away"], sort=False).size().rename("n_libros")
+
+    partes = [
+        _mejor(tabla, tabla["spread_home"], "spread_home"),
+        _mejor(tabla, -tabla["spread_home"], "spread_away"),
+        _mejor(tabla, tabla["total"], "over", maximo=False),
+        _mejor(tabla, tabla["total"], "under"),
+        _mejor(tabla, tabla["ml_home"], "ml_home"),
+        _mejor(tabla, tabla["ml_away"], "ml_away"),
+        sin_vig.groupby(claves, sort=False).mean().rename("prob_home_consenso").to_frame(),
+        n_libros,
+    ]
+    mejores = pd.concat(partes, axis=1).reindex(n_libros.index)
+    mejores.index.names = ["home", "away"]
+    return mejores
+
+
+def mejor_linea_partido(mejores: pd.DataFrame, home: str, away: str, local_es_home: bool):
+    """
+    Mejor línea de un juego vista desde el LOCAL de la app.
+
+    spread / spread_visita van en el formato de cada lado; total_over y
+    total_under son el mejor total para cada apuesta. None = ningún
+    sportsbook dio esa línea.
+    """
+    if mejores.empty or (home, away) not in mejores.index:
+        return None
+    f = mejores.loc[(home, away)]
+
+    def val(c):
+        v = f[c]
+        return None if pd.isna(v) else float(v)
+
+    def libro(c):
+        v = f[f"libro_{c}"]
+        return None if pd.isna(v) else v
+
+    lado_l, lado_v = ("home", "away") if local_es_home else ("away", "home")
+    p_home = val("prob_home_consenso")
+    return {
+        "spread": val(f"spread_{lado_l}"),
+        "libro_spread": libro(f"spread_{lado_l}"),
+        "spread_visita": val(f"spread_{lado_v}"),
+        "libro_spread_visita": libro(f"spread_{lado_v}"),
+        "total_over": val("over"),
+        "libro_over": libro("over"),
+        "total_under": val("under"),
+        "libro_under": libro("under"),
+        "ml_local": val(f"ml_{lado_l}"),
+        "libro_ml_local": libro(f"ml_{lado_l}"),
+        "ml_visita": val(f"ml_{lado_v}"),
+        "libro_ml_visita": libro(f"ml_{lado_v}"),
+        "prob_local_consenso": None if p_home is None else (p_home if local_es_home else 1 - p_home),
+        "n_libros": int(f["n_libros"]),
+    }
+
+
+def linea_contra_modelo(linea: dict, line_modelo: float, total_modelo: float):
+    """
+    Spread (formato LOCAL) y total con los que comparar el modelo: de
+    cada mercado, la mejor línea del lado donde el modelo ve más edge.
+    """
+    spread = None
+    opciones = []
+    if linea["spread"] is not None:
+        opciones.append((linea["spread"] - line_modelo, linea["spread"]))
+    if linea["spread_visita"] is not None:
+        opciones.append((line_modelo + linea["spread_visita"], -linea["spread_visita"]))
+    if opciones:
+        spread = max(opciones)[1]
+
+    total = None
+    opciones = []
+    if linea["total_over"] is not None:
+        opciones.append((total_modelo - linea["total_over"], linea["total_over"]))
+    if linea["total_under"] is not None:
+        opciones.append((linea["total_under"] - total_modelo, linea["total_under"]))
+    if opciones:
+        total = max(opciones)[1]
+
+    return spread, total
@@ -0,0 +1,226 @@
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+# =========================================================
+# MÉTRICAS (tiempos, contadores, histogramas) + export Prometheus
+# =========================================================
+#
+# Un solo registro por proceso, compartido por todas las sesiones.
+# Apagado por defecto (SIMULADOR_METRICAS=1 lo prende): cada llamada
+# revisa un booleano y regresa, así que instrumentar no cuesta nada.
+#
+#   contar("cache_llamadas_total", cache="cargar_nfl_desde_api")
+#   observar("http_segundos", 0.21, endpoint="/v3/nba/scores/json/Standings")
+#   with cronometro("montecarlo"): ...
+#   etapas = Etapas(); ...; etapas.marcar("4) proyección")
+
+PREFIJO = "simulador_"
+
+# Cubetas de latencia (segundos) para histogramas de tiempo.
+CUBETAS_SEGUNDOS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+ARCHIVO_PROMETHEUS = os.environ.get("SIMULADOR_METRICAS_ARCHIVO", "")
+
+_activo = os.environ.get("SIMULADOR_METRICAS", "").lower() in ("1", "true", "si", "sí", "on")
+_candado = threading.Lock()
+_contadores = {}    # (nombre, etiquetas) → valor
+_histogramas = {}   # (nombre, etiquetas) → [conteos por cubeta..., suma, n]
+
+
+def activo() -> bool:
+    return _activo
+
+
+def activar(encendido: bool = True):
+    global _activo
+    _activo = bool(encendido)
+
+
+def reiniciar():
+    with _candado:
+        _contadores.clear()
+        _histogramas.clear()
+
+
+def _llave(nombre, etiquetas):
+    return nombre, tuple(sorted((k, str(v)) for k, v in etiquetas.items()))
+
+
+def contar(nombre: str, valor: float = 1.0, **etiquetas):
+    if not _activo:
+        return
+    llave = _llave(nombre, etiquetas)
+    with _candado:
+        _contadores[llave] = _contadores.get(llave, 0.0) + valor
+
+
+def observar(nombre: str, valor: float, **etiquetas):
+    """Agrega una observación (en segundos) a un histograma."""
+    if not _activo:
+        return
+    llave = _llave(nombre, etiquetas)
+    with _candado:
+        h = _histogramas.get(llave)
+        if h is None:
+            h = _histogramas[llave] = [0] * len(CUBETAS_SEGUNDOS) + [0.0, 0]
+        for i, limite in enumerate(CUBETAS_SEGUNDOS):
+            if valor <= limite:
+                h[i] += 1
+        h[-2] += valor
+        h[-1] += 1
+
+
+class _Nada:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NADA = _Nada()
+
+
+def cronometro(etapa: str, nombre: str = "etapa_segundos"):
+    """Context manager que mide el bloque; apagado devuelve un no-op compartido."""
+    if not _activo:
+        return _NADA
+    return _medir(nombre, etapa)
+
+
+@contextmanager
+def _medir(nombre, etapa):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        observar(nombre, time.perf_counter() - inicio, etapa=etapa)
+
+
+class Etapas:
+    """Tiempos por tramo de un script de arriba a abajo (cada marcar() cierra un tramo)."""
+
+    __slots__ = ("_ultimo",)
+
+    def __init__(self):
+        self._ultimo = time.perf_counter() if _activo else 0.0
+
+    def marcar(self, etapa: str):
+        if not _activo:
+            return
+        ahora = time.perf_counter()
+        observar("etapa_segundos", ahora - self._ultimo, etapa=etapa)
+        self._ultimo = ahora
+
+
+def endpoint_de(url: str) -> str:
+    """Ruta sin segmentos variables (temporada, semana): etiqueta de baja cardinalidad."""
+    partes = [p for p in urlsplit(url).path.split("/") if p and not re.search(r"\d", p)]
+    return "/" + "/".join(partes)
+
+
+def registrar_http(url: str, status, segundos: float):
+    if not _activo:
+        return
+    endpoint = endpoint_de(url)
+    contar("http_respuestas_total", endpoint=endpoint, status=status)
+    observar("http_segundos", segundos, endpoint=endpoint)
+
+
+def registrar_sims(motor: str, num_sims: int, segundos: float):
+    """Simulaciones generadas y tiempo gastado (sims/s = cociente de los dos)."""
+    if not _activo:
+        return
+    contar("sims_total", num_sims, motor=motor)
+    contar("sims_segundos_total", segundos, motor=motor)
+
+
+# ---- lectura ----
+
+def contadores() -> dict:
+    with _candado:
+        return dict(_contadores)
+
+
+def histogramas() -> dict:
+    with _candado:
+        return {k: list(v) for k, v in _histogramas.items()}
+
+
+def sims_por_segundo() -> dict:
+    """{motor: sims/s} con lo acumulado hasta ahora."""
+    c = contadores()
+    out = {}
+    for (nombre, etiquetas), valor in c.items():
+        if nombre == "sims_total":
+            seg = c.get(("sims_segundos_total", etiquetas), 0.0)
+            out[dict(etiquetas)["motor"]] = valor / seg if seg > 0 else float("nan")
+    return out
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _etiquetas_txt(etiquetas, extra=()):
+    pares = list(etiquetas) + list(extra)
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in pares) + "}"
+
+
+def exportar_prometheus() -> str:
+    """Formato de texto de Prometheus (exposition format 0.0.4)."""
+    lineas = []
+
+    por_nombre = {}
+    for (nombre, etiquetas), valor in sorted(contadores().items()):
+        por_nombre.setdefault(nombre, []).append((etiquetas, valor))
+    for nombre, series in por_nombre.items():
+        lineas.append(f"# TYPE {PREFIJO}{nombre} counter")
+        for etiquetas, valor in series:
+            lineas.append(f"{PREFIJO}{nombre}{_etiquetas_txt(etiquetas)} {valor:g}")
+
+    por_nombre = {}
+    for (nombre, etiquetas), h in sorted(histogramas().items()):
+        por_nombre.setdefault(nombre, []).append((etiquetas, h))
+    for nombre, series in por_nombre.items():
+        lineas.append(f"# TYPE {PREFIJO}{nombre} histogram")
+        for etiquetas, h in series:
+            for limite, n in zip(CUBETAS_SEGUNDOS, h):
+                lineas.append(f"{PREFIJO}{nombre}_bucket{_etiquetas_txt(etiquetas, [('le', f'{limite:g}')])} {n}")
+            lineas.append(f"{PREFIJO}{nombre}_bucket{_etiquetas_txt(etiquetas, [('le', '+Inf')])} {h[-1]}")
+            lineas.append(f"{PREFIJO}{nombre}_sum{_etiquetas_txt(etiquetas)} {h[-2]:g}")
+            lineas.append(f"{PREFIJO}{nombre}_count{_etiquetas_txt(etiquetas)} {h[-1]}")
+
+    return "\n".join(lineas) + "\n"
+
+
+def escribir_prometheus(ruta: str = None):
+    """
+    Deja el texto en un archivo (para el textfile collector de
+    node_exporter). Se escribe a un temporal y se renombra, así el
+    lector nunca ve un archivo a medias. El temporal es único por
+    llamada: las sesiones de Streamlit son hilos del mismo proceso y
+    pueden terminar un rerun al mismo tiempo.
+    """
+    ruta = ruta or ARCHIVO_PROMETHEUS
+    if not _activo or not ruta:
+        return
+    fd, temporal = tempfile.mkstemp(prefix=os.path.basename(ruta) + ".", suffix=".tmp",
+                                    dir=os.path.dirname(ruta) or ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(exportar_prometheus())
+        # mkstemp crea el archivo 0600; el collector suele correr con otro usuario.
+        os.chmod(temporal, 0o644)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
@@ -0,0 +1,262 @@
+import hashlib
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from motor import metricas
+
+# =========================================================
+# MONTE CARLO VECTORIZADO (NumPy)
+# =========================================================
+
+# Máximo de valores simulados por bloque (partidos × simulaciones): así la
+# memoria queda acotada aunque se pidan millones de simulaciones.
+TAMANO_BLOQUE = 250_000
+
+# Simulaciones por fragmento para el reparto entre procesos. Es fijo a
+# propósito: cada fragmento tiene su stream de RNG y el resultado no
+# cambia con el número de workers.
+SIMS_POR_FRAGMENTO = 100_000
+
+
+def muestrear_marcadores(rng, pts_local, pts_visita, desv, n):
+    """
+    Genera n marcadores simulados (local, visita) como arrays de NumPy.
+    Mismo modelo que el loop original: normal con desviación fija,
+    recortada en 0 (max(0, ...)).
+    """
+    sim_l = np.maximum(0.0, rng.normal(pts_local, desv, n))
+    sim_v = np.maximum(0.0, rng.normal(pts_visita, desv, n))
+    return sim_l, sim_v
+
+
+def _fragmentos(num_sims, seed):
+    """
+    Parte num_sims en fragmentos de tamaño fijo, cada uno con su propio
+    stream de RNG (hijos independientes de SeedSequence(seed)).
+
+    El reparto NO depende del número de procesos: así la misma seed da
+    exactamente el mismo resultado con 1 o con N workers.
+    """
+    tamanos = _tamanos_fragmentos(num_sims)
+    hijos = np.random.SeedSequence(seed).spawn(len(tamanos))
+    return list(zip(tamanos, hijos))
+
+
+def _tamanos_fragmentos(num_sims):
+    num_fragmentos = -(-num_sims // SIMS_POR_FRAGMENTO)
+    tamanos = [SIMS_POR_FRAGMENTO] * (num_fragmentos - 1)
+    tamanos.append(num_sims - SIMS_POR_FRAGMENTO * (num_fragmentos - 1))
+    return tamanos
+
+
+def _contar_fragmento(pts_local, pts_visita, desv, spread_casa, total_casa, n, semilla):
+    """Covers/overs de un fragmento (se ejecuta en el proceso que toque)."""
+    rng = np.random.default_rng(semilla)
+    num_partidos = pts_local.shape[0]
+    covers = np.zeros(num_partidos, dtype=np.int64)
+    overs = np.zeros(num_partidos, dtype=np.int64)
+
+    por_bloque = max(1, TAMANO_BLOQUE // num_partidos)
+    restantes = n
+    while restantes > 0:
+        m = min(por_bloque, restantes)
+        forma = (num_partidos, m)
+        sim_l = np.maximum(0.0, rng.normal(pts_local, desv, forma))
+        sim_v = np.maximum(0.0, rng.normal(pts_visita, desv, forma))
+        covers += np.count_nonzero((sim_l - sim_v) + spread_casa >= 0, axis=1)
+        overs += np.count_nonzero((sim_l + sim_v) > total_casa, axis=1)
+        restantes -= m
+
+    return covers, overs
+
+
+def _clave_entera(clave) -> int:
+    """Entero estable entre procesos y corridas (hash() de str cambia con PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.sha256(str(clave).encode("utf-8")).digest()[:8], "little")
+
+
+def _fragmentos_por_partido(num_sims, seed, claves):
+    """
+    Como _fragmentos, pero cada partido con su propio stream derivado de
+    (seed, clave): [(n, [semilla de cada partido]) por fragmento].
+    """
+    tamanos = _tamanos_fragmentos(num_sims)
+    hijos = [
+        np.random.SeedSequence(seed, spawn_key=(_clave_entera(c),)).spawn(len(tamanos))
+        for c in claves
+    ]
+    return [(n, [h[i] for h in hijos]) for i, n in enumerate(tamanos)]
+
+
+def _contar_fragmento_por_partido(pts_local, pts_visita, desv, spread_casa, total_casa, n, semillas):
+    """Covers/overs de un fragmento con un generador por partido."""
+    num_partidos = pts_local.shape[0]
+    covers = np.zeros(num_partidos, dtype=np.int64)
+    overs = np.zeros(num_partidos, dtype=np.int64)
+    for i, semilla in enumerate(semillas):
+        rng = np.random.default_rng(semilla)
+        sim_l = np.maximum(0.0, rng.normal(pts_local[i, 0], desv[i, 0], n))
+        sim_v = np.maximum(0.0, rng.normal(pts_visita[i, 0], desv[i, 0], n))
+        covers[i] = np.count_nonzero((sim_l - sim_v) + spread_casa[i, 0] >= 0)
+        overs[i] = np.count_nonzero((sim_l + sim_v) > total_casa[i, 0])
+    return covers, overs
+
+
+def simular_jornada(pts_local, pts_visita, desv, spread_casa, total_casa,
+                    num_sims, seed=None, workers=1, claves=None):
+    """
+    Monte Carlo de varios partidos a la vez, como matriz (partidos × sims).
+
+    Todos los argumentos aceptan un array con un valor por partido
+    (o un escalar común). Devuelve (prob_cover, prob_over) como arrays
+    en porcentaje.
+
+    Con workers > 1 los fragmentos se reparten en un pool de procesos;
+    el resultado es idéntico al de workers=1 para la misma seed.
+
+    'claves' (una por partido, p.ej. id_juego) da a cada partido su propio
+    stream derivado de (seed, clave): su resultado ya no depende de qué
+    otros partidos entren en la llamada (recotizar unos pocos juegos da
+    lo mismo que recotizar la semana).
+    """
+    pts_local, pts_visita, desv, spread_casa, total_casa = (
+        np.atleast_1d(np.asarray(x, dtype=float))
+        for x in (pts_local, pts_visita, desv, spread_casa, total_casa)
+    )
+    num_partidos = np.broadcast_shapes(
+        pts_local.shape, pts_visita.shape, desv.shape, spread_casa.shape, total_casa.shape
+    )[0]
+    pts_local, pts_visita, desv, spread_casa, total_casa = (
+        np.broadcast_to(x, (num_partidos,))[:, None]
+        for x in (pts_local, pts_visita, desv, spread_casa, total_casa)
+    )
+
+    num_sims = int(num_sims)
+    if num_sims <= 0:
+        return np.zeros(num_partidos), np.zeros(num_partidos)
+
+    inicio = time.perf_counter()
+    if claves is None:
+        fragmentos = _fragmentos(num_sims, seed)
+        contar = _contar_fragmento
+    else:
+        if len(claves) != num_partidos:
+            raise ValueError("Hace falta una clave por partido")
+        fragmentos = _fragmentos_por_partido(num_sims, seed, claves)
+        contar = _contar_fragmento_por_partido
+    params = (pts_local, pts_visita, desv, spread_casa, total_casa)
+
+    if workers > 1 and len(fragmentos) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(fragmentos))) as pool:
+            futuros = [
+                pool.submit(contar, *params, n, semilla)
+                for n, semilla in fragmentos
+            ]
+            resultados = [f.result() for f in futuros]
+    else:
+        resultados = [contar(*params, n, semilla) for n, semilla in fragmentos]
+
+    # Suma en el orden de los fragmentos: merge determinista.
+    covers = sum(r[0] for r in resultados)
+    overs = sum(r[1] for r in resultados)
+
+    metricas.registrar_sims("montecarlo", num_sims * num_partidos, time.perf_counter() - inicio)
+    prob_cover = covers / num_sims * 100
+    prob_over = overs / num_sims * 100
+    return prob_cover, prob_over
+
+
+def simular_partido(pts_local, pts_visita, desv, spread_casa, total_casa,
+                    num_sims, seed=None, workers=1):
+    """
+    Monte Carlo de un partido, todo en arrays.
+
+    Devuelve (prob_cover, prob_over) en porcentaje, igual que la sección 6:
+      - cover: (sim_l - sim_v) + spread_casa >= 0
+      - over:  (sim_l + sim_v) > total_casa
+    Con la misma seed el resultado es reproducible (con cualquier
+    número de workers).
+    """
+    prob_cover, prob_over = simular_jornada(
+        pts_local, pts_visita, desv, spread_casa, total_casa, num_sims,
+        seed=seed, workers=workers,
+    )
+    return float(prob_cover[0]), float(prob_over[0])
+
+
+# =========================================================
+# MONTE CARLO ADAPTATIVO (se detiene cuando ya es preciso)
+# =========================================================
+
+def intervalo_wilson(exitos, n, z=1.96):
+    """Intervalo de Wilson para una proporción, en porcentaje (lo, hi)."""
+    if n <= 0:
+        return 0.0, 100.0
+    p = exitos / n
+    denom = 1 + z * z / n
+    centro = (p + z * z / (2 * n)) / denom
+    radio = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centro - radio) * 100, min(1.0, centro + radio) * 100
+
+
+def _intervalo_resuelto(lo, hi, semiancho_objetivo, umbral):
+    """
+    True si el intervalo ya es suficientemente estrecho o si ya no puede
+    cambiar la recomendación de la sección 7 (p >= umbral o p <= 100 - umbral).
+    """
+    if (hi - lo) / 2 <= semiancho_objetivo:
+        return True
+    umbral_otro_lado = 100.0 - umbral
+    if lo >= umbral or hi <= umbral_otro_lado:
+        return True
+    return lo > umbral_otro_lado and hi < umbral
+
+
+def simular_adaptativo(pts_local, pts_visita, desv, spread_casa, total_casa,
+                       seed=None, lote=2_000, max_sims=1_000_000,
+                       semiancho_objetivo=0.5, umbral=55.0, z=1.96):
+    """
+    Monte Carlo secuencial por lotes. Tras cada lote calcula el intervalo
+    de confianza de prob_cover y prob_over y para cuando, en AMBOS
+    mercados, el intervalo es más estrecho que ±semiancho_objetivo (pp)
+    o queda claramente a un lado del umbral de recomendación.
+
+    Devuelve un dict con prob_cover, prob_over, ic_cover, ic_over,
+    num_sims (simulaciones realmente usadas) y motivo.
+    """
+    params = tuple(
+        np.asarray([x], dtype=float)[:, None]
+        for x in (pts_local, pts_visita, desv, spread_casa, total_casa)
+    )
+    semillas = np.random.SeedSequence(seed)
+    inicio = time.perf_counter()
+
+    covers, overs, n = 0, 0, 0
+    motivo = "máximo de simulaciones"
+    while n < max_sims:
+        m = min(lote, max_sims - n)
+        (semilla,) = semillas.spawn(1)
+        c, o = _contar_fragmento(*params, m, semilla)
+        covers += int(c[0])
+        overs += int(o[0])
+        n += m
+
+        ic_cover = intervalo_wilson(covers, n, z)
+        ic_over = intervalo_wilson(overs, n, z)
+        if (_intervalo_resuelto(*ic_cover, semiancho_objetivo, umbral)
+                and _intervalo_resuelto(*ic_over, semiancho_objetivo, umbral)):
+            motivo = "precisión / umbral alcanzado"
+            break
+
+    metricas.registrar_sims("adaptativo", n, time.perf_counter() - inicio)
+    return {
+        "prob_cover": covers / n * 100,
+        "prob_over": overs / n * 100,
+        "ic_cover": intervalo_wilson(covers, n, z),
+        "ic_over": intervalo_wilson(overs, n, z),
+        "num_sims": n,
+        "motivo": motivo,
+    }
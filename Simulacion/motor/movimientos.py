@@ -0,0 +1,259 @@
+import argparse
+import os
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+
+import pandas as pd
+
+from motor.api import NFL_GAMEODDS_WEEK_BASE, NFL_SEASON_LABEL, descargar_nfl_desde_api
+from motor.cache_disco import CACHE_DIR, get_json_cacheado
+from motor.jornada import COLUMNAS_OCULTAS, actualizar_jornada
+from motor.odds import equipos_del_juego, id_juego, leer_odds_sportsbook, odds_del_juego
+from motor.parametros import cargar_parametros
+
+# =========================================================
+# HISTORIAL DE LÍNEAS (solo cambios, append-only)
+# =========================================================
+#
+# Cada vez que llega un GameOddsByWeek se compara, por juego y sportsbook,
+# contra la última línea vista. Solo lo que cambió (spread, total o algún
+# moneyline) se agrega al log, con la hora en que se vio:
+#
+#   lineas: id, semana, juego, home, away, libro, visto,
+#           spread_home, total, ml_home, ml_away
+#   ultima: la fila vigente de cada (juego, libro), para comparar sin
+#           recorrer el log
+#
+# Índice (juego, id): reproducir la historia de un partido es una sola
+# lectura por índice. Mismo SQLite en WAL que la cache de respuestas, así
+# que la app y el sondeo por CLI pueden escribir a la vez.
+
+CAMPOS_LINEA = ("spread_home", "total", "ml_home", "ml_away")
+
+
+@dataclass(frozen=True)
+class Movimiento:
+    """Un cambio de línea de un sportsbook (antes = None si es la primera vez)."""
+    juego: str
+    home: str
+    away: str
+    libro: str
+    antes: tuple
+    ahora: tuple
+
+
+def lineas_del_payload(data: list):
+    """(juego, home, away, libro, (spread_home, total, ml_home, ml_away)) por sportsbook."""
+    for g in data or []:
+        raw_home, raw_away = equipos_del_juego(g)
+        juego = id_juego(g)
+        for i, o in enumerate(odds_del_juego(g)):
+            odds = leer_odds_sportsbook(o)
+            libro = o.get("Sportsbook") or f"Book {i + 1}"
+            yield juego, raw_home, raw_away, libro, tuple(odds[c] for c in CAMPOS_LINEA)
+
+
+class HistorialLineas:
+    """Log append-only de movimientos de línea en un archivo SQLite."""
+
+    def __init__(self, ruta: str = None):
+        if ruta is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            ruta = os.path.join(CACHE_DIR, "movimientos.sqlite3")
+        self.ruta = ruta
+        with closing(self._conectar()) as con, con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS lineas (
+                    id INTEGER PRIMARY KEY,
+                    semana TEXT NOT NULL,
+                    juego TEXT NOT NULL,
+                    home TEXT NOT NULL,
+                    away TEXT NOT NULL,
+                    libro TEXT NOT NULL,
+                    visto REAL NOT NULL,
+                    spread_home REAL,
+                    total REAL,
+                    ml_home INTEGER,
+                    ml_away INTEGER
+                )
+                """
+            )
+            con.execute("CREATE INDEX IF NOT EXISTS idx_lineas_juego ON lineas(juego, id)")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_lineas_semana ON lineas(semana, id)")
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ultima (
+                    juego TEXT NOT NULL,
+                    libro TEXT NOT NULL,
+                    id INTEGER NOT NULL,
+                    spread_home REAL,
+                    total REAL,
+                    ml_home INTEGER,
+                    ml_away INTEGER,
+                    PRIMARY KEY (juego, libro)
+                )
+                """
+            )
+
+    def _conectar(self):
+        return sqlite3.connect(self.ruta, timeout=30)
+
+    def registrar_semana(self, data: list, semana: str, visto: float = None):
+        """
+        Compara el payload contra la última línea de cada (juego, libro) y
+        guarda solo los cambios. Devuelve la lista de Movimiento.
+        """
+        visto = time.time() if visto is None else visto
+        filas = list(lineas_del_payload(data))
+        if not filas:
+            return []
+
+        movimientos = []
+        with closing(self._conectar()) as con, con:
+            # BEGIN IMMEDIATE: dos procesos sondeando la misma semana no
+            # pueden leer la misma 'ultima' y duplicar el cambio.
+            con.execute("BEGIN IMMEDIATE")
+            juegos = sorted({f[0] for f in filas})
+            previas = {}
+            for i in range(0, len(juegos), 500):
+                parte = juegos[i:i + 500]
+                for juego, libro, *linea in con.execute(
+                    f"SELECT juego, libro, spread_home, total, ml_home, ml_away FROM ultima "
+                    f"WHERE juego IN ({','.join('?' * len(parte))})",
+                    parte,
+                ):
+                    previas[(juego, libro)] = tuple(linea)
+
+            for juego, home, away, libro, linea in filas:
+                antes = previas.get((juego, libro))
+                if antes == linea:
+                    continue
+                cur = con.execute(
+                    "INSERT INTO lineas (semana, juego, home, away, libro, visto, "
+                    "spread_home, total, ml_home, ml_away) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (semana, juego, home, away, libro, visto, *linea),
+                )
+                con.execute(
+                    "INSERT OR REPLACE INTO ultima (juego, libro, id, spread_home, total, ml_home, ml_away) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (juego, libro, cur.lastrowid, *linea),
+                )
+                previas[(juego, libro)] = linea
+                movimientos.append(Movimiento(juego, home, away, libro, antes, linea))
+        return movimientos
+
+    def ultimo_id(self, semana: str = None) -> int:
+        """Id del último cambio guardado (de la semana, si se pide): marca para movidos_desde."""
+        with closing(self._conectar()) as con:
+            if semana is None:
+                (n,) = con.execute("SELECT COALESCE(MAX(id), 0) FROM lineas").fetchone()
+            else:
+                (n,) = con.execute(
+                    "SELECT COALESCE(MAX(id), 0) FROM lineas WHERE semana = ?", (semana,)
+                ).fetchone()
+        return n
+
+    def movidos_desde(self, semana: str, desde_id: int) -> set:
+        """Juegos de la semana con algún cambio de línea después de 'desde_id'."""
+        with closing(self._conectar()) as con:
+            return {
+                juego for (juego,) in con.execute(
+                    "SELECT DISTINCT juego FROM lineas WHERE semana = ? AND id > ?",
+                    (semana, desde_id),
+                )
+            }
+
+    def _tabla(self, sql: str, args) -> pd.DataFrame:
+        columnas = ["id", "semana", "juego", "home", "away", "libro", "visto", *CAMPOS_LINEA]
+        with closing(self._conectar()) as con:
+            filas = con.execute(sql, args).fetchall()
+        df = pd.DataFrame(filas, columns=columnas)
+        df["visto"] = pd.to_datetime(df["visto"], unit="s")
+        return df
+
+    def historial(self, juego: str, libro: str = None) -> pd.DataFrame:
+        """Todos los cambios de un juego (o de un sportsbook del juego), en orden."""
+        sql = "SELECT * FROM lineas WHERE juego = ?"
+        args = [juego]
+        if libro is not None:
+            sql += " AND libro = ?"
+            args.append(libro)
+        return self._tabla(sql + " ORDER BY id", args)
+
+    def lineas_en(self, juego: str, cuando: float) -> pd.DataFrame:
+        """Reproduce el juego hasta 'cuando' (epoch): la línea vigente de cada sportsbook."""
+        df = self.historial(juego)
+        df = df[df["visto"] <= pd.to_datetime(cuando, unit="s")]
+        return df.drop_duplicates("libro", keep="last").reset_index(drop=True)
+
+    def recientes(self, semana: str, limite: int = 50) -> pd.DataFrame:
+        """Últimos cambios de la semana, el más nuevo primero."""
+        return self._tabla(
+            "SELECT * FROM lineas WHERE semana = ? ORDER BY id DESC LIMIT ?", (semana, limite)
+        )
+
+
+# =========================================================
+# SONDEO (CLI): registra cambios y recotiza solo lo que se movió
+# =========================================================
+
+def sondear_semana(api_key: str, season_label: str, week: int, historial: HistorialLineas):
+    """Una pasada: baja la semana (304 si no cambió nada) y registra los cambios."""
+    url = f"{NFL_GAMEODDS_WEEK_BASE}/{season_label}/{week}"
+    status, data = get_json_cacheado(url, {"key": api_key}, ttl=0, stale=0)
+    if status != 200:
+        return None, [], f"Error {status} del endpoint GameOddsByWeek"
+    return data, historial.registrar_semana(data, f"{season_label}/{week}"), ""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sondea GameOddsByWeek y guarda los movimientos de línea.")
+    parser.add_argument("semana", type=int)
+    parser.add_argument("--season", default=NFL_SEASON_LABEL)
+    parser.add_argument("--nfl-key", default=os.environ.get("SPORTSDATA_NFL_KEY", ""))
+    parser.add_argument("--intervalo", type=float, default=300, help="segundos entre sondeos")
+    parser.add_argument("--veces", type=int, default=0, help="número de sondeos (0 = sin fin)")
+    parser.add_argument("--sims", type=int, default=0,
+                        help="si > 0, recotiza los juegos que se movieron con estas simulaciones")
+    parser.add_argument("--db", help="archivo SQLite (por defecto junto a la cache en disco)")
+    args = parser.parse_args(argv)
+
+    historial = HistorialLineas(args.db)
+    params, err = cargar_parametros()
+    if err:
+        parser.error(err)
+    registro = tabla = None
+    if args.sims > 0:
+        registro, err = descargar_nfl_desde_api(args.nfl_key)
+        if err:
+            parser.error(err)
+
+    n = 0
+    while True:
+        inicio = time.perf_counter()
+        data, movimientos, err = sondear_semana(args.nfl_key, args.season, args.semana, historial)
+        if err:
+            print(err, flush=True)
+        else:
+            for m in movimientos:
+                print(f"{m.away} @ {m.home}  {m.libro:12s} {m.antes} → {m.ahora}", flush=True)
+            movidos = {m.juego for m in movimientos}
+            if registro is not None and movidos:
+                tabla, _ = actualizar_jornada(tabla, data, movidos, registro, args.sims,
+                                              seed=42, params=params)
+                print(tabla.drop(columns=COLUMNAS_OCULTAS).to_string(), flush=True)
+            print(f"{len(movimientos)} cambios en {len(movidos)} juegos "
+                  f"({time.perf_counter() - inicio:.2f} s)", flush=True)
+
+        n += 1
+        if args.veces and n >= args.veces:
+            break
+        time.sleep(args.intervalo)
+
+
+if __name__ == "__main__":
+    main()
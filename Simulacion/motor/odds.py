@@ -0,0 +1,130 @@
+from dataclasses import dataclass, field
+
+# =========================================================
+# HELPERS GENERALES
+# =========================================================
+
+def normalize_team_code(name: str) -> str:
+    """Normaliza el nombre/código de equipo a algo tipo 'DAL', 'NYG', sin espacios."""
+    if not name:
+        return ""
+    return name.strip().upper().replace(" ", "")
+
+
+def implied_from_ml(ml):
+    """Probabilidad implícita (0..1) de un moneyline americano. 0 = sin línea."""
+    if ml == 0:
+        return 0.0
+    if ml > 0:
+        return 100 / (ml + 100)
+    else:
+        return -ml / (-ml + 100)
+
+# =========================================================
+# LECTURA DE ODDS (GameOddsByWeek)
+# =========================================================
+
+def equipos_del_juego(g: dict):
+    """Devuelve (home, away) crudos tal como vienen en el juego."""
+    raw_home = g.get("HomeTeam") or g.get("HomeTeamName") or g.get("HomeTeamKey") or ""
+    raw_away = g.get("AwayTeam") or g.get("AwayTeamName") or g.get("AwayTeamKey") or ""
+    return raw_home, raw_away
+
+
+def id_juego(g: dict) -> str:
+    """GameId de SportsDataIO; si no viene, away@home (único dentro de una semana)."""
+    game_id = g.get("GameId") or g.get("GlobalGameId")
+    if game_id:
+        return str(game_id)
+    raw_home, raw_away = equipos_del_juego(g)
+    return f"{raw_away}@{raw_home}"
+
+
+def odds_del_juego(g: dict):
+    """Lista de bloques de odds (uno por sportsbook) del juego."""
+    return g.get("PregameOdds") or g.get("GameOdds") or []
+
+
+def leer_odds_sportsbook(o: dict):
+    """
+    Extrae de un bloque de odds el spread del HOME, el total y los
+    moneylines. Los campos que no vengan quedan en None.
+    """
+    spread_home = o.get("HomePointSpread")
+    if spread_home is None:
+        spread_home = o.get("PointSpread")
+
+    return {
+        "spread_home": spread_home,
+        "total": o.get("OverUnder"),
+        "ml_home": o.get("HomeMoneyLine") or o.get("HomeTeamMoneyLine"),
+        "ml_away": o.get("AwayMoneyLine") or o.get("AwayTeamMoneyLine"),
+    }
+
+
+# =========================================================
+# ÍNDICE DE MATCHUPS (una vez por semana)
+# =========================================================
+
+@dataclass
+class PartidoOdds:
+    """Un juego de la semana con las odds ya leídas de cada sportsbook."""
+    home: str
+    away: str
+    libros: list = field(default_factory=list)  # [(sportsbook, leer_odds_sportsbook(o)), ...]
+
+
+def clave_matchup(code_a: str, code_b: str) -> frozenset:
+    """Llave sin orden: DAL-NYG y NYG-DAL son el mismo partido."""
+    return frozenset((code_a, code_b))
+
+
+def indexar_odds_semana(data: list) -> dict:
+    """
+    GameOddsByWeek → {frozenset(códigos): PartidoOdds}.
+    Se arma una sola vez al cargar la semana; cada búsqueda es O(1).
+    """
+    indice = {}
+    for g in data or []:
+        raw_home, raw_away = equipos_del_juego(g)
+        home = normalize_team_code(raw_home)
+        away = normalize_team_code(raw_away)
+        if not home or not away or home == away:
+            continue
+
+        libros = [
+            (o.get("Sportsbook") or f"Book {i + 1}", leer_odds_sportsbook(o))
+            for i, o in enumerate(odds_del_juego(g))
+        ]
+        indice.setdefault(clave_matchup(home, away), PartidoOdds(home, away, libros))
+    return indice
+
+
+def _codigo_equipo(texto: str, registro=None) -> str:
+    """Código canónico del texto del usuario ('Dallas' → 'DAL' si hay registro)."""
+    if registro is not None:
+        codigo = registro.codigo_de(texto)
+        if codigo:
+            return codigo
+    return normalize_team_code(texto)
+
+
+def resolver_matchup(indice: dict, team_local: str, team_visita: str, registro=None):
+    """
+    Partido del índice para ese LOCAL/VISITA.
+    Devuelve (PartidoOdds, ¿el LOCAL de la app es el home?, mensaje de error).
+    """
+    if not indice:
+        return None, False, "No se encontraron juegos para esa semana."
+
+    code_local = _codigo_equipo(team_local, registro)
+    code_visita = _codigo_equipo(team_visita, registro)
+
+    if not code_local or not code_visita:
+        return None, False, "Escribe LOCAL y VISITA antes de traer los odds."
+
+    partido = indice.get(clave_matchup(code_local, code_visita))
+    if partido is None or code_local == code_visita:
+        return None, False, "No encontré ese matchup en los odds de esa semana."
+
+    return partido, partido.home == code_local, ""
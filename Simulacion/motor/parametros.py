@@ -0,0 +1,98 @@
+import dataclasses
+import json
+import os
+from dataclasses import dataclass, field
+
+# =========================================================
+# PARÁMETROS DEL MODELO (pesos, desviaciones, multiplicadores)
+# =========================================================
+#
+# Los valores por defecto son los que venían fijos en la app. Un JSON
+# calibrado (python -m motor.calibracion ...) puede sobreescribir
+# cualquiera de ellos; la app lo lee al arrancar.
+
+# Desviación de los puntos de cada equipo en la simulación, por liga.
+DESV_LIGA = {"NFL": 13.0, "NBA": 12.0, "NHL": 1.2}
+
+# Sección 3: multiplicador de los puntos proyectados según el estado.
+MULT_ESTADO = {
+    "Healthy / completo": 1.00,
+    "1 baja importante": 0.97,
+    "Varias bajas / tocado": 0.93,
+    "En buen momento": 1.03,
+}
+
+RUTA_PARAMETROS = os.environ.get(
+    "SIMULADOR_PARAMETROS",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "parametros.json"),
+)
+
+
+@dataclass(frozen=True)
+class Parametros:
+    # NFL: base = ofensiva * w_of + defensa * w_def (+ ventaja si es local)
+    nfl_peso_ofensiva: float = 0.55
+    nfl_peso_defensa: float = 0.35
+    nfl_ventaja_local: float = 1.5
+
+    # NBA: reciente = off_5 * w_off + def_5 rival * w_def; mezcla reciente / global
+    nba_peso_off_5: float = 0.6
+    nba_peso_def_5: float = 0.4
+    nba_peso_reciente: float = 0.65
+    nba_peso_global: float = 0.35
+
+    # NHL: GF/GA, xG y Corsi% / Save%
+    nhl_peso_goles: float = 0.5
+    nhl_peso_xg: float = 0.3
+    nhl_peso_posesion: float = 0.2
+    # NHL exacto (motor.goles): var = media + dispersion · media²; goles compartidos
+    nhl_dispersion: float = 0.0
+    nhl_correlacion: float = 0.0
+    # Combinadas (motor.combinadas): correlación de los puntos de local y visita
+    correlacion_marcador: float = 0.0
+
+    desv_nfl: float = DESV_LIGA["NFL"]
+    desv_nba: float = DESV_LIGA["NBA"]
+    desv_nhl: float = DESV_LIGA["NHL"]
+
+    mult_estado: dict = field(default_factory=lambda: dict(MULT_ESTADO))
+
+    def desv(self, liga: str) -> float:
+        return {"NFL": self.desv_nfl, "NBA": self.desv_nba, "NHL": self.desv_nhl}[liga]
+
+    def a_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def desde_dict(cls, datos: dict) -> "Parametros":
+        """Lo que no venga en 'datos' se queda con el valor por defecto."""
+        campos = {f.name for f in dataclasses.fields(cls)}
+        valores = {k: v for k, v in (datos or {}).items() if k in campos}
+        if "mult_estado" in valores:
+            valores["mult_estado"] = {**MULT_ESTADO, **valores["mult_estado"]}
+        return cls(**valores)
+
+
+PARAMETROS_POR_DEFECTO = Parametros()
+
+
+def cargar_parametros(ruta: str = None):
+    """
+    Lee el JSON de parámetros calibrados. Si no existe se usan los valores
+    por defecto. Devuelve (Parametros, mensaje de error).
+    """
+    ruta = ruta or RUTA_PARAMETROS
+    if not os.path.exists(ruta):
+        return PARAMETROS_POR_DEFECTO, ""
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            return Parametros.desde_dict(json.load(f)), ""
+    except (OSError, ValueError, TypeError) as e:
+        return PARAMETROS_POR_DEFECTO, f"No pude leer {ruta}: {e}"
+
+
+def guardar_parametros(params: Parametros, ruta: str = None):
+    ruta = ruta or RUTA_PARAMETROS
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(params.a_dict(), f, indent=2, ensure_ascii=False)
+        f.write("\n")
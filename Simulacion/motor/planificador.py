@@ -0,0 +1,163 @@
+import hashlib
+import os
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+
+from motor import metricas
+
+# =========================================================
+# PLANIFICADOR DE PETICIONES A SPORTSDATAIO
+# =========================================================
+#
+# Se sienta entre get_json_cacheado y la sesión HTTP:
+#
+#   - single-flight: si ya hay una petición idéntica en vuelo, las demás
+#     esperan su resultado en vez de salir a la red
+#   - presupuesto de peticiones por minuto POR API KEY (ventana deslizante
+#     de 60 s); si hay que esperar más de max_espera se corta con
+#     LimiteDeTasa
+#   - reintentos con backoff exponencial y jitter completo ante 429, 5xx,
+#     timeouts y errores de conexión (respeta Retry-After)
+#
+# Todo en memoria del proceso: las sesiones de Streamlit son hilos del
+# mismo proceso y comparten el planificador.
+
+RPM_POR_KEY = int(os.environ.get("SIMULADOR_RPM", 60))
+REINTENTOS = int(os.environ.get("SIMULADOR_REINTENTOS", 3))
+BACKOFF_BASE = 0.5     # segundos
+BACKOFF_MAX = 8.0
+MAX_ESPERA_CUPO = 30.0
+
+STATUS_REINTENTABLES = frozenset({429, 500, 502, 503, 504})
+
+
+class LimiteDeTasa(requests.RequestException):
+    """No hubo cupo en el presupuesto de la key dentro de max_espera."""
+
+
+class _Vuelo:
+    __slots__ = ("listo", "resultado", "error")
+
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado = None
+        self.error = None
+
+
+def _espera_retry_after(resp) -> float:
+    """Segundos de Retry-After (solo la forma numérica); 0 si no viene."""
+    try:
+        return max(0.0, float(resp.headers.get("Retry-After", 0)))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class PlanificadorHTTP:
+    def __init__(self, sesion: requests.Session, rpm: int = RPM_POR_KEY, reintentos: int = REINTENTOS,
+                 backoff_base: float = BACKOFF_BASE, backoff_max: float = BACKOFF_MAX,
+                 max_espera: float = MAX_ESPERA_CUPO):
+        self.sesion = sesion
+        self.rpm = rpm
+        self.reintentos = reintentos
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_espera = max_espera
+        self._candado = threading.Lock()
+        self._en_vuelo = {}   # clave → _Vuelo
+        self._ventanas = {}   # hash de la key → deque de timestamps
+
+    # ---- single-flight ----
+
+    def unico(self, clave: str, funcion):
+        """
+        Corre funcion() una sola vez por clave a la vez: quien llega con
+        la misma clave mientras está en vuelo recibe el mismo resultado
+        (o la misma excepción).
+        """
+        with self._candado:
+            vuelo = self._en_vuelo.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = self._en_vuelo[clave] = _Vuelo()
+
+        if not lider:
+            metricas.contar("http_coalescidas_total")
+            vuelo.listo.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            return vuelo.resultado
+
+        try:
+            vuelo.resultado = funcion()
+            return vuelo.resultado
+        except BaseException as e:
+            vuelo.error = e
+            raise
+        finally:
+            with self._candado:
+                del self._en_vuelo[clave]
+            vuelo.listo.set()
+
+    def en_vuelo(self, clave: str) -> bool:
+        with self._candado:
+            return clave in self._en_vuelo
+
+    # ---- presupuesto por key ----
+
+    def reservar(self, api_key: str):
+        """Bloquea hasta que haya cupo para 'api_key' en el último minuto."""
+        if self.rpm <= 0:
+            return
+        llave = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()
+        limite = time.monotonic() + self.max_espera
+        while True:
+            with self._candado:
+                ahora = time.monotonic()
+                ventana = self._ventanas.setdefault(llave, deque())
+                while ventana and ahora - ventana[0] >= 60.0:
+                    ventana.popleft()
+                if len(ventana) < self.rpm:
+                    ventana.append(ahora)
+                    return
+                espera = 60.0 - (ahora - ventana[0])
+            if ahora + espera > limite:
+                metricas.contar("http_sin_cupo_total")
+                raise LimiteDeTasa(f"Sin cupo: más de {self.rpm} peticiones por minuto con esta key")
+            metricas.contar("http_esperas_cupo_total")
+            time.sleep(espera)
+
+    # ---- GET con reintentos ----
+
+    def _backoff(self, intento: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** intento))
+
+    def get(self, url: str, params: dict = None, headers: dict = None, timeout: float = 10):
+        """
+        GET con presupuesto y reintentos. Devuelve la última respuesta (que
+        puede ser un 429 / 5xx si se agotaron los reintentos); los errores
+        de red se propagan después del último intento.
+        """
+        api_key = (params or {}).get("key", "")
+        for intento in range(self.reintentos + 1):
+            self.reservar(api_key)
+            inicio = time.perf_counter()
+            try:
+                resp = self.sesion.get(url, params=params, headers=headers, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                metricas.registrar_http(url, "error", time.perf_counter() - inicio)
+                if intento == self.reintentos:
+                    raise
+                metricas.contar("http_reintentos_total", motivo="red")
+                time.sleep(self._backoff(intento))
+                continue
+
+            metricas.registrar_http(url, resp.status_code, time.perf_counter() - inicio)
+            if resp.status_code not in STATUS_REINTENTABLES or intento == self.reintentos:
+                return resp
+            metricas.contar("http_reintentos_total", motivo=resp.status_code)
+            time.sleep(max(self._backoff(intento), min(_espera_retry_after(resp), self.backoff_max)))
+        return resp
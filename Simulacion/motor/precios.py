@@ -0,0 +1,156 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from motor.analitico import probabilidades_analiticas
+from motor.goles import probabilidades_goles
+from motor.montecarlo import simular_partido
+from motor.odds import implied_from_ml
+from motor.parametros import PARAMETROS_POR_DEFECTO
+from motor.proyecciones import Proyeccion, proyectar
+
+# =========================================================
+# PRICING COMPLETO DE UN PARTIDO (secciones 4–8, sin Streamlit)
+# =========================================================
+
+# Umbral de recomendación de la sección 7.
+UMBRAL = 55.0
+
+# Modos de la sección 6 ('exacto' = goles discretos, solo NHL).
+MODOS = ("analitico", "montecarlo", "exacto")
+
+
+@dataclass(frozen=True)
+class LineasCasa:
+    """Lo que piden las secciones 5 y 5b."""
+    spread: float = 0.0
+    total: float = 0.0
+    ml_local: int = 0
+    ml_visita: int = 0
+
+
+@dataclass(frozen=True)
+class Recomendacion:
+    """Una apuesta de la sección 7 ('Spread' / 'Total', lado, línea, prob. %)."""
+    mercado: str
+    lado: str
+    linea: float
+    prob: float
+
+
+@dataclass(frozen=True)
+class ResultadoPrecio:
+    proyeccion: Proyeccion
+    lineas: LineasCasa
+    prob_cover: float
+    prob_over: float
+    recomendaciones: Tuple[Recomendacion, ...]
+    num_sims: Optional[int] = None
+
+    @property
+    def dif_spread(self) -> float:
+        """Edge de spread del LOCAL en puntos (sección 5 / 8)."""
+        return self.lineas.spread - self.proyeccion.line_modelo
+
+    @property
+    def dif_total(self) -> float:
+        return self.proyeccion.total - self.lineas.total
+
+    @property
+    def prob_impl_local(self) -> float:
+        return implied_from_ml(self.lineas.ml_local) * 100
+
+    @property
+    def prob_impl_visita(self) -> float:
+        return implied_from_ml(self.lineas.ml_visita) * 100
+
+    @property
+    def p_local_modelo(self) -> float:
+        return prob_local_modelo(self.proyeccion.spread)
+
+    @property
+    def alertas_trap(self) -> Tuple[str, ...]:
+        return alertas_trap(self.dif_spread, self.dif_total)
+
+
+def prob_local_modelo(spread_global: float) -> float:
+    """Sección 5c: % de victoria del LOCAL a partir del spread modelo (2% por punto)."""
+    p_local_modelo = 50 + (spread_global * 2)
+    return max(1, min(99, p_local_modelo))
+
+
+def alertas_trap(dif_spread: float, dif_total: float) -> Tuple[str, ...]:
+    """Mercados donde la casa está muy lejos del modelo (posible trap line)."""
+    trap_msgs = []
+    if abs(dif_spread) >= 5:
+        trap_msgs.append("spread")
+    if abs(dif_total) >= 8:
+        trap_msgs.append("total")
+    return tuple(trap_msgs)
+
+
+def recomendaciones(prob_cover: float, prob_over: float, spread_casa: float,
+                    total_casa: float, umbral: float = UMBRAL) -> Tuple[Recomendacion, ...]:
+    """Sección 7: lados con probabilidad >= umbral."""
+    recs = []
+
+    prob_cover_local = prob_cover
+    prob_cover_visita = 100.0 - prob_cover
+
+    if prob_cover_local >= umbral:
+        recs.append(Recomendacion("Spread", "LOCAL", spread_casa, prob_cover_local))
+    if prob_cover_visita >= umbral:
+        recs.append(Recomendacion("Spread", "VISITA", -spread_casa, prob_cover_visita))
+
+    prob_over_val = prob_over
+    prob_under_val = 100.0 - prob_over_val
+
+    if prob_over_val >= umbral:
+        recs.append(Recomendacion("Total", "OVER", total_casa, prob_over_val))
+    elif prob_under_val >= umbral:
+        recs.append(Recomendacion("Total", "UNDER", total_casa, prob_under_val))
+
+    return tuple(recs)
+
+
+def cotizar(entrada, lineas: LineasCasa, modo: str = "analitico", num_sims: int = 10000,
+            seed=None, workers: int = 1, umbral: float = UMBRAL,
+            params=None) -> ResultadoPrecio:
+    """
+    Pricing completo de un partido: proyección (sección 4), probabilidades
+    de cover/over (sección 6, uno de MODOS) y recomendaciones (sección 7).
+    'params' = pesos y desviaciones (motor.parametros).
+    """
+    params = params or PARAMETROS_POR_DEFECTO
+    proy = proyectar(entrada, params)
+    desv = params.desv(entrada.liga)
+
+    if modo == "analitico":
+        prob_cover, prob_over = probabilidades_analiticas(
+            proy.pts_local, proy.pts_visita, desv, lineas.spread, lineas.total
+        )
+        sims = None
+    elif modo == "montecarlo":
+        prob_cover, prob_over = simular_partido(
+            proy.pts_local, proy.pts_visita, desv, lineas.spread, lineas.total,
+            num_sims, seed=seed, workers=workers,
+        )
+        sims = int(num_sims)
+    elif modo == "exacto":
+        if entrada.liga != "NHL":
+            raise ValueError("El modo exacto es solo para NHL.")
+        prob_cover, prob_over = probabilidades_goles(
+            proy.pts_local, proy.pts_visita, lineas.spread, lineas.total,
+            params.nhl_dispersion, params.nhl_correlacion,
+        )
+        sims = None
+    else:
+        raise ValueError(f"Modo desconocido: {modo!r}")
+
+    return ResultadoPrecio(
+        proyeccion=proy,
+        lineas=lineas,
+        prob_cover=prob_cover,
+        prob_over=prob_over,
+        recomendaciones=recomendaciones(prob_cover, prob_over, lineas.spread, lineas.total, umbral),
+        num_sims=sims,
+    )
@@ -0,0 +1,137 @@
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from motor.api import (
+    NBA_STANDINGS_URL,
+    NFL_GAMEODDS_WEEK_BASE,
+    NFL_SEASON_LABEL,
+    NFL_TEAMSEASON_URL,
+)
+from motor.cache_disco import get_json_cacheado
+
+# =========================================================
+# PRECARGA CONCURRENTE DE TODA LA TEMPORADA
+# =========================================================
+#
+# Baja TeamSeasonStats, NBA Standings y GameOddsByWeek de un rango de
+# semanas en paralelo (pool de hilos sobre la sesión HTTP compartida) y
+# deja todo en la cache en disco, así la app arranca en caliente.
+
+# Máximo de peticiones simultáneas contra un mismo host.
+POR_HOST = 4
+
+
+@dataclass(frozen=True)
+class MedicionDescarga:
+    nombre: str
+    url: str
+    status: int
+    segundos: float
+    error: str = ""
+
+
+class _LimitePorHost:
+    """Un semáforo por host para no pasar de 'por_host' peticiones a la vez."""
+
+    def __init__(self, por_host: int):
+        self.por_host = por_host
+        self._semaforos = {}
+        self._lock = threading.Lock()
+
+    def para(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._semaforos:
+                self._semaforos[host] = threading.BoundedSemaphore(self.por_host)
+            return self._semaforos[host]
+
+
+def _descargar(limite: _LimitePorHost, nombre: str, url: str, params: dict,
+               ttl: float, cache) -> MedicionDescarga:
+    with limite.para(url):
+        inicio = time.perf_counter()
+        try:
+            status, _ = get_json_cacheado(url, params, ttl, cache=cache, stale=0)
+            error = ""
+        except Exception as e:
+            status, error = 0, str(e)
+        return MedicionDescarga(nombre, url, status, time.perf_counter() - inicio, error)
+
+
+def trabajos_temporada(api_nfl_key: str, api_nba_key: str, semanas,
+                       season_label: str = NFL_SEASON_LABEL):
+    """Lista de (nombre, url, params) a precargar."""
+    trabajos = []
+    if api_nfl_key:
+        trabajos.append(("NFL TeamSeasonStats", NFL_TEAMSEASON_URL, {"key": api_nfl_key}))
+        for week in semanas:
+            trabajos.append((
+                f"NFL GameOddsByWeek {season_label}/{week}",
+                f"{NFL_GAMEODDS_WEEK_BASE}/{season_label}/{week}",
+                {"key": api_nfl_key},
+            ))
+    if api_nba_key:
+        trabajos.append(("NBA Standings", NBA_STANDINGS_URL, {"key": api_nba_key}))
+    return trabajos
+
+
+def precargar_temporada(api_nfl_key: str, api_nba_key: str, semanas,
+                        season_label: str = NFL_SEASON_LABEL, max_workers: int = 8,
+                        por_host: int = POR_HOST, ttl: float = 0, cache=None):
+    """
+    Precarga concurrente. Con ttl=0 se revalida todo (las entradas que no
+    cambiaron solo cuestan un 304); con ttl > 0 lo que siga vigente en
+    disco ni siquiera sale a la red.
+
+    Devuelve la lista de MedicionDescarga en el mismo orden de los trabajos.
+    """
+    trabajos = trabajos_temporada(api_nfl_key, api_nba_key, semanas, season_label)
+    limite = _LimitePorHost(por_host)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futuros = [
+            pool.submit(_descargar, limite, nombre, url, params, ttl, cache)
+            for nombre, url, params in trabajos
+        ]
+        return [f.result() for f in futuros]
+
+
+def _rango_semanas(texto: str):
+    """'1-18' o '1,2,5' → lista de semanas."""
+    semanas = []
+    for parte in texto.split(","):
+        if "-" in parte:
+            a, b = parte.split("-", 1)
+            semanas.extend(range(int(a), int(b) + 1))
+        elif parte.strip():
+            semanas.append(int(parte))
+    return semanas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precarga la temporada en la cache en disco.")
+    parser.add_argument("--semanas", default="1-18", help="rango de semanas NFL, p.ej. 1-18 o 1,2,5")
+    parser.add_argument("--season", default=NFL_SEASON_LABEL)
+    parser.add_argument("--nfl-key", default=os.environ.get("SPORTSDATA_NFL_KEY", ""))
+    parser.add_argument("--nba-key", default=os.environ.get("SPORTSDATA_NBA_KEY", ""))
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--por-host", type=int, default=POR_HOST)
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    mediciones = precargar_temporada(
+        args.nfl_key, args.nba_key, _rango_semanas(args.semanas),
+        season_label=args.season, max_workers=args.workers, por_host=args.por_host,
+    )
+    for m in mediciones:
+        estado = m.status if not m.error else f"ERROR {m.error}"
+        print(f"{m.segundos * 1000:8.1f} ms  {estado}  {m.nombre}")
+    print(f"{len(mediciones)} peticiones en {time.perf_counter() - inicio:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
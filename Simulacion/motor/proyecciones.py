@@ -0,0 +1,226 @@
+import dataclasses
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from motor.parametros import PARAMETROS_POR_DEFECTO
+
+# =========================================================
+# FUNCIONES DE PROYECCIÓN
+# =========================================================
+#
+# Solo aritmética (y np.where / np.maximum): funcionan igual con números
+# sueltos que con arrays de NumPy (un valor por partido). Los pesos salen
+# de 'params' (motor.parametros); sin params, los valores de siempre.
+
+
+def proyeccion_nfl(ofensiva, defensa, es_local=False, params=None):
+    p = params or PARAMETROS_POR_DEFECTO
+    base = p.nfl_peso_ofensiva * ofensiva + p.nfl_peso_defensa * defensa
+    if es_local:
+        base += p.nfl_ventaja_local
+    return base
+
+
+def proyeccion_nba(l_anota_global, l_permite_global, v_anota_global, v_permite_global,
+                   pace_local_5, off_local_5, def_local_5,
+                   pace_visita_5, off_visita_5, def_visita_5,
+                   pace_liga=99.0, params=None):
+    """
+    Últimos 5 + pace + global (65% / 35%).
+    Devuelve (pts_local, pts_visita) SIN multiplicador de estado.
+    """
+    p = params or PARAMETROS_POR_DEFECTO
+    pace_med = np.where(
+        (np.asarray(pace_local_5) > 0) & (np.asarray(pace_visita_5) > 0),
+        (pace_local_5 + pace_visita_5) / 2,
+        pace_liga,
+    )
+
+    reciente_local = (p.nba_peso_off_5 * off_local_5 + p.nba_peso_def_5 * def_visita_5) * (pace_med / 100.0)
+    reciente_visita = (p.nba_peso_off_5 * off_visita_5 + p.nba_peso_def_5 * def_local_5) * (pace_med / 100.0)
+
+    global_local_part = (l_anota_global + v_permite_global) / 2.0
+    global_visita_part = (v_anota_global + l_permite_global) / 2.0
+
+    pts_local = p.nba_peso_reciente * reciente_local + p.nba_peso_global * global_local_part
+    pts_visita = p.nba_peso_reciente * reciente_visita + p.nba_peso_global * global_visita_part
+    return pts_local, pts_visita
+
+
+def proyeccion_nhl(gf_local_5, ga_local_5, xgf_local_5, xga_local_5, corsi_local_5, sv_goalie_local_5,
+                   gf_visita_5, ga_visita_5, xgf_visita_5, xga_visita_5, corsi_visita_5, sv_goalie_visita_5,
+                   goles_liga=6.20, params=None):
+    """
+    GF/GA + xG + Corsi% + Save%.
+    Devuelve (goles_local, goles_visita) SIN multiplicador de estado.
+    """
+    p = params or PARAMETROS_POR_DEFECTO
+    w_g, w_xg, w_pos = p.nhl_peso_goles, p.nhl_peso_xg, p.nhl_peso_posesion
+    base_team = goles_liga / 2.0
+
+    atk_local = w_g * gf_local_5 + w_xg * xgf_local_5 + w_pos * (corsi_local_5 - 50) / 5
+    def_visita = w_g * ga_visita_5 + w_xg * xga_visita_5 - w_pos * (sv_goalie_visita_5 - 0.910) * 10
+
+    atk_visita = w_g * gf_visita_5 + w_xg * xgf_visita_5 + w_pos * (corsi_visita_5 - 50) / 5
+    def_local = w_g * ga_local_5 + w_xg * xga_local_5 - w_pos * (sv_goalie_local_5 - 0.910) * 10
+
+    exp_local = base_team + 0.5 * (atk_local - base_team) - 0.5 * (def_visita - base_team)
+    exp_visita = base_team + 0.5 * (atk_visita - base_team) - 0.5 * (def_local - base_team)
+
+    return np.maximum(0.5, exp_local), np.maximum(0.5, exp_visita)
+
+
+# =========================================================
+# ENTRADAS / SALIDAS TIPADAS
+# =========================================================
+
+@dataclass(frozen=True)
+class EntradaNFL:
+    """Lo que piden las secciones 1–3 para NFL."""
+    l_anota_global: float = 0.0
+    l_permite_global: float = 0.0
+    v_anota_global: float = 0.0
+    v_permite_global: float = 0.0
+    l_anota_casa: float = 0.0
+    l_permite_casa: float = 0.0
+    v_anota_visita: float = 0.0
+    v_permite_visita: float = 0.0
+    mult_local: float = 1.0
+    mult_visita: float = 1.0
+
+    liga = "NFL"
+
+
+@dataclass(frozen=True)
+class EntradaNBA:
+    """Lo que piden las secciones 1–3 para NBA."""
+    l_anota_global: float = 0.0
+    l_permite_global: float = 0.0
+    v_anota_global: float = 0.0
+    v_permite_global: float = 0.0
+    pace_local_5: float = 0.0
+    off_local_5: float = 0.0
+    def_local_5: float = 0.0
+    pace_visita_5: float = 0.0
+    off_visita_5: float = 0.0
+    def_visita_5: float = 0.0
+    pace_liga: float = 99.0
+    mult_local: float = 1.0
+    mult_visita: float = 1.0
+
+    liga = "NBA"
+
+
+@dataclass(frozen=True)
+class EntradaNHL:
+    """Lo que piden las secciones 2–3 para NHL."""
+    gf_local_5: float = 0.0
+    ga_local_5: float = 0.0
+    xgf_local_5: float = 0.0
+    xga_local_5: float = 0.0
+    corsi_local_5: float = 50.0
+    sv_goalie_local_5: float = 0.910
+    gf_visita_5: float = 0.0
+    ga_visita_5: float = 0.0
+    xgf_visita_5: float = 0.0
+    xga_visita_5: float = 0.0
+    corsi_visita_5: float = 50.0
+    sv_goalie_visita_5: float = 0.910
+    goles_liga: float = 6.20
+    mult_local: float = 1.0
+    mult_visita: float = 1.0
+
+    liga = "NHL"
+
+
+@dataclass(frozen=True)
+class Proyeccion:
+    """Salida de la sección 4. Los campos *_cv solo existen en NFL con casa/visita."""
+    pts_local: float
+    pts_visita: float
+    pts_local_cv: Optional[float] = None
+    pts_visita_cv: Optional[float] = None
+
+    @property
+    def total(self) -> float:
+        return self.pts_local + self.pts_visita
+
+    @property
+    def spread(self) -> float:
+        """Spread modelo (local – visita)."""
+        return self.pts_local - self.pts_visita
+
+    @property
+    def line_modelo(self) -> float:
+        """Línea modelo en formato casa (negativa si el LOCAL es favorito)."""
+        return -self.spread
+
+    @property
+    def hay_cv(self) -> bool:
+        return self.pts_local_cv is not None
+
+    @property
+    def total_cv(self) -> Optional[float]:
+        return self.pts_local_cv + self.pts_visita_cv if self.hay_cv else None
+
+    @property
+    def spread_cv(self) -> Optional[float]:
+        return self.pts_local_cv - self.pts_visita_cv if self.hay_cv else None
+
+
+def puntos_modelo(entrada, params=None, **cambios):
+    """
+    (pts_local, pts_visita) GLOBALES de la sección 4, con multiplicadores.
+    'cambios' reemplaza campos de la entrada por números o arrays que se
+    broadcastean entre sí (p.ej. una malla de dos entradas).
+    """
+    if not isinstance(entrada, (EntradaNFL, EntradaNBA, EntradaNHL)):
+        raise TypeError(f"Entrada de liga desconocida: {type(entrada).__name__}")
+    v = {f.name: getattr(entrada, f.name) for f in dataclasses.fields(entrada)}
+    desconocidos = set(cambios) - set(v)
+    if desconocidos:
+        raise ValueError(f"Campos desconocidos para {entrada.liga}: {', '.join(sorted(desconocidos))}")
+    v.update(cambios)
+
+    if isinstance(entrada, EntradaNFL):
+        pts_local = proyeccion_nfl(v["l_anota_global"], v["v_permite_global"], True, params)
+        pts_visita = proyeccion_nfl(v["v_anota_global"], v["l_permite_global"], False, params)
+    elif isinstance(entrada, EntradaNBA):
+        pts_local, pts_visita = proyeccion_nba(
+            v["l_anota_global"], v["l_permite_global"],
+            v["v_anota_global"], v["v_permite_global"],
+            v["pace_local_5"], v["off_local_5"], v["def_local_5"],
+            v["pace_visita_5"], v["off_visita_5"], v["def_visita_5"],
+            v["pace_liga"],
+            params,
+        )
+    else:
+        pts_local, pts_visita = proyeccion_nhl(
+            v["gf_local_5"], v["ga_local_5"], v["xgf_local_5"],
+            v["xga_local_5"], v["corsi_local_5"], v["sv_goalie_local_5"],
+            v["gf_visita_5"], v["ga_visita_5"], v["xgf_visita_5"],
+            v["xga_visita_5"], v["corsi_visita_5"], v["sv_goalie_visita_5"],
+            v["goles_liga"],
+            params,
+        )
+    return pts_local * v["mult_local"], pts_visita * v["mult_visita"]
+
+
+def proyectar(entrada, params=None) -> Proyeccion:
+    """Sección 4 completa para cualquier liga (multiplicadores incluidos)."""
+    pts_local, pts_visita = puntos_modelo(entrada, params)
+
+    pts_local_cv = pts_visita_cv = None
+    if isinstance(entrada, EntradaNFL) and any([entrada.l_anota_casa, entrada.l_permite_casa,
+                                                entrada.v_anota_visita, entrada.v_permite_visita]):
+        pts_local_cv = proyeccion_nfl(entrada.l_anota_casa, entrada.v_permite_visita, True, params) * entrada.mult_local
+        pts_visita_cv = proyeccion_nfl(entrada.v_anota_visita, entrada.l_permite_casa, False, params) * entrada.mult_visita
+
+    return Proyeccion(
+        pts_local=float(pts_local),
+        pts_visita=float(pts_visita),
+        pts_local_cv=None if pts_local_cv is None else float(pts_local_cv),
+        pts_visita_cv=None if pts_visita_cv is None else float(pts_visita_cv),
+    )
@@ -0,0 +1,191 @@
+import math
+import time
+
+import numpy as np
+from scipy.special import ndtr, ndtri
+from scipy.stats import qmc
+
+from motor import metricas
+from motor.montecarlo import TAMANO_BLOQUE
+
+# =========================================================
+# REDUCCIÓN DE VARIANZA PARA EL MONTE CARLO
+# =========================================================
+#
+# Mismo modelo que la sección 6 (normales recortadas en 0), pero con
+# muestreos que dan la misma precisión con menos simulaciones:
+#
+#   - "antitetica": cada Z se usa también como -Z (pares negativamente
+#     correlacionados).
+#   - "control":    variable de control = mismo evento SIN el recorte en 0,
+#     cuya probabilidad exacta es una CDF normal de la diferencia/suma.
+#   - "sobol":      cuasi-Monte Carlo con secuencias Sobol aleatorizadas
+#     (scrambled); la varianza se estima con réplicas independientes.
+#
+# Cada estrategia reporta su tamaño efectivo de muestra (ESS): cuántas
+# simulaciones normales harían falta para la misma varianza.
+
+ESTRATEGIAS = ("ninguna", "antitetica", "control", "sobol")
+
+# Réplicas independientes de Sobol para poder estimar la varianza.
+REPLICAS_SOBOL = 8
+
+
+def _eventos(z_l, z_v, pts_local, pts_visita, desv, spread_casa, total_casa):
+    """Indicadores cover/over (como float) para normales estándar dadas."""
+    sim_l = np.maximum(0.0, pts_local + desv * z_l)
+    sim_v = np.maximum(0.0, pts_visita + desv * z_v)
+    cover = ((sim_l - sim_v) + spread_casa >= 0).astype(float)
+    over = ((sim_l + sim_v) > total_casa).astype(float)
+    return cover, over
+
+
+def _ess(p, varianza):
+    """
+    ESS = varianza binomial de 1 sim / varianza del estimador.
+    Varianza 0 (p.ej. el control coincide con el evento porque nunca hay
+    recorte) = estimación exacta → ESS infinito.
+    """
+    if varianza <= 0:
+        return math.inf
+    return float(p * (1 - p) / varianza)
+
+
+def _antitetica(rng, params, num_sims):
+    pares = max(1, num_sims // 2)
+    suma = np.zeros(2)
+    suma2 = np.zeros(2)
+    restantes = pares
+    while restantes > 0:
+        m = min(TAMANO_BLOQUE, restantes)
+        z_l = rng.standard_normal(m)
+        z_v = rng.standard_normal(m)
+        c1, o1 = _eventos(z_l, z_v, *params)
+        c2, o2 = _eventos(-z_l, -z_v, *params)
+        y = np.stack([(c1 + c2) / 2, (o1 + o2) / 2])
+        suma += y.sum(axis=1)
+        suma2 += (y * y).sum(axis=1)
+        restantes -= m
+
+    media = suma / pares
+    var_pares = np.maximum(0.0, suma2 / pares - media * media)
+    return media, var_pares / pares, 2 * pares
+
+
+def _control(rng, params, num_sims):
+    pts_local, pts_visita, desv, spread_casa, total_casa = params
+    # Sin recorte: L - V ~ N(mu_l - mu_v, 2·desv²), L + V ~ N(mu_l + mu_v, 2·desv²).
+    desv_2 = desv * math.sqrt(2.0)
+    esperado = np.array([
+        ndtr((pts_local - pts_visita + spread_casa) / desv_2),
+        ndtr((pts_local + pts_visita - total_casa) / desv_2),
+    ])
+
+    # Momentos acumulados por bloque: I (evento real) y C (control).
+    s_i = np.zeros(2)
+    s_c = np.zeros(2)
+    s_ii = np.zeros(2)
+    s_cc = np.zeros(2)
+    s_ic = np.zeros(2)
+    restantes = num_sims
+    while restantes > 0:
+        m = min(TAMANO_BLOQUE, restantes)
+        z_l = rng.standard_normal(m)
+        z_v = rng.standard_normal(m)
+        cover, over = _eventos(z_l, z_v, *params)
+        x_l = pts_local + desv * z_l
+        x_v = pts_visita + desv * z_v
+        ind = np.stack([cover, over])
+        ctl = np.stack([
+            ((x_l - x_v) + spread_casa >= 0).astype(float),
+            ((x_l + x_v) > total_casa).astype(float),
+        ])
+        s_i += ind.sum(axis=1)
+        s_c += ctl.sum(axis=1)
+        s_ii += (ind * ind).sum(axis=1)
+        s_cc += (ctl * ctl).sum(axis=1)
+        s_ic += (ind * ctl).sum(axis=1)
+        restantes -= m
+
+    n = num_sims
+    media_i = s_i / n
+    media_c = s_c / n
+    var_i = s_ii / n - media_i ** 2
+    var_c = s_cc / n - media_c ** 2
+    cov = s_ic / n - media_i * media_c
+
+    b = np.divide(cov, var_c, out=np.zeros(2), where=var_c > 0)
+    media = media_i - b * (media_c - esperado)
+    var_residual = np.maximum(0.0, var_i - b * cov)
+    return np.clip(media, 0.0, 1.0), var_residual / n, n
+
+
+def _sobol(seed, params, num_sims):
+    # Cada réplica usa 2^k puntos (Sobol pierde balance si no es potencia de 2).
+    # Se redondea hacia ARRIBA: nunca se simula menos de lo pedido.
+    por_replica = -(-num_sims // REPLICAS_SOBOL)
+    k = max(1, (por_replica - 1).bit_length())
+    semillas = np.random.SeedSequence(seed).spawn(REPLICAS_SOBOL)
+
+    medias = []
+    for semilla in semillas:
+        u = qmc.Sobol(d=2, scramble=True, seed=np.random.default_rng(semilla)).random_base2(k)
+        z = ndtri(np.clip(u, 1e-12, 1 - 1e-12))
+        cover, over = _eventos(z[:, 0], z[:, 1], *params)
+        medias.append([cover.mean(), over.mean()])
+
+    medias = np.array(medias)
+    media = medias.mean(axis=0)
+    var_est = medias.var(axis=0, ddof=1) / REPLICAS_SOBOL
+    return media, var_est, REPLICAS_SOBOL * 2 ** k
+
+
+def _ninguna(rng, params, num_sims):
+    s = np.zeros(2)
+    restantes = num_sims
+    while restantes > 0:
+        m = min(TAMANO_BLOQUE, restantes)
+        cover, over = _eventos(rng.standard_normal(m), rng.standard_normal(m), *params)
+        s += np.array([cover.sum(), over.sum()])
+        restantes -= m
+    return s / num_sims, None, num_sims
+
+
+def simular_reducido(pts_local, pts_visita, desv, spread_casa, total_casa,
+                     num_sims, estrategia="antitetica", seed=None):
+    """
+    Monte Carlo de un partido con reducción de varianza.
+
+    Devuelve un dict con prob_cover / prob_over (porcentaje),
+    ess_cover / ess_over (tamaño efectivo de muestra) y num_sims
+    (simulaciones realmente generadas; con Sobol se redondea hacia
+    arriba a REPLICAS_SOBOL × 2^k, nunca por debajo de lo pedido).
+    """
+    if estrategia not in ESTRATEGIAS:
+        raise ValueError(f"Estrategia desconocida: {estrategia!r}")
+
+    params = tuple(float(x) for x in (pts_local, pts_visita, desv, spread_casa, total_casa))
+    num_sims = max(2, int(num_sims))
+    inicio = time.perf_counter()
+
+    if estrategia == "sobol":
+        media, var_est, n = _sobol(seed, params, num_sims)
+    else:
+        rng = np.random.default_rng(seed)
+        metodo = {"ninguna": _ninguna, "antitetica": _antitetica, "control": _control}[estrategia]
+        media, var_est, n = metodo(rng, params, num_sims)
+
+    if estrategia == "ninguna":
+        ess_cover = ess_over = float(n)
+    else:
+        ess_cover = _ess(media[0], var_est[0])
+        ess_over = _ess(media[1], var_est[1])
+
+    metricas.registrar_sims(f"reducido:{estrategia}", n, time.perf_counter() - inicio)
+    return {
+        "prob_cover": float(media[0]) * 100,
+        "prob_over": float(media[1]) * 100,
+        "ess_cover": ess_cover,
+        "ess_over": ess_over,
+        "num_sims": n,
+    }
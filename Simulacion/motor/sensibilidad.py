@@ -0,0 +1,118 @@
+import dataclasses
+import time
+
+import numpy as np
+import pandas as pd
+
+from motor import metricas
+from motor.analitico import probabilidades_analiticas
+from motor.montecarlo import TAMANO_BLOQUE
+from motor.parametros import PARAMETROS_POR_DEFECTO
+from motor.proyecciones import puntos_modelo
+
+# =========================================================
+# SENSIBILIDAD: MALLA DE DOS ENTRADAS EN UNA SOLA LLAMADA
+# =========================================================
+#
+# Se mueven dos entradas a la vez (cualquier campo de EntradaNFL /
+# EntradaNBA / EntradaNHL, o la línea de la casa) y se recalcula
+# proyección + prob. de cover / over en toda la malla:
+#
+#   - la proyección es aritmética de NumPy: la malla entra como dos
+#     arrays (1 × nx) y (ny × 1) que se broadcastean
+#   - analítico: las mismas fórmulas de la sección 6, celda por celda
+#     pero en un solo llamado vectorizado
+#   - montecarlo: números aleatorios comunes (CRN). Las MISMAS sims
+#     normales se reusan en todas las celdas, así que la diferencia
+#     entre celdas vecinas es la del modelo y no ruido de muestreo.
+
+MODOS_SENSIBILIDAD = ("analitico", "montecarlo")
+
+# Ejes que no son campos de la entrada: la línea de la casa.
+EJES_LINEAS = ("spread", "total")
+
+
+def ejes_disponibles(entrada) -> tuple:
+    """Nombres que acepta barrido() como eje para esta liga."""
+    return tuple(f.name for f in dataclasses.fields(entrada)) + EJES_LINEAS
+
+
+def rango_por_defecto(eje: str, actual: float, liga: str) -> tuple:
+    """(desde, hasta) razonable alrededor del valor actual de un eje."""
+    if eje.startswith("mult_"):
+        return 0.90, 1.06
+    if eje.startswith("sv_goalie"):
+        return 0.880, 0.940
+    if eje in EJES_LINEAS:
+        ancho = 2.0 if liga == "NHL" else 7.0
+        return actual - ancho, actual + ancho
+    ancho = max(abs(actual) * 0.2, 1.0)
+    return actual - ancho, actual + ancho
+
+
+def _probabilidades_crn(pts_local, pts_visita, desv, spread_casa, total_casa, num_sims, seed):
+    """Monte Carlo con las mismas z para todas las celdas (arrays planos, en %)."""
+    rng = np.random.default_rng(seed)
+    z_l = rng.standard_normal(num_sims)
+    z_v = rng.standard_normal(num_sims)
+    num_celdas = len(pts_local)
+    covers = np.empty(num_celdas)
+    overs = np.empty(num_celdas)
+
+    por_bloque = max(1, TAMANO_BLOQUE // num_sims)
+    for i in range(0, num_celdas, por_bloque):
+        c = slice(i, i + por_bloque)
+        sim_l = np.maximum(0.0, pts_local[c, None] + desv[c, None] * z_l)
+        sim_v = np.maximum(0.0, pts_visita[c, None] + desv[c, None] * z_v)
+        covers[c] = np.count_nonzero((sim_l - sim_v) + spread_casa[c, None] >= 0, axis=1)
+        overs[c] = np.count_nonzero((sim_l + sim_v) > total_casa[c, None], axis=1)
+    return covers / num_sims * 100, overs / num_sims * 100
+
+
+def barrido(entrada, lineas, eje_x: str, valores_x, eje_y: str, valores_y,
+            modo: str = "analitico", num_sims: int = 10_000, seed=None, params=None) -> pd.DataFrame:
+    """
+    Proyección y prob. de cover / over para cada combinación de
+    valores_x × valores_y. 'lineas' = LineasCasa (spread y total de la
+    casa). Devuelve un DataFrame largo (una fila por celda) con columnas
+    eje_x, eje_y, pts_local, pts_visita, prob_cover y prob_over (%).
+    """
+    params = params or PARAMETROS_POR_DEFECTO
+    if modo not in MODOS_SENSIBILIDAD:
+        raise ValueError(f"Modo desconocido: {modo!r}")
+    if eje_x == eje_y:
+        raise ValueError("Los dos ejes tienen que ser distintos")
+    for eje in (eje_x, eje_y):
+        if eje not in ejes_disponibles(entrada):
+            raise ValueError(f"Eje desconocido para {entrada.liga}: {eje!r}")
+
+    valores_x = np.asarray(valores_x, dtype=float)
+    valores_y = np.asarray(valores_y, dtype=float)
+    malla = {eje_x: valores_x[None, :], eje_y: valores_y[:, None]}
+    spread_casa = malla.pop("spread", lineas.spread)
+    total_casa = malla.pop("total", lineas.total)
+
+    forma = (len(valores_y), len(valores_x))
+    pts_local, pts_visita = puntos_modelo(entrada, params, **malla)
+    pts_local, pts_visita, desv, spread_casa, total_casa = (
+        np.broadcast_to(np.asarray(x, dtype=float), forma).ravel()
+        for x in (pts_local, pts_visita, params.desv(entrada.liga), spread_casa, total_casa)
+    )
+
+    if modo == "analitico":
+        prob_cover, prob_over = probabilidades_analiticas(pts_local, pts_visita, desv, spread_casa, total_casa)
+    else:
+        inicio = time.perf_counter()
+        prob_cover, prob_over = _probabilidades_crn(pts_local, pts_visita, desv, spread_casa, total_casa,
+                                                    int(num_sims), seed)
+        metricas.registrar_sims("sensibilidad", len(pts_local) * int(num_sims), time.perf_counter() - inicio)
+
+    xx, yy = np.meshgrid(valores_x, valores_y)
+    return pd.DataFrame({
+        eje_x: xx.ravel(),
+        eje_y: yy.ravel(),
+        "pts_local": pts_local,
+        "pts_visita": pts_visita,
+        "prob_cover": prob_cover,
+        "prob_over": prob_over,
+    })
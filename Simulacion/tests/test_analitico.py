@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from motor.analitico import probabilidades_analiticas
+from motor.montecarlo import simular_partido
+
+# El analítico tiene que coincidir con el Monte Carlo de la sección 6
+# (normales recortadas en 0) dentro del error de muestreo.
+
+SIMS = 2_000_000
+
+
+def _tolerancia(p):
+    """4.5 errores estándar de una proporción (en pp) con SIMS sims, más el error de la cuadratura."""
+    p = min(max(p / 100, 1e-6), 1 - 1e-6)
+    return 4.5 * np.sqrt(p * (1 - p) / SIMS) * 100 + 0.01
+
+
+@pytest.mark.parametrize("pts_local, pts_visita, desv, spread_casa, total_casa", [
+    (24.0, 21.0, 13.5, -3.0, 45.5),     # NFL típico
+    (112.0, 108.0, 12.0, -4.5, 219.5),  # NBA
+    (17.0, 27.0, 10.0, 9.5, 44.0),      # local como underdog, total entero
+    (3.0, 1.0, 6.0, -2.0, 4.0),         # líneas enteras, mucha masa en el recorte
+    (0.3, 0.2, 10.0, 0.0, 0.0),         # medias casi 0: pick'em y total 0
+    (0.0, 5.0, 4.0, 3.0, 1.0),          # media exactamente 0
+])
+def test_analitico_igual_al_montecarlo(pts_local, pts_visita, desv, spread_casa, total_casa):
+    cover, over = probabilidades_analiticas(pts_local, pts_visita, desv, spread_casa, total_casa)
+    cover_mc, over_mc = simular_partido(pts_local, pts_visita, desv, spread_casa, total_casa, SIMS, seed=7)
+
+    assert cover == pytest.approx(cover_mc, abs=_tolerancia(cover_mc))
+    assert over == pytest.approx(over_mc, abs=_tolerancia(over_mc))
+
+
+def test_analitico_vectorizado_igual_al_escalar():
+    pts_local = np.array([24.0, 0.3, 112.0])
+    pts_visita = np.array([21.0, 0.2, 108.0])
+    spread = np.array([-3.0, 0.0, -4.5])
+    total = np.array([45.5, 0.0, 219.5])
+    cover, over = probabilidades_analiticas(pts_local, pts_visita, 12.0, spread, total)
+
+    for i in range(3):
+        c, o = probabilidades_analiticas(pts_local[i], pts_visita[i], 12.0, spread[i], total[i])
+        assert cover[i] == pytest.approx(c)
+        assert over[i] == pytest.approx(o)
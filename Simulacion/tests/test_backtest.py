@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+
+from motor.backtest import apuestas_historicas, ganancia_por_unidad, resumen_backtest, unir_stats
+
+
+def test_unir_stats_no_usa_las_stats_del_mismo_dia():
+    stats = pd.DataFrame({
+        "fecha": ["2024-01-01", "2024-01-08", "2024-01-01", "2024-01-08"],
+        "equipo": ["KC", "KC", "BUF", "BUF"],
+        "pf_pg": [20.0, 99.0, 25.0, 99.0],
+        "pa_pg": [18.0, 99.0, 19.0, 99.0],
+    })
+    partidos = pd.DataFrame({
+        "fecha": ["2024-01-08", "2024-01-01", "2024-01-09"],
+        "local": ["KC", "KC", "BUF"],
+        "visita": ["BUF", "BUF", "KC"],
+    })
+    df = unir_stats(partidos, stats, "NFL")
+
+    # Mismo orden de entrada; el 01-08 usa las stats del 01-01, no las del propio día.
+    assert list(df["fecha"].dt.strftime("%m-%d")) == ["01-08", "01-01", "01-09"]
+    assert df.loc[0, ["l_pf_pg", "v_pf_pg"]].tolist() == [20.0, 25.0]
+    assert df.loc[1, ["l_pf_pg", "v_pf_pg"]].isna().all()
+    assert df.loc[2, ["l_pf_pg", "v_pa_pg"]].tolist() == [99.0, 99.0]
+
+
+# Dos perfiles de stats NFL: local muy superior (cover LOCAL + OVER) y
+# visita muy superior con ataques flojos (cover VISITA + UNDER).
+LOCAL_FUERTE = {"l_pf_pg": 38.0, "l_pa_pg": 12.0, "v_pf_pg": 12.0, "v_pa_pg": 38.0}
+VISITA_FUERTE = {"l_pf_pg": 10.0, "l_pa_pg": 30.0, "v_pf_pg": 30.0, "v_pa_pg": 10.0}
+
+
+def _partido(local, stats, pts_local, pts_visita, spread, spread_cierre, total, total_cierre):
+    return {"fecha": pd.Timestamp("2024-10-06"), "local": local, "visita": "X",
+            "pts_local": pts_local, "pts_visita": pts_visita,
+            "spread": spread, "spread_cierre": spread_cierre,
+            "total": total, "total_cierre": total_cierre, **stats}
+
+
+@pytest.fixture
+def apuestas():
+    df = pd.DataFrame([
+        _partido("A", LOCAL_FUERTE, 24, 21, -3.0, -4.5, 40.0, 42.0),   # push LOCAL, gana OVER
+        _partido("B", VISITA_FUERTE, 20, 23, 3.0, 4.5, 50.0, 48.0),    # push VISITA, gana UNDER
+        _partido("C", LOCAL_FUERTE, 17, 20, -3.0, -2.0, 40.0, 39.0),   # pierde LOCAL, pierde OVER
+        _partido("D", VISITA_FUERTE, 30, 20, 3.0, 2.0, 50.0, 51.0),    # pierde VISITA, push UNDER
+    ])
+    return apuestas_historicas(df, "NFL").set_index(["local", "mercado", "lado"])
+
+
+def test_resultado_ganancia_y_clv_de_cada_lado(apuestas):
+    esperado = {
+        ("A", "Spread", "LOCAL"): (0, 1.5),
+        ("A", "Total", "OVER"): (1, 2.0),
+        ("B", "Spread", "VISITA"): (0, 1.5),
+        ("B", "Total", "UNDER"): (1, 2.0),
+        ("C", "Spread", "LOCAL"): (-1, -1.0),
+        ("C", "Total", "OVER"): (-1, -1.0),
+        ("D", "Spread", "VISITA"): (-1, -1.0),
+        ("D", "Total", "UNDER"): (0, -1.0),
+    }
+    assert sorted(apuestas.index) == sorted(esperado)
+    pago = ganancia_por_unidad(-110)
+    for clave, (resultado, clv) in esperado.items():
+        fila = apuestas.loc[clave]
+        assert fila["resultado"] == resultado, clave
+        assert fila["clv"] == pytest.approx(clv), clave
+        assert fila["ganancia"] == pytest.approx({1: pago, 0: 0.0, -1: -1.0}[resultado]), clave
+
+
+def test_resumen_cuenta_los_push(apuestas):
+    tabla = resumen_backtest(apuestas.reset_index())
+    assert tabla.loc[("Spread", "LOCAL"), ["Ganadas", "Perdidas", "Push"]].tolist() == [0, 1, 1]
+    assert tabla.loc[("Spread", "VISITA"), ["Ganadas", "Perdidas", "Push"]].tolist() == [0, 1, 1]
+    assert tabla.loc[("Total", "OVER"), ["Ganadas", "Perdidas", "Push"]].tolist() == [1, 1, 0]
+    assert tabla.loc[("Total", "UNDER"), ["Ganadas", "Perdidas", "Push"]].tolist() == [1, 0, 1]
+    total = tabla.loc[("TOTAL", "")]
+    assert total["Push"] == 3
+    # Los push no cuentan para el hit rate: 2 ganadas de 5 decididas.
+    assert total["Hit rate %"] == pytest.approx(40.0)
+    assert tabla.loc[("Spread", "LOCAL"), "Hit rate %"] == pytest.approx(0.0)
@@ -0,0 +1,267 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from contextlib import closing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from motor import cache_disco
+from motor.cache_disco import CacheDisco, clave_cache, get_json_cacheado
+from motor.planificador import LimiteDeTasa, PlanificadorHTTP
+
+# =========================================================
+# SERVIDOR DE PRUEBA (sustituto local de SportsDataIO)
+# =========================================================
+#
+# Un http.server en 127.0.0.1 con puerto libre. Cada prueba ajusta lo
+# que responde (cuerpo, ETag / Last-Modified, fallas encoladas, demora)
+# y revisa lo que le llegó en 'pedidos'.
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CUERPO = [{"GameId": 1, "HomeTeam": "KC", "AwayTeam": "BUF", "PregameOdds": []}]
+
+
+class _Estado:
+    def __init__(self):
+        self.cuerpo = CUERPO
+        self.etag = None
+        self.last_modified = None
+        self.fallas = []      # [(status, headers)], se consumen en orden
+        self.demora = 0.0
+        self.pedidos = []     # [(path, headers, status)]
+        self.candado = threading.Lock()
+
+    def contar(self, status=None):
+        return len(self.pedidos) if status is None else sum(1 for p in self.pedidos if p[2] == status)
+
+
+def _manejador(estado):
+    class Manejador(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _responder(self, status, headers=(), cuerpo=b""):
+            with estado.candado:
+                estado.pedidos.append((self.path, dict(self.headers), status))
+            self.send_response(status)
+            for k, v in headers:
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def do_GET(self):
+            if estado.demora:
+                time.sleep(estado.demora)
+            with estado.candado:
+                falla = estado.fallas.pop(0) if estado.fallas else None
+            if falla is not None:
+                status, headers = falla
+                return self._responder(status, headers.items())
+
+            validadores = []
+            if estado.etag:
+                validadores.append(("ETag", estado.etag))
+            if estado.last_modified:
+                validadores.append(("Last-Modified", estado.last_modified))
+            if (estado.etag and self.headers.get("If-None-Match") == estado.etag) or (
+                estado.last_modified and self.headers.get("If-Modified-Since") == estado.last_modified
+            ):
+                return self._responder(304, validadores)
+
+            cuerpo = json.dumps(estado.cuerpo).encode("utf-8")
+            self._responder(200, validadores + [("Content-Type", "application/json")], cuerpo)
+
+    return Manejador
+
+
+@pytest.fixture
+def servidor():
+    estado = _Estado()
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _manejador(estado))
+    hilo = threading.Thread(target=srv.serve_forever, daemon=True)
+    hilo.start()
+    estado.base_url = f"http://127.0.0.1:{srv.server_address[1]}"
+    yield estado
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def plan(monkeypatch):
+    """Planificador del proceso, nuevo en cada prueba: sin presupuesto y con backoff corto."""
+    p = PlanificadorHTTP(requests.Session(), rpm=0, reintentos=1, backoff_base=0.01, backoff_max=0.05)
+    monkeypatch.setattr(cache_disco, "_planificador", p)
+    return p
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheDisco(str(tmp_path / "respuestas.sqlite3"))
+
+
+def _url(servidor, semana=1):
+    return f"{servidor.base_url}/api/nfl/odds/json/GameOddsByWeek/2025REG/{semana}"
+
+
+# =========================================================
+# CACHE EN DISCO
+# =========================================================
+
+def test_200_se_guarda_y_ttl_vencido_vuelve_a_pedir(servidor, plan, cache):
+    url = _url(servidor)
+    assert get_json_cacheado(url, {"key": "k"}, ttl=60, cache=cache) == (200, CUERPO)
+    assert get_json_cacheado(url, {"key": "k"}, ttl=60, cache=cache) == (200, CUERPO)
+    assert servidor.contar() == 1
+
+    servidor.cuerpo = [{"GameId": 2}]
+    assert get_json_cacheado(url, {"key": "k"}, ttl=0, cache=cache, stale=0) == (200, [{"GameId": 2}])
+    assert servidor.contar(200) == 2
+
+
+def test_304_refresca_sin_bajar_el_cuerpo(servidor, plan, cache):
+    servidor.etag = '"v1"'
+    servidor.last_modified = "Sun, 12 Oct 2025 17:00:00 GMT"
+    url = _url(servidor)
+    get_json_cacheado(url, {"key": "k"}, ttl=60, cache=cache)
+    guardado = cache.obtener(clave_cache(url, {"key": "k"}))["guardado"]
+
+    time.sleep(0.01)
+    assert get_json_cacheado(url, {"key": "k"}, ttl=0, cache=cache, stale=0) == (200, CUERPO)
+    _, headers, status = servidor.pedidos[-1]
+    assert status == 304
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == servidor.last_modified
+    assert cache.obtener(clave_cache(url, {"key": "k"}))["guardado"] > guardado
+
+    # El 304 reinició el TTL: la siguiente llamada no sale a la red.
+    assert get_json_cacheado(url, {"key": "k"}, ttl=60, cache=cache) == (200, CUERPO)
+    assert servidor.contar() == 2
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_error_de_la_api_sirve_lo_guardado(servidor, plan, cache, status):
+    url = _url(servidor)
+    get_json_cacheado(url, {"key": "k"}, ttl=60, cache=cache)
+
+    servidor.fallas = [(status, {"Retry-After": "0"})] * (plan.reintentos + 1)
+    assert get_json_cacheado(url, {"key": "k"}, ttl=0, cache=cache, stale=0) == (200, CUERPO)
+    assert servidor.contar(status) == plan.reintentos + 1
+
+
+def test_error_sin_nada_guardado_devuelve_el_status(servidor, plan, cache):
+    servidor.fallas = [(503, {})] * (plan.reintentos + 1)
+    assert get_json_cacheado(_url(servidor), {"key": "k"}, ttl=60, cache=cache) == (503, None)
+
+
+def test_lru_desaloja_lo_menos_usado(tmp_path):
+    cache = CacheDisco(str(tmp_path / "lru.sqlite3"), max_bytes=250)
+    for clave in ("a", "b"):
+        cache.guardar(clave, "/x", b"x" * 100)
+        time.sleep(0.01)
+    cache.obtener("a")
+    time.sleep(0.01)
+    cache.guardar("c", "/x", b"x" * 100)
+
+    assert cache.obtener("b") is None
+    assert cache.obtener("a") is not None
+    assert cache.obtener("c") is not None
+
+
+# =========================================================
+# DOS PROCESOS SOBRE LA MISMA BASE WAL
+# =========================================================
+
+def _en_otro_proceso(codigo: str, *args):
+    entorno = dict(os.environ, PYTHONPATH=RAIZ)
+    return subprocess.Popen([sys.executable, "-c", codigo, *map(str, args)], cwd=RAIZ, env=entorno,
+                            stdout=subprocess.PIPE, text=True)
+
+
+ESCRIBIR = """
+import sys
+from motor.cache_disco import CacheDisco
+cache = CacheDisco(sys.argv[1])
+for i in range(int(sys.argv[3])):
+    cache.guardar(f"{sys.argv[2]}-{i}", "/x", b"{}")
+"""
+
+LEER = """
+import json, sys
+from motor.cache_disco import CacheDisco, get_json_cacheado
+print(json.dumps(get_json_cacheado(sys.argv[2], {"key": "k"}, ttl=60, cache=CacheDisco(sys.argv[1]))))
+"""
+
+
+def test_dos_procesos_escriben_a_la_vez(tmp_path):
+    ruta = tmp_path / "compartida.sqlite3"
+    procesos = [_en_otro_proceso(ESCRIBIR, ruta, nombre, 200) for nombre in ("p1", "p2")]
+    for p in procesos:
+        p.communicate(timeout=60)
+        assert p.returncode == 0
+
+    with closing(sqlite3.connect(ruta)) as con:
+        assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert con.execute("SELECT COUNT(*) FROM respuestas").fetchone()[0] == 400
+
+
+def test_otro_proceso_lee_lo_guardado_sin_ir_a_la_red(servidor, plan, tmp_path):
+    ruta = tmp_path / "compartida.sqlite3"
+    url = _url(servidor)
+    get_json_cacheado(url, {"key": "k"}, ttl=60, cache=CacheDisco(str(ruta)))
+
+    salida, _ = _en_otro_proceso(LEER, ruta, url).communicate(timeout=60)
+    assert json.loads(salida) == [200, CUERPO]
+    assert servidor.contar() == 1
+
+
+# =========================================================
+# PLANIFICADOR (single-flight, Retry-After, presupuesto por key)
+# =========================================================
+
+def test_llamadas_concurrentes_salen_una_sola_vez(servidor, plan, cache):
+    servidor.demora = 0.3
+    url = _url(servidor)
+    resultados = []
+    hilos = [
+        threading.Thread(target=lambda: resultados.append(get_json_cacheado(url, {"key": "k"}, ttl=60, cache=cache)))
+        for _ in range(8)
+    ]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    assert resultados == [(200, CUERPO)] * 8
+    assert servidor.contar() == 1
+
+
+def test_429_se_reintenta_despues_de_retry_after(servidor, plan, cache, monkeypatch):
+    monkeypatch.setattr(plan, "backoff_max", 5.0)
+    servidor.fallas = [(429, {"Retry-After": "1"})]
+
+    inicio = time.monotonic()
+    assert get_json_cacheado(_url(servidor), {"key": "k"}, ttl=60, cache=cache) == (200, CUERPO)
+    assert time.monotonic() - inicio >= 1.0
+    assert [p[2] for p in servidor.pedidos] == [429, 200]
+
+
+def test_presupuesto_por_key_corta_la_llamada_rpm_mas_uno(servidor, plan, cache, monkeypatch):
+    monkeypatch.setattr(plan, "rpm", 3)
+    monkeypatch.setattr(plan, "max_espera", 0.2)
+    for semana in range(1, 4):
+        assert get_json_cacheado(_url(servidor, semana), {"key": "k"}, ttl=60, cache=cache)[0] == 200
+
+    with pytest.raises(LimiteDeTasa):
+        get_json_cacheado(_url(servidor, 4), {"key": "k"}, ttl=60, cache=cache)
+    assert servidor.contar() == 3
+
+    # El presupuesto es por key: otra key no espera.
+    assert get_json_cacheado(_url(servidor, 4), {"key": "otra"}, ttl=60, cache=cache)[0] == 200
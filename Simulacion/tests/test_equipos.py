@@ -0,0 +1,37 @@
+import pytest
+
+from benchmarks.casos import cargar_fixture
+from motor import equipos
+from motor.api import indexar_equipos_nba, indexar_equipos_nfl
+
+
+@pytest.fixture
+def nfl():
+    return indexar_equipos_nfl(cargar_fixture("nfl_team_season_stats.json"))
+
+
+@pytest.mark.parametrize("texto, codigo", [
+    ("niners", "SF"), ("Pats", "NE"), ("jags", "JAX"), ("Bucs", "TB"), ("G-Men", "NYG"),
+    ("49ers", "SF"), ("sf", "SF"), ("Cardinals", "ARI"),
+])
+def test_apodos_nfl(nfl, texto, codigo):
+    assert nfl.codigo_de(texto) == codigo
+
+
+def test_apodos_nba():
+    nba = indexar_equipos_nba(cargar_fixture("nba_standings.json"))
+    assert [nba.codigo_de(x) for x in ("dubs", "Sixers", "cavs", "GSW")] == ["GS", "PHI", "CLE", "GS"]
+
+
+def test_apodo_en_dos_equipos_se_descarta(monkeypatch):
+    apodos = {"NFL": {"NYG": ("new yorkers",), "NYJ": ("new yorkers", "gang green")}}
+    monkeypatch.setattr(equipos, "APODOS_LIGA", apodos)
+    nfl = indexar_equipos_nfl(cargar_fixture("nfl_team_season_stats.json"))
+    assert nfl.codigo_de("new yorkers") is None
+    assert nfl.codigo_de("gang green") == "NYJ"
+
+
+def test_codigo_repetido_en_el_payload_se_ignora():
+    data = cargar_fixture("nfl_team_season_stats.json")
+    nfl = indexar_equipos_nfl(data + [dict(data[0], Team=data[0]["Team"].lower())])
+    assert len(nfl) == len(data)
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from motor.goles import distribucion_goles, pmf_goles, probabilidades_goles
+
+# La distribución exacta contra una simulación del mismo modelo:
+# Poisson / binomial negativa + componente común, y el OT / shootout suma
+# un gol al ganador.
+
+SIMS = 2_000_000
+PROB_OT_LOCAL = 0.55
+
+
+def _tolerancia(p):
+    """4.5 errores estándar de una proporción (0..1) con SIMS sims."""
+    return 4.5 * np.sqrt(max(p * (1 - p), 1e-9) / SIMS) + 1e-6
+
+
+def _simular(media_l, media_v, dispersion, correlacion, seed=3):
+    rng = np.random.default_rng(seed)
+    comun = min(correlacion * np.sqrt(media_l * media_v), media_l, media_v)
+
+    def goles(media):
+        if dispersion > 0:
+            r = 1.0 / dispersion
+            return rng.negative_binomial(r, r / (r + media), SIMS)
+        return rng.poisson(media, SIMS)
+
+    c = rng.poisson(comun, SIMS)
+    local = goles(media_l - comun) + c
+    visita = goles(media_v - comun) + c
+    empate = local == visita
+    gana_local = rng.random(SIMS) < PROB_OT_LOCAL
+    return local + (empate & gana_local), visita + (empate & ~gana_local), empate
+
+
+@pytest.mark.parametrize("media_l, media_v, dispersion, correlacion", [
+    (3.2, 2.8, 0.0, 0.0),    # Poisson
+    (3.2, 2.8, 0.0, 0.2),    # Poisson bivariada
+    (3.0, 2.6, 0.15, 0.0),   # binomial negativa
+    (3.4, 2.4, 0.3, 0.25),   # binomial negativa + correlación
+    (0.05, 3.0, 0.0, 0.0),   # media casi 0
+])
+@pytest.mark.parametrize("spread", [-1.5, 1.5, -1.0, 1.0, -2.0])
+def test_goles_igual_a_la_simulacion(media_l, media_v, dispersion, correlacion, spread):
+    dist = distribucion_goles(media_l, media_v, dispersion, correlacion, PROB_OT_LOCAL)
+    local, visita, empate = _simular(media_l, media_v, dispersion, correlacion)
+
+    cover = np.mean((local - visita) + spread >= 0)
+    assert dist.prob_cover(spread) == pytest.approx(cover, abs=_tolerancia(cover))
+    assert dist.empate_regular == pytest.approx(empate.mean(), abs=_tolerancia(empate.mean()))
+    for total in (5.5, 6.0, 3.0):
+        over = np.mean(local + visita > total)
+        assert dist.prob_over(total) == pytest.approx(over, abs=_tolerancia(over))
+
+
+def test_lineas_enteras_sin_empate_final():
+    # Después del OT nunca hay margen 0: -1 / -0.5 y +1 / +1.5 pagan igual.
+    dist = distribucion_goles(3.1, 2.9, prob_ot_local=PROB_OT_LOCAL)
+    assert dist.prob_cover(-1.0) == pytest.approx(dist.prob_cover(-0.5))
+    assert dist.prob_cover(1.0) == pytest.approx(dist.prob_cover(1.5))
+    assert dist.prob_cover(-1.0) == pytest.approx(dist.resultado()["gana_local"])
+    # Un total entero se liquida como push: P(over 6) < P(over 5.5).
+    assert dist.prob_over(6.0) < dist.prob_over(5.5)
+
+
+def test_binomial_negativa_media_y_varianza():
+    pmf = pmf_goles(3.0, 0.2)
+    k = np.arange(len(pmf))
+    media = (k * pmf).sum()
+    assert pmf.sum() == pytest.approx(1.0)
+    assert media == pytest.approx(3.0, abs=1e-4)  # la cola > MAX_GOLES va a la última casilla
+    assert ((k - media) ** 2 * pmf).sum() == pytest.approx(3.0 + 0.2 * 9.0, rel=1e-3)
+
+
+def test_probabilidades_goles_en_porcentaje():
+    cover, over = probabilidades_goles(3.2, 2.8, -1.5, 5.5)
+    dist = distribucion_goles(3.2, 2.8)
+    assert cover == pytest.approx(float(dist.prob_cover(-1.5)) * 100)
+    assert over == pytest.approx(float(dist.prob_over(5.5)) * 100)
@@ -0,0 +1,50 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.casos import cargar_fixture
+from motor.api import indexar_equipos_nfl
+from motor.jornada import actualizar_jornada, cotizar_jornada_nfl
+from motor.montecarlo import simular_jornada
+from motor.odds import id_juego
+
+
+def _semana():
+    return cargar_fixture("nfl_game_odds_semana.json"), indexar_equipos_nfl(
+        cargar_fixture("nfl_team_season_stats.json"))
+
+
+def _ordenar(tabla):
+    return tabla.sort_values(["Local", "Visita"]).reset_index(drop=True)
+
+
+def test_recotizar_unos_juegos_da_lo_mismo_que_la_semana_completa():
+    data, registro = _semana()
+    tabla, _ = cotizar_jornada_nfl(data, registro, 5000, seed=42)
+
+    movida = copy.deepcopy(data)
+    for g in movida[2:5]:
+        for o in g["PregameOdds"]:
+            o["OverUnder"] = (o["OverUnder"] or 44.0) + 1.0
+    movidos = {id_juego(g) for g in movida[2:5]}
+
+    incremental, _ = actualizar_jornada(tabla, movida, movidos, registro, 5000, seed=42)
+    completa, _ = cotizar_jornada_nfl(movida, registro, 5000, seed=42)
+    pd.testing.assert_frame_equal(_ordenar(incremental), _ordenar(completa))
+
+
+def test_claves_hacen_cada_partido_independiente_de_los_demas():
+    pts_l, pts_v = np.array([24.0, 21.0, 27.0]), np.array([20.0, 23.0, 17.0])
+    spread, total = np.array([-3.5, 2.5, -9.5]), np.array([44.5, 43.0, 45.5])
+    claves = ["1", "2", "3"]
+    cover, over = simular_jornada(pts_l, pts_v, 13.0, spread, total, 250_000, seed=7, claves=claves)
+    solo, solo_over = simular_jornada(pts_l[1:2], pts_v[1:2], 13.0, spread[1:2], total[1:2], 250_000,
+                                      seed=7, claves=claves[1:2])
+    assert solo[0] == cover[1] and solo_over[0] == over[1]
+
+    # Igual que sin claves: el resultado no depende del número de workers.
+    cover_2, over_2 = simular_jornada(pts_l, pts_v, 13.0, spread, total, 250_000, seed=7,
+                                      workers=2, claves=claves)
+    np.testing.assert_array_equal(cover, cover_2)
+    np.testing.assert_array_equal(over, over_2)
@@ -0,0 +1,27 @@
+import os
+import threading
+
+from motor import metricas
+
+
+def test_escribir_prometheus_desde_varios_hilos(tmp_path, monkeypatch):
+    monkeypatch.setattr(metricas, "_activo", True)
+    ruta = tmp_path / "simulador.prom"
+    errores = []
+
+    def escribir():
+        for _ in range(50):
+            try:
+                metricas.escribir_prometheus(str(ruta))
+            except OSError as e:
+                errores.append(e)
+
+    hilos = [threading.Thread(target=escribir) for _ in range(8)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    assert errores == []
+    assert os.listdir(tmp_path) == ["simulador.prom"]
+    assert ruta.read_text(encoding="utf-8") == metricas.exportar_prometheus()
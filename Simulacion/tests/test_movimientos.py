@@ -0,0 +1,49 @@
+import copy
+
+import pytest
+
+from benchmarks.casos import cargar_fixture
+from motor.movimientos import HistorialLineas
+from motor.odds import id_juego
+
+SEMANA = "2025REG/6"
+
+
+@pytest.fixture
+def semana():
+    return cargar_fixture("nfl_game_odds_semana.json")
+
+
+@pytest.fixture
+def historial(tmp_path):
+    return HistorialLineas(str(tmp_path / "movimientos.sqlite3"))
+
+
+def test_primer_payload_guarda_todo_y_repetido_no_agrega_filas(historial, semana):
+    libros = sum(len(g["PregameOdds"]) for g in semana)
+    assert len(historial.registrar_semana(semana, SEMANA, visto=1.0)) == libros
+    ultimo = historial.ultimo_id(SEMANA)
+
+    assert historial.registrar_semana(copy.deepcopy(semana), SEMANA, visto=2.0) == []
+    assert historial.ultimo_id(SEMANA) == ultimo
+    assert historial.movidos_desde(SEMANA, ultimo) == set()
+
+
+def test_un_cambio_de_moneyline_es_una_sola_fila(historial, semana):
+    historial.registrar_semana(semana, SEMANA, visto=1.0)
+    marca = historial.ultimo_id(SEMANA)
+
+    movida = copy.deepcopy(semana)
+    juego = movida[3]
+    libro = juego["PregameOdds"][1]
+    libro["HomeMoneyLine"] = (libro["HomeMoneyLine"] or -110) - 15
+
+    movimientos = historial.registrar_semana(movida, SEMANA, visto=2.0)
+    assert len(movimientos) == 1
+    m = movimientos[0]
+    assert (m.juego, m.libro) == (id_juego(juego), libro["Sportsbook"])
+    assert m.antes[2] != m.ahora[2] and m.antes[:2] == m.ahora[:2] and m.antes[3] == m.ahora[3]
+
+    assert historial.ultimo_id(SEMANA) == marca + 1
+    assert historial.movidos_desde(SEMANA, marca) == {id_juego(juego)}
+    assert len(historial.historial(id_juego(juego), libro["Sportsbook"])) == 2